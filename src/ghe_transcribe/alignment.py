@@ -0,0 +1,247 @@
+"""Vectorized alignment of transcribed segments with speaker turns."""
+
+import numpy as np
+
+from ghe_transcribe.transcript import StringTable, Transcript, Words
+
+# Same as pyannote.core.segment.SEGMENT_PRECISION, which is slow to import
+SEGMENT_PRECISION = 1e-6
+
+
+class SpeakerIndex:
+    """Sorted per-speaker coverage index built once from a diarization result.
+
+    Turns of each speaker are merged into disjoint sorted intervals with a
+    cumulative duration table, so that the time a speaker talks within any
+    window is two binary searches away. This gives the same speaker as
+    ``annotation.crop(segment).argmax()`` without scanning the annotation for
+    every segment.
+
+    Args:
+        annotation: pyannote Annotation with speaker turns
+    """
+
+    def __init__(self, annotation):
+        turns = {}
+        for segment, _, label in annotation.itertracks(yield_label=True):
+            turns.setdefault(label, []).append((segment.start, segment.end))
+
+        # Same label order as Annotation.labels(), which argmax breaks ties on
+        self.labels = sorted(turns, key=str)
+        self._starts = []
+        self._ends = []
+        self._cumulative = []
+        for label in self.labels:
+            starts, ends = _merge_intervals(np.asarray(turns[label], dtype=np.float64))
+            self._starts.append(starts)
+            self._ends.append(ends)
+            self._cumulative.append(np.concatenate(([0.0], np.cumsum(ends - starts))))
+
+    def _coverage(self, index: int, times: np.ndarray) -> np.ndarray:
+        """Total speaking time of a speaker before each of the given times."""
+        starts = self._starts[index]
+        ends = self._ends[index]
+        cumulative = self._cumulative[index]
+        # Number of intervals starting at or before each time
+        count = np.searchsorted(starts, times, side="right")
+        previous = np.maximum(count - 1, 0)
+        partial = np.clip(
+            times - starts[previous], 0.0, ends[previous] - starts[previous]
+        )
+        return np.where(count > 0, cumulative[previous] + partial, 0.0)
+
+    def overlaps(self, starts, ends) -> np.ndarray:
+        """Speaking time of every speaker within every window.
+
+        Args:
+            starts: Window start times in seconds
+            ends: Window end times in seconds
+
+        Returns:
+            Array of shape (windows, speakers) in the order of self.labels
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        overlaps = np.zeros((len(starts), len(self.labels)))
+        for index in range(len(self.labels)):
+            overlaps[:, index] = self._coverage(index, ends) - self._coverage(
+                index, starts
+            )
+        return overlaps
+
+    def assign_ids(self, starts, ends) -> np.ndarray:
+        """Index in self.labels of the speaker with the largest overlap.
+
+        Args:
+            starts: Window start times in seconds
+            ends: Window end times in seconds
+
+        Returns:
+            Array of label indices, -1 where no speaker overlaps the window
+        """
+        if len(starts) == 0 or not self.labels:
+            return np.full(len(starts), -1, dtype=np.int64)
+        overlaps = self.overlaps(starts, ends)
+        longest = overlaps.max(axis=1)
+        # Treat rounding-level differences as ties and keep the first label
+        best = np.argmax(overlaps >= (longest - SEGMENT_PRECISION)[:, None], axis=1)
+        return np.where(longest > SEGMENT_PRECISION, best, -1)
+
+    def assign(self, starts, ends) -> list:
+        """Speaker with the largest overlap for every window.
+
+        Args:
+            starts: Window start times in seconds
+            ends: Window end times in seconds
+
+        Returns:
+            List of speaker labels, None where no speaker overlaps the window
+        """
+        labels = self.labels + [None]
+        return [labels[index] for index in self.assign_ids(starts, ends).tolist()]
+
+
+def _speaker_index(annotation) -> SpeakerIndex:
+    """Build a SpeakerIndex unless one is given, so callers can reuse it."""
+    if isinstance(annotation, SpeakerIndex):
+        return annotation
+    return SpeakerIndex(annotation)
+
+
+def _merge_intervals(intervals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Merge overlapping (start, end) intervals into disjoint sorted ones."""
+    intervals = intervals[np.argsort(intervals[:, 0], kind="stable")]
+    starts = intervals[:, 0]
+    ends = np.maximum.accumulate(intervals[:, 1])
+    # A new interval begins where a start lies past every previous end
+    is_first = np.concatenate(([True], starts[1:] > ends[:-1]))
+    group = np.cumsum(is_first) - 1
+    merged_ends = np.zeros(group[-1] + 1)
+    np.maximum.at(merged_ends, group, ends)
+    return starts[is_first], merged_ends
+
+
+def assign_speakers(starts, ends, annotation) -> list:
+    """Speaker with the largest overlap for every window in one pass.
+
+    Args:
+        starts: Window start times in seconds
+        ends: Window end times in seconds
+        annotation: pyannote Annotation with speaker turns, or its SpeakerIndex
+
+    Returns:
+        List of speaker labels, None where no speaker overlaps the window
+    """
+    return _speaker_index(annotation).assign(starts, ends)
+
+
+def align_transcript(transcribe_res, annotation, alignment="segment") -> Transcript:
+    """Assign speakers to transcribed segments, per segment or per word.
+
+    With word alignment, all words of the transcript are aligned in one
+    vectorized pass. Words without any overlapping speaker turn take the
+    speaker of the neighbouring words of the same segment, so that short gaps
+    do not split segments, and segments are split where the speaker changes.
+    Segments without word timestamps are aligned as a whole.
+
+    Args:
+        transcribe_res: Transcription results in Whisper format
+        annotation: pyannote Annotation with speaker turns, or its SpeakerIndex
+        alignment: Assign speakers per "segment" or per "word"
+
+    Returns:
+        Transcript with one row per segment, or per single-speaker piece of a
+        segment, keeping the words of every row
+    """
+    index = _speaker_index(annotation)
+    segments = transcribe_res["segments"]
+    segment_words = [item.get("words") or [] for item in segments]
+    word_counts = np.array([len(words) for words in segment_words], dtype=np.int64)
+    words = Words.from_words(word for words in segment_words for word in words)
+
+    if alignment != "word":
+        starts = np.array([item["start"] for item in segments], dtype=np.float64)
+        ends = np.array([item["end"] for item in segments], dtype=np.float64)
+        word_offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+        np.cumsum(word_counts, out=word_offsets[1:])
+        return Transcript(
+            starts,
+            ends,
+            index.assign_ids(starts, ends),
+            index.labels,
+            StringTable.from_strings(item["text"] for item in segments),
+            words if len(words) else None,
+            word_offsets if len(words) else None,
+        )
+
+    # Segments without word timestamps fall back to segment-level alignment
+    plain_segment_ids = np.flatnonzero(word_counts == 0)
+    plain_starts = np.array(
+        [segments[i]["start"] for i in plain_segment_ids], dtype=np.float64
+    )
+    plain_ends = np.array(
+        [segments[i]["end"] for i in plain_segment_ids], dtype=np.float64
+    )
+    plain_codes = index.assign_ids(plain_starts, plain_ends)
+    plain_texts = [segments[i]["text"] for i in plain_segment_ids.tolist()]
+
+    piece_segment_ids = np.zeros(0, dtype=np.int64)
+    piece_starts = piece_ends = np.zeros(0, dtype=np.float64)
+    piece_codes = piece_counts = np.zeros(0, dtype=np.int64)
+    piece_texts = []
+    if len(words):
+        segment_ids = np.repeat(np.arange(len(segments)), word_counts)
+        codes = index.assign_ids(words.starts, words.ends)
+        codes = _fill_within_groups(codes, segment_ids)
+        codes = _fill_within_groups(codes[::-1], segment_ids[::-1])[::-1]
+
+        # A new piece starts at every segment boundary or speaker change
+        is_first = np.ones(len(words), dtype=bool)
+        is_first[1:] = (segment_ids[1:] != segment_ids[:-1]) | (codes[1:] != codes[:-1])
+        firsts = np.flatnonzero(is_first)
+        lasts = np.append(firsts[1:] - 1, len(words) - 1)
+        piece_segment_ids = segment_ids[firsts]
+        piece_starts = words.starts[firsts]
+        piece_ends = words.ends[lasts]
+        piece_codes = codes[firsts]
+        piece_counts = lasts - firsts + 1
+        piece_texts = list(words.texts.join(np.append(firsts, len(words))))
+
+    # Pieces keep the order of their segments, and their words stay in order
+    order = np.argsort(
+        np.concatenate([plain_segment_ids, piece_segment_ids]), kind="stable"
+    )
+    texts = plain_texts + piece_texts
+    counts = np.concatenate([np.zeros(len(plain_segment_ids), np.int64), piece_counts])
+    word_offsets = np.zeros(len(order) + 1, dtype=np.int64)
+    np.cumsum(counts[order], out=word_offsets[1:])
+    return Transcript(
+        np.concatenate([plain_starts, piece_starts])[order],
+        np.concatenate([plain_ends, piece_ends])[order],
+        np.concatenate([plain_codes, piece_codes])[order],
+        index.labels,
+        StringTable.from_strings(texts[i] for i in order.tolist()),
+        words if len(words) else None,
+        word_offsets if len(words) else None,
+    )
+
+
+def assign_word_speakers(transcribe_res, annotation) -> list:
+    """Assign speakers per word and split segments where the speaker changes.
+
+    Args:
+        transcribe_res: Transcription results in Whisper format
+        annotation: pyannote Annotation with speaker turns, or its SpeakerIndex
+
+    Returns:
+        List of tuples containing (segment, speaker, text)
+    """
+    return list(align_transcript(transcribe_res, annotation, alignment="word"))
+
+
+def _fill_within_groups(codes: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Forward-fill missing (-1) codes from earlier positions of the same group."""
+    positions = np.where(codes >= 0, np.arange(len(codes)), -1)
+    source = np.maximum.accumulate(positions)
+    valid = (source >= 0) & (groups[np.maximum(source, 0)] == groups)
+    return np.where(valid, codes[np.maximum(source, 0)], -1)
@@ -14,16 +14,27 @@ from IPython.display import clear_output, display
 
 # Import the core transcription function and config from your package
 from ghe_transcribe.core import (
+    AlignmentChoice,  # Enum for speaker alignment choices
     ComputeTypeChoice,  # Enum for compute type choices
     DeviceChoice,  # Enum for device choices
     WhisperModelChoice,  # Enum for Whisper model choices
-    transcribe,
     transcribe_config,  # Default configuration
 )
-from ghe_transcribe.utils import log_hf_authentication_error, save_uploaded_file
+from ghe_transcribe.exceptions import QueueFullError
+from ghe_transcribe.jobs import JobQueue
+from ghe_transcribe.utils import (
+    BufferReader,
+    log_hf_authentication_error,
+    save_uploaded_file,
+    source_name,
+)
+from ghe_transcribe.writers import OUTPUT_FORMATS, parse_formats
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of uploaded files waiting to be transcribed
+MAX_QUEUED_FILES = 64
+
 
 def setup_hf_authentication():
     """
@@ -111,6 +122,13 @@ class GheTranscribeApp:
         # Set up Hugging Face authentication
         self.hf_token = setup_hf_authentication()
 
+        # Transcribe in a background thread so that the kernel stays responsive
+        self.job_queue = JobQueue(
+            max_queued=MAX_QUEUED_FILES, on_update=self._on_job_update
+        )
+        self.job_queue.start()
+        self.job_rows = {}
+
         self._setup_ui()
         self._set_initial_widget_states()
         self._observe_widget_changes()
@@ -157,6 +175,14 @@ class GheTranscribeApp:
             step=0.5,
         )
 
+        self.offset_input = widgets.FloatText(
+            value=transcribe_config.get("offset") or 0.0,
+            description="Offset (s):",
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+            step=0.5,
+        )
+
         # Speakers options for pyannote.audio
         speakers_options = [("Auto-detect", None)]
         for i in range(1, 11):  # From 1 to 10 speakers
@@ -186,6 +212,7 @@ class GheTranscribeApp:
             [
                 self.audio_uploader,
                 self.trim_input,
+                self.offset_input,
                 self.num_speakers_dropdown,
                 self.whisper_model_dropdown,
                 self.advanced_options_checkbox,
@@ -247,6 +274,9 @@ class GheTranscribeApp:
             layout=self.common_widget_layout,
             style=self.common_widget_style,
         )
+        self.alignment_dropdown = self._create_dropdown_from_enum(
+            AlignmentChoice, "Speaker Alignment:", transcribe_config.get("alignment")
+        )
         self.vad_filter_checkbox = widgets.Checkbox(
             value=transcribe_config.get("vad_filter") or False,
             description="VAD Filter",
@@ -261,9 +291,56 @@ class GheTranscribeApp:
             style=self.common_widget_style,
         )
 
+        self.chunk_length_input = widgets.FloatText(
+            value=transcribe_config.get("chunk_length") or 0.0,  # 0 disables chunking
+            description="Chunk Length (s):",
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+            step=60.0,
+        )
+        self.chunk_workers_input = widgets.IntText(
+            value=transcribe_config.get("chunk_workers"),
+            description="Chunk Workers:",
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+        )
+        self.batch_size_input = widgets.IntText(
+            value=transcribe_config.get("batch_size") or 0,  # 0 disables batching
+            description="Batch Size:",
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+        )
+        self.max_sentence_duration_input = widgets.FloatText(
+            value=transcribe_config.get("max_sentence_duration") or 0.0,  # 0: no limit
+            description="Max Sentence (s):",
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+        )
+        self.max_sentence_gap_input = widgets.FloatText(
+            value=transcribe_config.get("max_sentence_gap") or 0.0,  # 0: no limit
+            description="Max Pause (s):",
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+        )
+
         self.save_output_checkbox = widgets.Checkbox(
             value=transcribe_config.get("save_output") or True,
-            description="Save Output (.txt, .srt)",
+            description="Save Output",
+            indent=False,
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+        )
+        self.formats_select = widgets.SelectMultiple(
+            options=list(OUTPUT_FORMATS),
+            value=parse_formats(transcribe_config.get("formats")),
+            description="Output Formats:",
+            rows=len(OUTPUT_FORMATS),
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+        )
+        self.save_upload_checkbox = widgets.Checkbox(
+            value=False,
+            description="Save Uploaded Audio (media/)",
             indent=False,
             layout=self.common_widget_layout,
             style=self.common_widget_style,
@@ -275,6 +352,13 @@ class GheTranscribeApp:
             layout=self.common_widget_layout,
             style=self.common_widget_style,
         )
+        self.concurrent_checkbox = widgets.Checkbox(
+            value=transcribe_config.get("concurrent") or False,
+            description="Concurrent ASR and Diarization",
+            indent=False,
+            layout=self.common_widget_layout,
+            style=self.common_widget_style,
+        )
 
         self.advanced_widgets_box = widgets.VBox(
             [
@@ -287,10 +371,19 @@ class GheTranscribeApp:
                 self.beam_size_input,
                 self.temperature_input,
                 self.word_timestamps_checkbox,
+                self.alignment_dropdown,
                 self.vad_filter_checkbox,
                 self.min_silence_duration_ms_input,
+                self.chunk_length_input,
+                self.chunk_workers_input,
+                self.batch_size_input,
+                self.max_sentence_duration_input,
+                self.max_sentence_gap_input,
                 self.save_output_checkbox,
+                self.formats_select,
+                self.save_upload_checkbox,
                 self.info_checkbox,
+                self.concurrent_checkbox,
             ],
             layout=widgets.Layout(
                 width="50%", margin="0 auto", border="1px solid #ccc", padding="15px"
@@ -304,10 +397,17 @@ class GheTranscribeApp:
             button_style="primary",
         )
 
+        self.cancel_button = widgets.Button(
+            description="Cancel",
+            layout=widgets.Layout(width="200px", margin="10px auto"),
+            button_style="danger",
+        )
+
         # Run button box
         self.run_widgets_box = widgets.VBox(
             [
                 self.run_button,
+                self.cancel_button,
             ],
             layout=widgets.Layout(
                 width="50%",
@@ -325,9 +425,13 @@ class GheTranscribeApp:
             layout=widgets.Layout(width="100%", border="1px solid #ddd", padding="10px")
         )
 
+        # One progress row per queued file
+        self.progress_box = widgets.VBox([])
+
         # Output container box
         self.output_widgets_box = widgets.VBox(
             [
+                self.progress_box,
                 self.output_area,
             ],
             layout=widgets.Layout(
@@ -346,6 +450,7 @@ class GheTranscribeApp:
             self._on_advanced_options_checkbox_change, names="value"
         )
         self.run_button.on_click(self._on_run_button_click)
+        self.cancel_button.on_click(self._on_cancel_button_click)
 
     def _on_advanced_options_checkbox_change(self, change):
         """Callback for advanced options checkbox."""
@@ -369,25 +474,26 @@ class GheTranscribeApp:
                 uploaded_files = []
                 for file_metadata in self.audio_uploader.value:
                     uploaded_file_name = file_metadata["name"]
-                    uploaded_content_bytes = file_metadata["content"].tobytes()
-
-                    # Save uploaded file using modern path handling
-                    audio_file_path = save_uploaded_file(
-                        uploaded_file_name, uploaded_content_bytes
+                    # Memoryview of the upload, decoded in place without copies
+                    uploaded_content = file_metadata["content"]
+
+                    if self.save_upload_checkbox.value:
+                        audio_file_path = save_uploaded_file(
+                            uploaded_file_name, uploaded_content
+                        )
+                        logger.info(f"Uploaded audio saved to: {audio_file_path}")
+                        print(f"Uploaded audio saved to: {audio_file_path}")
+
+                    uploaded_files.append(
+                        BufferReader(uploaded_content, name=uploaded_file_name)
                     )
-                    uploaded_files.append(str(audio_file_path))
-                    logger.info(f"Uploaded audio saved to: {audio_file_path}")
-                    print(f"Uploaded audio saved to: {audio_file_path}")
-
-                # Determine if single file or multiple files
-                files_input = uploaded_files[0] if len(uploaded_files) == 1 else uploaded_files
 
-                # Prepare arguments for transcribe
+                # Prepare arguments for transcribe_core
                 kwargs = {
-                    "files": files_input,
                     "trim": self.trim_input.value
                     if self.trim_input.value > 0
                     else None,
+                    "offset": self.offset_input.value,
                     "device": self.device_dropdown.value,
                     "cpu_threads": self.cpu_threads_input.value
                     if self.cpu_threads_input.value > 0
@@ -398,10 +504,21 @@ class GheTranscribeApp:
                     "beam_size": self.beam_size_input.value,
                     "temperature": self.temperature_input.value,
                     "word_timestamps": self.word_timestamps_checkbox.value,
+                    "alignment": self.alignment_dropdown.value,
                     "vad_filter": self.vad_filter_checkbox.value,
                     "min_silence_duration_ms": self.min_silence_duration_ms_input.value,
                     "save_output": self.save_output_checkbox.value,
+                    "formats": list(self.formats_select.value),
                     "info": self.info_checkbox.value,
+                    "concurrent": self.concurrent_checkbox.value,
+                    "chunk_length": self.chunk_length_input.value
+                    if self.chunk_length_input.value > 0
+                    else None,
+                    "chunk_workers": self.chunk_workers_input.value,
+                    "batch_size": self.batch_size_input.value or None,
+                    "max_sentence_duration": self.max_sentence_duration_input.value
+                    or None,
+                    "max_sentence_gap": self.max_sentence_gap_input.value or None,
                     "hf_token": self.hf_token,
                 }
 
@@ -413,8 +530,15 @@ class GheTranscribeApp:
                     kwargs["min_speakers"] = self.min_speakers_input.value
                     kwargs["max_speakers"] = self.max_speakers_input.value
 
-                # Call the ghe_transcribe function
-                transcribe(**kwargs)
+                # Queue one job per file, progress is reported by _on_job_update
+                for audio_file in uploaded_files:
+                    try:
+                        job = self.job_queue.submit(audio_file, **kwargs)
+                    except QueueFullError as e:
+                        logger.warning(f"Could not queue {audio_file.name}: {e}")
+                        print(f"Could not queue {audio_file.name}: {e}")
+                        continue
+                    self._add_job_row(job)
 
             except Exception as e:
                 logger.error(f"An unexpected error occurred: {e}", exc_info=True)
@@ -423,6 +547,56 @@ class GheTranscribeApp:
 
                 traceback.print_exc()  # Print full traceback for debugging
 
+    def _on_cancel_button_click(self, b):
+        """Callback for the cancel button, cancelling queued and running jobs."""
+        for job_id in self.job_rows:
+            self.job_queue.cancel(job_id)
+
+    def _add_job_row(self, job):
+        """Adds a progress row for a queued job."""
+        label = widgets.Label(layout=widgets.Layout(width="60%"))
+        progress_bar = widgets.FloatProgress(
+            min=0.0, max=1.0, layout=widgets.Layout(width="35%")
+        )
+        self.job_rows[job.id] = (label, progress_bar)
+        self.progress_box.children = (
+            *self.progress_box.children,
+            widgets.HBox([label, progress_bar]),
+        )
+        self._on_job_update(job)
+
+    def _on_job_update(self, job):
+        """Shows the stage and progress of a job, called from the job thread."""
+        if job.id not in self.job_rows:
+            return
+        label, progress_bar = self.job_rows[job.id]
+        name = Path(source_name(job.file)).name
+
+        if job.status == "running":
+            stage = job.stage or "starting"
+            if job.stage == "asr" and job.progress is not None:
+                stage = (
+                    f"asr, {job.segments} segments, "
+                    f"{job.position:.0f}/{job.duration:.0f} s"
+                )
+            label.value = f"{name}: {stage}"
+            progress_bar.value = job.progress or 0.0
+        else:
+            label.value = f"{name}: {job.status}"
+
+        if job.status == "done":
+            progress_bar.value = 1.0
+            progress_bar.bar_style = "success"
+            self.output_area.append_stdout(
+                f"Finished {name}: {len(job.result)} segments in "
+                f"{job.metrics['wall_seconds']:.1f} s (RTF {job.metrics['rtf']})\n"
+            )
+        elif job.status == "failed":
+            progress_bar.bar_style = "danger"
+            self.output_area.append_stdout(f"Failed {name}: {job.error}\n")
+        elif job.status == "cancelled":
+            progress_bar.bar_style = "warning"
+
     def display_app(self):
         """Displays all the UI components."""
         display(
@@ -0,0 +1,254 @@
+"""Per-stage benchmarks of the transcription pipeline.
+
+Every stage of transcribe_core is timed separately on real and synthetic
+inputs, and the results are reported as JSON so that they can be compared
+across commits. The suite runs offline on CPU: Whisper models are loaded
+from the local Hugging Face cache and diarization can be replaced by a stub
+for environments without access to the gated pyannote models.
+"""
+
+import json
+import logging
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+from pyannote.core import Annotation, Segment
+from torch import device as to_torch_device
+
+from ghe_transcribe import __version__
+from ghe_transcribe.core import (
+    load_diarization_pipeline,
+    load_whisper_model,
+    run_asr,
+    run_diarization,
+    transcribe_config,
+)
+from ghe_transcribe.metrics import StageTimer
+from ghe_transcribe.registry import registry
+from ghe_transcribe.utils import (
+    MEDIA_DIR,
+    SAMPLE_RATE,
+    decode_audio,
+    diarize_text,
+    snip_audio,
+    to_srt,
+    to_txt,
+    to_wav_pyav,
+    to_whisper_format,
+    write_wav,
+)
+from ghe_transcribe.writers import OUTPUT_FORMATS, write_outputs
+
+logger = logging.getLogger(__name__)
+
+BENCH_FILES = [MEDIA_DIR / "test01.mp3", MEDIA_DIR / "test02.m4a"]
+
+
+class StubDiarizationPipeline:
+    """Offline stand-in for the pyannote pipeline.
+
+    Speakers take turns at a fixed interval, which exercises alignment and
+    sentence merging without downloading the gated models.
+
+    Args:
+        turn_duration: Duration of each speaker turn in seconds
+        num_speakers: Number of alternating speakers
+    """
+
+    def __init__(self, turn_duration: float = 7.0, num_speakers: int = 2):
+        self.turn_duration = turn_duration
+        self.num_speakers = num_speakers
+
+    def __call__(self, file, **kwargs):
+        duration = file["waveform"].shape[-1] / file["sample_rate"]
+        num_speakers = kwargs.get("num_speakers") or self.num_speakers
+        annotation = Annotation()
+        starts = np.arange(0.0, duration, self.turn_duration)
+        for turn, start in enumerate(starts.tolist()):
+            end = min(start + self.turn_duration, duration)
+            annotation[Segment(start, end)] = f"SPEAKER_{turn % num_speakers:02d}"
+        return annotation
+
+
+def synthetic_audio(source: str | Path, minutes: float) -> np.ndarray:
+    """Build a long input by repeating a recording.
+
+    Args:
+        source: Path to the audio file to repeat
+        minutes: Duration of the synthetic input in minutes
+
+    Returns:
+        Mono float32 waveform sampled at SAMPLE_RATE
+    """
+    audio = decode_audio(source)
+    num_samples = int(minutes * 60 * SAMPLE_RATE)
+    return np.resize(audio, num_samples)
+
+
+def benchmark_file(
+    file: str | Path,
+    whisper_model: str = "tiny.en",
+    compute_type: str = "int8",
+    cpu_threads: int | None = None,
+    diarization: str = "stub",
+    batch_sizes: list[int] | None = None,
+) -> dict:
+    """Time every pipeline stage on one audio file.
+
+    Args:
+        file: Path to the audio file
+        whisper_model: Whisper model size, loaded on CPU
+        compute_type: Computation precision (float32, int8)
+        cpu_threads: Number of CPU threads for inference
+        diarization: "stub" for StubDiarizationPipeline, "pyannote" for the real pipeline
+        batch_sizes: Batch sizes of the batched pipeline to time next to the
+            sequential ASR, as stages asr_batch<size>
+
+    Returns:
+        dict: Per-stage latency, real-time factor and memory usage
+    """
+    timer = StageTimer()
+    with TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+
+        with timer("to_wav"):
+            to_wav_pyav(str(file), str(tmp_dir / "audio.wav"))
+
+        with timer.processing(), timer("decode"):
+            audio = decode_audio(file)
+        timer.duration = len(audio) / SAMPLE_RATE
+
+        # Excerpt from the middle, where decoding has to seek
+        with timer("snip_audio"):
+            snip_audio(
+                file,
+                tmp_dir / "snip.wav",
+                start_time=timer.duration / 2,
+                duration=min(30.0, timer.duration / 2),
+            )
+
+        # Unload warm models so that every file measures a cold load
+        registry.clear()
+        with timer("model_load"):
+            model = load_whisper_model(
+                whisper_model,
+                "cpu",
+                0,
+                compute_type,
+                cpu_threads,
+                local_files_only=True,
+            )
+
+        whisper_transcribe_kwargs = {
+            "beam_size": transcribe_config.get("beam_size"),
+            "temperature": transcribe_config.get("temperature"),
+        }
+        with timer.processing(), timer("asr"):
+            segments, _ = run_asr(model, audio, whisper_transcribe_kwargs)
+
+        for batch_size in batch_sizes or []:
+            with timer(f"asr_batch{batch_size}"):
+                run_asr(model, audio, whisper_transcribe_kwargs, batch_size=batch_size)
+
+        if diarization == "pyannote":
+            with timer("diarization_load"):
+                pipeline = load_diarization_pipeline(to_torch_device("cpu"))
+        else:
+            pipeline = StubDiarizationPipeline()
+
+        with timer.processing(), timer("diarization"):
+            diarization_result = run_diarization(pipeline, audio, {})
+
+        with timer.processing(), timer("align"):
+            result = diarize_text(to_whisper_format(segments), diarization_result)
+
+        with timer("to_txt"):
+            (tmp_dir / "audio.txt").write_text(to_txt(result))
+
+        with timer("to_srt"):
+            (tmp_dir / "audio.srt").write_text(to_srt(result))
+
+        with timer("write_outputs"):
+            write_outputs(result, tmp_dir / "audio", list(OUTPUT_FORMATS))
+
+    report = timer.report()
+    report["segments"] = len(result)
+    return report
+
+
+def _git_commit() -> str | None:
+    """Commit of the working tree, if the package runs from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    files: list[str | Path] | None = None,
+    synthetic_minutes: list[float] | None = None,
+    output: str | Path | None = None,
+    **kwargs,
+) -> dict:
+    """Benchmark the pipeline on audio files and synthetic long inputs.
+
+    Args:
+        files: Paths to audio files, defaults to the test files in MEDIA_DIR
+        synthetic_minutes: Durations in minutes of synthetic inputs built from
+            the first file
+        output: Path of the JSON report, None to skip writing it
+        **kwargs: Arguments passed to benchmark_file
+
+    Returns:
+        dict: Benchmark report with environment information and results per input
+    """
+    files = [Path(file) for file in (files or BENCH_FILES)]
+    report = {
+        "version": __version__,
+        "commit": _git_commit(),
+        # datetime.UTC is only available from Python 3.11
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),  # noqa: UP017
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "whisper_model": kwargs.get("whisper_model", "tiny.en"),
+            "compute_type": kwargs.get("compute_type", "int8"),
+            "cpu_threads": kwargs.get("cpu_threads"),
+            "diarization": kwargs.get("diarization", "stub"),
+            "batch_sizes": kwargs.get("batch_sizes"),
+        },
+        "results": {},
+    }
+
+    for file in files:
+        logger.info(f"Benchmarking {file}")
+        report["results"][file.name] = benchmark_file(file, **kwargs)
+
+    with TemporaryDirectory() as tmp_dir:
+        for minutes in synthetic_minutes or []:
+            name = f"synthetic_{minutes:g}min"
+            logger.info(f"Benchmarking {name}")
+            path = write_wav(
+                Path(tmp_dir) / f"{name}.wav", synthetic_audio(files[0], minutes)
+            )
+            report["results"][name] = benchmark_file(path, **kwargs)
+
+    if output is not None:
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        logger.info(f"Benchmark report saved to {output}")
+
+    return report
@@ -0,0 +1,149 @@
+"""Content-addressed on-disk cache of ASR and diarization results."""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from ghe_transcribe.utils import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def audio_hash(audio: np.ndarray, sample_rate: int) -> str:
+    """Hash the decoded audio content, independent of file name and container.
+
+    Args:
+        audio: Mono float32 waveform
+        sample_rate: Sample rate of the waveform in Hz
+
+    Returns:
+        Hexadecimal digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(sample_rate).encode())
+    digest.update(np.ascontiguousarray(audio, dtype=np.float32).data)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash: str, params: dict) -> str:
+    """Combine an audio hash with the parameters a cached layer depends on.
+
+    Args:
+        content_hash: Hash of the decoded audio from audio_hash
+        params: JSON-serializable parameters of the layer
+
+    Returns:
+        Hexadecimal digest
+    """
+    payload = json.dumps([content_hash, params], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """Pickled results stored per layer under their content-addressed key.
+
+    Least recently used entries are evicted once the cache grows beyond
+    max_size_mb.
+
+    Args:
+        cache_dir: Directory holding the cache
+        max_size_mb: Size budget in megabytes, None for no limit
+    """
+
+    def __init__(
+        self, cache_dir: str | Path = CACHE_DIR, max_size_mb: float | None = None
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_mb = max_size_mb
+
+    def _path(self, layer: str, key: str) -> Path:
+        return self.cache_dir / layer / key[:2] / f"{key}.pkl"
+
+    def get(self, layer: str, key: str):
+        """Load a cached result.
+
+        Args:
+            layer: Name of the result layer, e.g. "asr" or "diarization"
+            key: Key from cache_key
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        path = self._path(layer, key)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+        # Refresh the modification time used for LRU eviction
+        os.utime(path)
+        logger.info(f"Result cache hit: {layer}")
+        return value
+
+    def put(self, layer: str, key: str, value):
+        """Store a result and evict old entries if the cache is too large.
+
+        Args:
+            layer: Name of the result layer, e.g. "asr" or "diarization"
+            key: Key from cache_key
+            value: Picklable result
+        """
+        path = self._path(layer, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see partial entries
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def get_or_compute(self, layer: str, key: str, compute):
+        """Return the cached result, computing and storing it on a miss.
+
+        Args:
+            layer: Name of the result layer, e.g. "asr" or "diarization"
+            key: Key from cache_key
+            compute: Callable without arguments returning the result
+
+        Returns:
+            The cached or freshly computed result
+        """
+        value = self.get(layer, key)
+        if value is None:
+            value = compute()
+            self.put(layer, key, value)
+        return value
+
+    def evict(self):
+        """Delete least recently used entries until the size budget is met."""
+        if self.max_size_mb is None:
+            return
+        entries = []
+        for path in self.cache_dir.glob("*/*/*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        budget = self.max_size_mb * 1024 * 1024
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= budget:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Evicted result cache entry {path}")
+
+    def clear(self):
+        """Delete every cached result."""
+        for path in self.cache_dir.glob("*/*/*.pkl"):
+            path.unlink(missing_ok=True)
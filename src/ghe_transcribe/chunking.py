@@ -0,0 +1,197 @@
+"""Chunked transcription of long recordings split at silences."""
+
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+
+from ghe_transcribe.utils import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Whisper seek positions count mel frames of 10 ms
+FRAMES_PER_SECOND = 100
+
+
+def find_chunks(
+    audio: np.ndarray,
+    chunk_length: float,
+    min_silence_duration_ms: int = 2000,
+    sample_rate: int = SAMPLE_RATE,
+) -> list[tuple[int, int]]:
+    """Split audio into chunks of about chunk_length seconds, cut in silences.
+
+    Silences are detected with the Silero VAD model of faster-whisper. Each
+    chunk ends in the middle of the last silence of at least
+    min_silence_duration_ms before the target length, or of the first one
+    after it if there is none. Only recordings without any pause are cut
+    mid-speech.
+
+    Args:
+        audio: Mono float32 waveform
+        chunk_length: Target chunk duration in seconds
+        min_silence_duration_ms: Minimum silence duration where a cut is allowed
+        sample_rate: Sample rate of the waveform in Hz
+
+    Returns:
+        List of (start, end) sample indices covering the whole audio
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    total = len(audio)
+    target = int(chunk_length * sample_rate)
+    if total <= target:
+        return [(0, total)]
+
+    speech = get_speech_timestamps(
+        audio,
+        VadOptions(min_silence_duration_ms=min_silence_duration_ms),
+        sampling_rate=sample_rate,
+    )
+    # Allowed cuts lie in the middle of the silences between speech
+    cuts = np.array(
+        [
+            (previous["end"] + following["start"]) // 2
+            for previous, following in zip(speech, speech[1:])
+        ],
+        dtype=np.int64,
+    )
+
+    chunks = []
+    start = 0
+    while total - start > target:
+        limit = start + target
+        # Prefer the last silence in the second half of the target length
+        before = cuts[(cuts > start + target // 2) & (cuts <= limit)]
+        after = cuts[(cuts > limit) & (cuts < start + 2 * target)]
+        if len(before):
+            end = int(before[-1])
+        elif len(after):
+            end = int(after[0])
+        else:
+            logger.warning(
+                f"No silence found near {limit / sample_rate:.1f} s, cutting mid-speech"
+            )
+            end = limit
+        chunks.append((start, end))
+        start = end
+    chunks.append((start, total))
+    return chunks
+
+
+def _shift_segment(segment, segment_id: int, offset: float):
+    """Move a faster-whisper segment of a chunk to its position in the recording."""
+    words = segment.words
+    if words:
+        words = [
+            replace(word, start=word.start + offset, end=word.end + offset)
+            for word in words
+        ]
+    return replace(
+        segment,
+        id=segment_id,
+        seek=segment.seek + round(offset * FRAMES_PER_SECOND),
+        start=segment.start + offset,
+        end=segment.end + offset,
+        words=words,
+    )
+
+
+def transcribe_chunks(
+    model,
+    audio: np.ndarray,
+    chunks: list[tuple[int, int]],
+    whisper_transcribe_kwargs: dict,
+    workers: int = 1,
+    progress_callback=None,
+):
+    """Transcribe chunks in parallel and stitch their segments back together.
+
+    The language is detected once on the beginning of the recording so that
+    all chunks are transcribed in the same language. Chunks run on a thread
+    pool sharing one model, which decodes up to its num_workers chunks at the
+    same time. Closing or dropping the generator of segments before it is
+    exhausted stops the chunks still being transcribed.
+
+    Args:
+        model: WhisperModel instance
+        audio: Mono float32 waveform sampled at SAMPLE_RATE
+        chunks: (start, end) sample indices from find_chunks
+        whisper_transcribe_kwargs: Keyword arguments for WhisperModel.transcribe
+        workers: Number of chunks transcribed at the same time
+        progress_callback: Called with ("asr", seconds transcribed, duration)
+            after every segment, from the worker threads
+
+    Returns:
+        Tuple of (generator of segments in order with global timestamps,
+        transcription info)
+    """
+    duration = len(audio) / SAMPLE_RATE
+    kwargs = dict(whisper_transcribe_kwargs)
+    language_probability = 1.0
+    if kwargs.get("language") is None:
+        if model.model.is_multilingual:
+            kwargs["language"], language_probability, _ = model.detect_language(audio)
+        else:
+            kwargs["language"] = "en"
+
+    lock = threading.Lock()
+    stop = threading.Event()
+    transcribed = [0.0] * len(chunks)
+
+    def transcribe_chunk(index):
+        start, end = chunks[index]
+        segments, transcription_info = model.transcribe(audio[start:end], **kwargs)
+        chunk_segments = []
+        for segment in segments:
+            if stop.is_set():
+                break
+            chunk_segments.append(segment)
+            if progress_callback is not None:
+                # Report the seconds transcribed over all chunks
+                with lock:
+                    transcribed[index] = segment.end
+                    position = sum(transcribed)
+                progress_callback("asr", position, duration)
+        return chunk_segments, transcription_info
+
+    logger.info(f"Transcribing {len(chunks)} chunks with {workers} workers")
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="ghe_transcribe-chunk"
+    )
+
+    def shutdown():
+        # Queued chunks are cancelled and running ones stop at their next segment
+        stop.set()
+        executor.shutdown(cancel_futures=True)
+
+    futures = [executor.submit(transcribe_chunk, index) for index in range(len(chunks))]
+    try:
+        _, transcription_info = futures[0].result()
+    except BaseException:
+        shutdown()
+        raise
+    transcription_info = replace(
+        transcription_info,
+        language_probability=language_probability,
+        duration=duration,
+    )
+
+    def iter_segments():
+        try:
+            segment_id = 1
+            for (start, _), future in zip(chunks, futures):
+                chunk_segments, _ = future.result()
+                for segment in chunk_segments:
+                    yield _shift_segment(segment, segment_id, start / SAMPLE_RATE)
+                    segment_id += 1
+        finally:
+            shutdown()
+
+    segments = iter_segments()
+    # A generator closed before its first segment never enters its finally
+    weakref.finalize(segments, shutdown)
+    return segments, transcription_info
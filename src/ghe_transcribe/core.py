@@ -1,37 +1,61 @@
+import json
 import logging
 import os
+from collections.abc import Callable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack
 from enum import Enum
+from functools import partial
+from multiprocessing import get_context
 from pathlib import Path
+from time import monotonic
+from typing import BinaryIO
 
 # Set environment variables early to disable HF progress bars and telemetry
 os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
 os.environ["HF_HUB_DISABLE_TELEMETRY"] = "1"
 # Disable pyannote telemetry to avoid PyTorch compatibility issues
 os.environ["PYANNOTE_DISABLE_TELEMETRY"] = "1"
-from faster_whisper import WhisperModel
+import numpy as np
 from huggingface_hub import login
-from pyannote.audio import Pipeline
-from torch import device as to_torch_device
-from torch import set_num_threads
-from torch.backends.mps import is_available as mps_is_available
-from torch.cuda import is_available as cuda_is_available
 from typer import Argument, Option, Typer
+from typer.core import TyperGroup
 
+from ghe_transcribe.alignment import SpeakerIndex
+from ghe_transcribe.cache import ResultCache, audio_hash, cache_key
+from ghe_transcribe.chunking import find_chunks, transcribe_chunks
 from ghe_transcribe.exceptions import (
     DiarizationError,
     ModelInitializationError,
 )
+from ghe_transcribe.ingest import AudioPrefetcher, expand_inputs, is_file_pattern
+from ghe_transcribe.machine import load_machine_profile
+from ghe_transcribe.manifest import MANIFEST_NAME, BatchManifest, params_hash
+from ghe_transcribe.metrics import StageTimer, save_metrics
+from ghe_transcribe.probe import PROBE_INDEX_NAME, ProbeIndex, window_duration
+from ghe_transcribe.profiling import StageProfiler
+from ghe_transcribe.registry import registry
+from ghe_transcribe.transcript import Transcript
 from ghe_transcribe.utils import (
+    CACHE_DIR,
     OUTPUT_DIR,
+    SAMPLE_RATE,
+    align_text,
+    decode_audio,
     diarize_text,
+    iter_merge_sentence,
     log_hf_authentication_error,
-    snip_audio,
+    shift_segments,
+    source_name,
     timing,
-    to_srt,
-    to_txt,
-    to_wav,
     to_whisper_format,
 )
+from ghe_transcribe.writers import INCREMENTAL_WRITERS, parse_formats, write_outputs
 
 
 class DeviceChoice(str, Enum):
@@ -47,6 +71,21 @@ class ComputeTypeChoice(str, Enum):
     int8 = "int8"
 
 
+class AlignmentChoice(str, Enum):
+    segment = "segment"
+    word = "word"
+
+
+class MetricsChoice(str, Enum):
+    json = "json"
+    prometheus = "prometheus"
+
+
+class ScheduleChoice(str, Enum):
+    input = "input"
+    longest = "longest"
+
+
 class WhisperModelChoice(str, Enum):
     tiny_en = "tiny.en"
     tiny = "tiny"
@@ -70,6 +109,7 @@ class WhisperModelChoice(str, Enum):
 
 transcribe_config = {
     "trim": None,
+    "offset": 0.0,
     "device": "auto",
     "cpu_threads": None,
     "whisper_model": "large-v3-turbo",
@@ -84,10 +124,63 @@ transcribe_config = {
     "min_speakers": None,
     "max_speakers": None,
     "save_output": True,
+    "formats": "txt,srt",
+    "max_sentence_duration": None,
+    "max_sentence_gap": None,
+    "sentence_end": None,
     "info": True,
+    "model_cache_mb": None,
+    "concurrent": False,
+    "workers": 1,
+    "resume": False,
+    "retries": 1,
+    "recursive": False,
+    "extensions": None,
+    "prefetch": 2,
+    "prefetch_max_mb": 1024,
+    "schedule": "longest",
+    "alignment": "segment",
+    "stream": False,
+    "cache": True,
+    "cache_max_mb": 2048,
+    "chunk_length": None,
+    "chunk_workers": 2,
+    "batch_size": None,
+    "metrics": None,
+    "profile": False,
 }
+# Settings tuned for this machine by ``transcribe tune`` replace the defaults
+transcribe_config.update(load_machine_profile())
+
+DIARIZATION_PIPELINE = "pyannote/speaker-diarization-3.1"
+
 
-app = Typer(help="Transcribe and diarize an audio file.")
+class DefaultCommandGroup(TyperGroup):
+    """Command group running transcribe unless another command is named.
+
+    Keeps ``transcribe file.mp3`` working next to subcommands such as
+    ``transcribe bench``, while options of the group itself, like ``--help``,
+    still list the subcommands.
+    """
+
+    default_command = "transcribe"
+
+    def parse_args(self, ctx, args):
+        group_options = {
+            option
+            for param in self.get_params(ctx)
+            for option in (*param.opts, *param.secondary_opts)
+        }
+        if not args or (args[0] not in self.commands and args[0] not in group_options):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+app = Typer(
+    cls=DefaultCommandGroup,
+    help="Transcribe and diarize an audio file.",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
 
 # Set up simple logging
 logging.basicConfig(
@@ -96,9 +189,346 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _whisper_model_key(
+    whisper_model: str,
+    device: str,
+    device_index: int,
+    compute_type: str,
+    cpu_threads: int | None = None,
+    num_workers: int = 1,
+) -> tuple:
+    """Model registry key of a Whisper model configuration."""
+    # CTranslate2 has no MPS backend, run on CPU instead
+    whisper_device = "cpu" if device == "mps" else device
+    return (
+        "whisper",
+        whisper_model,
+        whisper_device,
+        device_index,
+        compute_type,
+        cpu_threads,
+        num_workers,
+    )
+
+
+def _diarization_pipeline_key(torch_device) -> tuple:
+    """Model registry key of the diarization pipeline on a device."""
+    return ("pyannote", DIARIZATION_PIPELINE, str(torch_device))
+
+
+def load_whisper_model(
+    whisper_model: str,
+    device: str,
+    device_index: int,
+    compute_type: str,
+    cpu_threads: int | None = None,
+    num_workers: int = 1,
+    local_files_only: bool = False,
+):
+    """Get a warm Whisper model from the model registry, loading it on a miss.
+
+    Args:
+        whisper_model: Whisper model size to use
+        device: Resolved device (cuda, mps, cpu)
+        device_index: Device index for multi-GPU systems
+        compute_type: Computation precision (float32, float16, int8)
+        cpu_threads: Number of CPU threads for inference, per worker
+        num_workers: Number of transcriptions the model can run in parallel
+        local_files_only: Load the model from the local cache, never download it
+
+    Returns:
+        WhisperModel instance
+
+    Raises:
+        ModelInitializationError: If model initialization fails
+    """
+    key = _whisper_model_key(
+        whisper_model, device, device_index, compute_type, cpu_threads, num_workers
+    )
+    whisper_device = key[2]
+
+    # https://github.com/SYSTRAN/faster-whisper/blob/1383fd4d3725bdf59c95d8834c629f45c6974981/faster_whisper/transcribe.py#L586
+
+    # Create a dictionary of keyword arguments
+    whisper_model_kwargs = {}
+    if cpu_threads is not None:
+        whisper_model_kwargs["cpu_threads"] = cpu_threads
+
+    def loader():
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(
+            model_size_or_path=whisper_model,
+            device=whisper_device,
+            device_index=device_index,
+            compute_type=compute_type,
+            num_workers=num_workers,
+            download_root=None,
+            local_files_only=local_files_only,
+            files=None,
+            **whisper_model_kwargs,
+        )
+
+    try:
+        return registry.get(key, loader)
+    except Exception as e:
+        logger.error(f"WhisperModel Device Error: {e}")
+        raise ModelInitializationError(
+            f"Failed to initialize Whisper model: {e}"
+        ) from e
+
+
+def load_diarization_pipeline(torch_device):
+    """Get a warm pyannote pipeline from the model registry, loading it on a miss.
+
+    Args:
+        torch_device: torch device to move the pipeline to
+
+    Returns:
+        pyannote.audio Pipeline instance
+    """
+    key = _diarization_pipeline_key(torch_device)
+
+    def loader():
+        from pyannote.audio import Pipeline
+
+        logger.info(
+            "Loading speaker diarization model (this may take a moment on first run)..."
+        )
+        # Load the pipeline (pyannote 3.3.1 doesn't support token parameter)
+        return Pipeline.from_pretrained(DIARIZATION_PIPELINE).to(torch_device)
+
+    return registry.get(key, loader)
+
+
+def split_cpu_threads(cpu_threads: int | None = None) -> tuple[int, int]:
+    """Split a CPU thread budget between concurrent ASR and diarization.
+
+    Args:
+        cpu_threads: Total number of CPU threads, None for all available cores
+
+    Returns:
+        Tuple of (asr_threads, diarization_threads)
+    """
+    total = cpu_threads or os.cpu_count() or 1
+    asr_threads = max(1, total // 2)
+    diarization_threads = max(1, total - asr_threads)
+    return asr_threads, diarization_threads
+
+
+def start_asr(
+    model,
+    audio,
+    whisper_transcribe_kwargs: dict,
+    progress_callback=None,
+    chunks: list[tuple[int, int]] | None = None,
+    chunk_workers: int = 1,
+    batch_size: int | None = None,
+):
+    """Start faster-whisper, on the whole audio, on chunks in parallel or batched.
+
+    Args:
+        model: WhisperModel instance
+        audio: Mono float32 waveform sampled at SAMPLE_RATE
+        whisper_transcribe_kwargs: Keyword arguments for WhisperModel.transcribe
+        progress_callback: Called with ("asr", seconds transcribed, duration)
+            after every segment
+        chunks: (start, end) sample indices from find_chunks, None to
+            transcribe the audio at once
+        chunk_workers: Number of chunks transcribed at the same time
+        batch_size: Decode this many VAD segments at once with the batched
+            pipeline, None to decode sequentially
+
+    Returns:
+        Tuple of (lazy generator of segments, transcription info)
+    """
+    if batch_size:
+        from faster_whisper import BatchedInferencePipeline
+
+        segments, transcription_info = BatchedInferencePipeline(model).transcribe(
+            audio, batch_size=batch_size, **whisper_transcribe_kwargs
+        )
+    elif chunks is not None and len(chunks) > 1:
+        return transcribe_chunks(
+            model,
+            audio,
+            chunks,
+            whisper_transcribe_kwargs,
+            workers=chunk_workers,
+            progress_callback=progress_callback,
+        )
+    else:
+        segments, transcription_info = model.transcribe(
+            audio, **whisper_transcribe_kwargs
+        )
+    if progress_callback is not None:
+        segments = _report_segments(
+            segments, len(audio) / SAMPLE_RATE, progress_callback
+        )
+    return segments, transcription_info
+
+
+def run_asr(
+    model, audio, whisper_transcribe_kwargs: dict, progress_callback=None, **kwargs
+):
+    """Run faster-whisper and drain its lazy segment generator.
+
+    Args:
+        model: WhisperModel instance
+        audio: Mono float32 waveform sampled at SAMPLE_RATE
+        whisper_transcribe_kwargs: Keyword arguments for WhisperModel.transcribe
+        progress_callback: Called with ("asr", seconds transcribed, duration)
+            after every segment
+        **kwargs: Chunking arguments passed to start_asr
+
+    Returns:
+        Tuple of (list of segments, transcription info)
+    """
+    segments, transcription_info = start_asr(
+        model, audio, whisper_transcribe_kwargs, progress_callback, **kwargs
+    )
+    return list(segments), transcription_info
+
+
+def _report_segments(segments, duration: float, progress_callback):
+    """Pass segments through, reporting the transcribed position of each one."""
+    for segment in segments:
+        progress_callback("asr", segment.end, duration)
+        yield segment
+
+
+def run_diarization(pipeline, audio, pyannote_kwargs: dict):
+    """Run the pyannote speaker diarization pipeline.
+
+    Args:
+        pipeline: pyannote.audio Pipeline instance
+        audio: Mono float32 waveform sampled at SAMPLE_RATE
+        pyannote_kwargs: Speaker count hints for the pipeline
+
+    Returns:
+        pyannote Annotation with speaker turns
+
+    Raises:
+        DiarizationError: If speaker diarization fails
+    """
+    from torch import from_numpy
+
+    try:
+        # Pass the in-memory waveform as a (channel, time) tensor
+        diarization_result = pipeline(
+            {"waveform": from_numpy(audio)[None], "sample_rate": SAMPLE_RATE},
+            **pyannote_kwargs,
+        )
+        logger.info("Speaker diarization completed successfully")
+    except Exception as e:
+        _raise_diarization_error(e)
+    return diarization_result
+
+
+def transcribe_stream(
+    segments,
+    diarize,
+    alignment: str = "segment",
+    offset: float | None = None,
+    output_stem: str | None = None,
+    formats=("txt", "srt"),
+    sentence_rules: dict | None = None,
+):
+    """Align and write segments as they flow through a generator pipeline.
+
+    Diarization runs in a background thread while the faster-whisper segments
+    are consumed. Segments are only buffered until diarization is available,
+    then aligned, merged into sentences and appended to the TXT and SRT
+    outputs as soon as each sentence is final.
+
+    Args:
+        segments: Iterable of faster-whisper segments, typically the lazy
+            generator returned by WhisperModel.transcribe
+        diarize: Callable without arguments returning the pyannote Annotation
+        alignment: Assign speakers per "segment" or per "word"
+        offset: Seconds added to every timestamp
+        output_stem: Name of the TXT and SRT files in OUTPUT_DIR, None to not save
+        formats: Output formats, of which TXT and SRT are written incrementally
+        sentence_rules: Keyword arguments of SentenceMerger
+
+    Returns:
+        Tuple of (Transcript of the sentences, diarization result)
+    """
+    from pyannote.core import Segment
+
+    with (
+        ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ghe_transcribe"
+        ) as executor,
+        ExitStack() as stack,
+    ):
+        diarization_future = executor.submit(diarize)
+
+        writers = []
+        if output_stem is not None:
+            writers = [
+                stack.enter_context(
+                    INCREMENTAL_WRITERS[name](OUTPUT_DIR / f"{output_stem}.{name}")
+                )
+                for name in parse_formats(formats)
+                if name in INCREMENTAL_WRITERS
+            ]
+
+        text = []
+        aligned = _iter_aligned_segments(segments, diarization_future, alignment)
+        for seg, spk, sentence in iter_merge_sentence(
+            aligned, **(sentence_rules or {})
+        ):
+            if offset:
+                # Report timestamps relative to the start of the original file
+                seg = Segment(seg.start + offset, seg.end + offset)
+            for writer in writers:
+                writer.write(seg, spk, sentence)
+            text.append((seg, spk, sentence))
+
+    for writer in writers:
+        logger.info(f"Output saved to {writer.path}")
+    return Transcript.from_tuples(text), diarization_future.result()
+
+
+def _collect(items, collected: list):
+    """Pass items through while appending them to collected."""
+    for item in items:
+        collected.append(item)
+        yield item
+
+
+def _iter_aligned_segments(segments, diarization_future, alignment: str):
+    """Align faster-whisper segments as soon as diarization is available."""
+    pending = []
+    speaker_index = None
+    for segment in segments:
+        pending.append(segment)
+        if speaker_index is None and diarization_future.done():
+            speaker_index = SpeakerIndex(diarization_future.result())
+        if speaker_index is not None:
+            yield from align_text(to_whisper_format(pending), speaker_index, alignment)
+            pending = []
+
+    if speaker_index is None:
+        speaker_index = SpeakerIndex(diarization_future.result())
+    yield from align_text(to_whisper_format(pending), speaker_index, alignment)
+
+
+def _raise_diarization_error(e: Exception):
+    """Log a diarization failure and re-raise it as DiarizationError."""
+    logger.error(f"Diarization Error: {e}")
+    if (
+        "401 Client Error" in str(e) or "403 Client Error" in str(e)
+    ) and "gated repo" in str(e):
+        log_hf_authentication_error(logger, str(e))
+    raise DiarizationError(f"Failed to perform speaker diarization: {e}") from e
+
+
 def transcribe_core(
-    file: str,
+    file: str | BinaryIO,
     trim: float | None = None,
+    offset: float | None = None,
     device: str | None = None,
     cpu_threads: int | None = None,
     whisper_model: str | None = None,
@@ -114,11 +544,30 @@ def transcribe_core(
     max_speakers: int | None = None,
     save_output: bool | None = None,
     info: bool | None = None,
+    model_cache_mb: float | None = None,
+    concurrent: bool | None = None,
+    alignment: str | None = None,
+    stream: bool | None = None,
+    cache: bool | None = None,
+    cache_max_mb: float | None = None,
+    chunk_length: float | None = None,
+    chunk_workers: int | None = None,
+    batch_size: int | None = None,
+    metrics: str | None = None,
+    profile: bool | None = None,
+    formats: str | list[str] | None = None,
+    max_sentence_duration: float | None = None,
+    max_sentence_gap: float | None = None,
+    sentence_end: str | None = None,
+    audio: np.ndarray | None = None,
     hf_token: str | None = None,
+    progress_callback: Callable[[str, float | None, float | None], None] | None = None,
+    return_metrics: bool = False,
 ):
-    """Transcribe and diarize an audio file.\n    \n    Args:\n        file: Path to the audio file to transcribe\n        trim: Trim audio to specified seconds (from start)\n        device: Device to use for inference (auto, cuda, mps, cpu)\n        cpu_threads: Number of CPU threads for inference\n        whisper_model: Whisper model size to use\n        device_index: Device index for multi-GPU systems\n        compute_type: Computation precision (float32, float16, int8)\n        beam_size: Beam search width for decoding\n        temperature: Sampling temperature for generation\n        word_timestamps: Enable word-level timestamps\n        vad_filter: Enable voice activity detection filter\n        min_silence_duration_ms: Minimum silence duration for VAD\n        num_speakers: Exact number of speakers (overrides min/max)\n        min_speakers: Minimum number of speakers for diarization\n        max_speakers: Maximum number of speakers for diarization\n        save_output: Save transcription to TXT and SRT files\n        info: Print detected language information\n        hf_token: Hugging Face token for accessing gated models\n        \n    Returns:\n        List of tuples containing (segment, speaker, text)\n        \n    Raises:\n        ModelInitializationError: If model initialization fails\n        DiarizationError: If speaker diarization fails\n        AudioConversionError: If audio conversion fails\n"""
+    """Transcribe and diarize an audio file.\n    \n    Args:\n        file: Path or binary file-like object of the audio file to transcribe\n        trim: Trim audio to specified seconds (from offset)\n        offset: Start transcribing at the specified seconds\n        device: Device to use for inference (auto, cuda, mps, cpu)\n        cpu_threads: Number of CPU threads for inference\n        whisper_model: Whisper model size to use\n        device_index: Device index for multi-GPU systems\n        compute_type: Computation precision (float32, float16, int8)\n        beam_size: Beam search width for decoding\n        temperature: Sampling temperature for generation\n        word_timestamps: Enable word-level timestamps\n        vad_filter: Enable voice activity detection filter\n        min_silence_duration_ms: Minimum silence duration for VAD\n        num_speakers: Exact number of speakers (overrides min/max)\n        min_speakers: Minimum number of speakers for diarization\n        max_speakers: Maximum number of speakers for diarization\n        save_output: Save transcription to the output formats\n        info: Print detected language information\n        model_cache_mb: Memory budget in MB for warm models kept between calls, set for the whole process until another call sets it\n        concurrent: Run ASR and speaker diarization at the same time\n        alignment: Assign speakers per segment, or per word (enables word timestamps)\n        stream: Write TXT and SRT lines incrementally while transcribing\n        cache: Reuse cached ASR and diarization results for identical audio\n        cache_max_mb: Size budget in MB of the on-disk result cache\n        chunk_length: Split long audio at silences into chunks of about this many seconds, transcribed in parallel\n        chunk_workers: Number of chunks transcribed at the same time\n        batch_size: Transcribe VAD segments in batches of this size with the batched pipeline (enables the VAD filter)\n        metrics: Save per-stage metrics next to the output as "json" or "prometheus" text\n        profile: Profile every stage with cProfile, and diarization with the torch profiler, into a <name>.profile directory of the output\n        formats: Output formats saved with save_output, comma-separated or a list of txt, srt, csv, md and json\n        max_sentence_duration: Split merged sentences longer than this many seconds\n        max_sentence_gap: Split merged sentences at silences longer than this many seconds\n        sentence_end: Characters ending a sentence, by default .?! with their CJK, Arabic and Devanagari forms\n        audio: Waveform of the requested window already decoded at 16 kHz, e.g. by a prefetcher, instead of decoding file\n        hf_token: Hugging Face token for accessing gated models\n        progress_callback: Called as (stage, position, duration) with the name of each stage as it starts and position and duration set to None, and during ASR after every segment with position the seconds transcribed and duration those of the audio; exceptions it raises abort the transcription\n        return_metrics: Also return the per-stage metrics report\n        \n    Returns:\n        Transcript of the sentences, iterating as (segment, speaker, text) tuples, or a tuple of (transcript, metrics report) if return_metrics is set\n        \n    Raises:\n        ModelInitializationError: If model initialization fails\n        DiarizationError: If speaker diarization fails\n        AudioConversionError: If audio conversion fails\n"""
     # Apply defaults
     trim = trim if trim is not None else transcribe_config.get("trim")
+    offset = offset if offset is not None else transcribe_config.get("offset")
     device = device if device is not None else transcribe_config.get("device")
     cpu_threads = (
         cpu_threads if cpu_threads is not None else transcribe_config.get("cpu_threads")
@@ -176,19 +625,108 @@ def transcribe_core(
         save_output if save_output is not None else transcribe_config.get("save_output")
     )
     info = info if info is not None else transcribe_config.get("info")
+    model_cache_mb = (
+        model_cache_mb
+        if model_cache_mb is not None
+        else transcribe_config.get("model_cache_mb")
+    )
+    # The budget holds for the whole process, calls without one keep it
+    if model_cache_mb is not None:
+        registry.set_budget(model_cache_mb)
+    concurrent = (
+        concurrent if concurrent is not None else transcribe_config.get("concurrent")
+    )
+    alignment = (
+        alignment if alignment is not None else transcribe_config.get("alignment")
+    )
+    stream = stream if stream is not None else transcribe_config.get("stream")
+    cache = cache if cache is not None else transcribe_config.get("cache")
+    cache_max_mb = (
+        cache_max_mb
+        if cache_max_mb is not None
+        else transcribe_config.get("cache_max_mb")
+    )
+    chunk_length = (
+        chunk_length
+        if chunk_length is not None
+        else transcribe_config.get("chunk_length")
+    )
+    chunk_workers = (
+        chunk_workers
+        if chunk_workers is not None
+        else transcribe_config.get("chunk_workers")
+    )
+    batch_size = (
+        batch_size if batch_size is not None else transcribe_config.get("batch_size")
+    )
+    if batch_size:
+        # The batched pipeline splits the audio at VAD segments
+        vad_filter = True
+        if chunk_length:
+            logger.warning("Batched inference replaces chunking, ignoring chunk_length")
+            chunk_length = None
+    if not chunk_length:
+        # Without chunking the model transcribes one stream at a time
+        chunk_workers = 1
+    metrics = metrics if metrics is not None else transcribe_config.get("metrics")
+    profile = profile if profile is not None else transcribe_config.get("profile")
+    formats = parse_formats(
+        formats if formats is not None else transcribe_config.get("formats")
+    )
+    max_sentence_duration = (
+        max_sentence_duration
+        if max_sentence_duration is not None
+        else transcribe_config.get("max_sentence_duration")
+    )
+    max_sentence_gap = (
+        max_sentence_gap
+        if max_sentence_gap is not None
+        else transcribe_config.get("max_sentence_gap")
+    )
+    sentence_end = (
+        sentence_end
+        if sentence_end is not None
+        else transcribe_config.get("sentence_end")
+    )
+    sentence_rules = {
+        "max_duration": max_sentence_duration,
+        "max_gap": max_sentence_gap,
+    }
+    if sentence_end:
+        sentence_rules["punctuation"] = sentence_end
+    if alignment == "word":
+        # Word-level alignment needs the word timestamps from faster-whisper
+        word_timestamps = True
 
-    # Convert audio file to .wav
-    file = to_wav(file)
-
-    if trim is not None:
-        file_path = Path(file)
-        trimmed_name = f"{file_path.stem}_{int(trim)}_seconds{file_path.suffix}"
-        file = snip_audio(
-            file,
-            str(file_path.parent / trimmed_name),
-            0.0,
-            trim,
-        )
+    def report_stage(stage, position=None, duration=None):
+        if progress_callback is not None:
+            progress_callback(stage, position, duration)
+
+    end = offset + trim if trim is not None else None
+    file_stem = Path(source_name(file)).stem
+    if offset:
+        window_end = int(end) if end is not None else "end"
+        file_stem = f"{file_stem}_{int(offset)}-{window_end}_seconds"
+    elif trim is not None:
+        file_stem = f"{file_stem}_{int(trim)}_seconds"
+
+    profiler = None
+    if profile:
+        profiler = StageProfiler(OUTPUT_DIR / f"{file_stem}.profile")
+    timer = StageTimer(profiler=profiler)
+    report_stage("decode")
+
+    # Decode the requested window once into memory, shared by ASR and diarization
+    with timer.processing(), timer("decode", prefetched=audio is not None or None):
+        if audio is None:
+            audio = decode_audio(file, start=offset, end=end)
+    timer.duration = len(audio) / SAMPLE_RATE
+
+    # Heavy backends are imported on first use to keep the CLI startup fast
+    from torch import device as to_torch_device
+    from torch import set_num_threads
+    from torch.backends.mps import is_available as mps_is_available
+    from torch.cuda import is_available as cuda_is_available
 
     # Device
     if device == "auto":
@@ -204,46 +742,16 @@ def transcribe_core(
             f"Failed to initialize device {device}: {e}"
         ) from e
 
-    # Automatic Speech Recognition (ASR): faster-whisper
-    # https://github.com/SYSTRAN/faster-whisper/blob/1383fd4d3725bdf59c95d8834c629f45c6974981/faster_whisper/transcribe.py#L586
-
-    # Create a dictionary of keyword arguments
-    whisper_model_kwargs = {}
-    if cpu_threads is not None:
-        whisper_model_kwargs["cpu_threads"] = cpu_threads
-        set_num_threads(cpu_threads)
-
-    try:
-        match device:
-            case "mps" | "cpu":
-                model = WhisperModel(
-                    model_size_or_path=whisper_model,
-                    device="cpu",
-                    device_index=device_index,
-                    compute_type=compute_type,
-                    num_workers=1,
-                    download_root=None,
-                    local_files_only=False,
-                    files=None,
-                    **whisper_model_kwargs,
-                )
-            case _:
-                model = WhisperModel(
-                    model_size_or_path=whisper_model,
-                    device=torch_device,
-                    device_index=device_index,
-                    compute_type=compute_type,
-                    num_workers=1,
-                    download_root=None,
-                    local_files_only=False,
-                    files=None,
-                    **whisper_model_kwargs,
-                )
-    except Exception as e:
-        logger.error(f"WhisperModel Device Error: {e}")
-        raise ModelInitializationError(
-            f"Failed to initialize Whisper model: {e}"
-        ) from e
+    # In concurrent and streaming mode ASR and diarization share the CPU threads
+    asr_threads = cpu_threads
+    diarization_threads = cpu_threads
+    if concurrent or stream:
+        asr_threads, diarization_threads = split_cpu_threads(cpu_threads)
+    if diarization_threads is not None:
+        set_num_threads(diarization_threads)
+    if chunk_workers > 1:
+        # Every chunk worker of the model gets its share of the ASR threads
+        asr_threads = max(1, (asr_threads or os.cpu_count() or 1) // chunk_workers)
 
     # https://github.com/SYSTRAN/faster-whisper/blob/1383fd4d3725bdf59c95d8834c629f45c6974981/faster_whisper/transcribe.py#L255
 
@@ -262,9 +770,6 @@ def transcribe_core(
             "min_silence_duration_ms": min_silence_duration_ms
         }
 
-    segments, info = model.transcribe(file, **whisper_transcribe_kwargs)
-    generated_segments = list(segments)
-
     # Speaker Diarization: pyannote.audio
 
     # Create a dictionary of keyword arguments
@@ -287,91 +792,455 @@ def transcribe_core(
     if _max_speakers is not None:
         pyannote_kwargs["max_speakers"] = _max_speakers
 
-    try:
-        # Use gated pyannote model from Hugging Face Hub
-        # Login with token if provided, or use existing authentication
-        if hf_token:
-            login(token=hf_token, add_to_git_credential=False)
+    # Look up both stages in the result cache, keyed by audio content
+    asr_result = None
+    diarization_result = None
+    result_cache = None
+    if cache:
+        result_cache = ResultCache(max_size_mb=cache_max_mb)
+        content_hash = audio_hash(audio, SAMPLE_RATE)
+        asr_key = cache_key(
+            content_hash,
+            {
+                "whisper_model": whisper_model,
+                "compute_type": compute_type,
+                "chunk_length": chunk_length,
+                "batch_size": batch_size,
+                **whisper_transcribe_kwargs,
+            },
+        )
+        diarization_key = cache_key(
+            content_hash, {"pipeline": DIARIZATION_PIPELINE, **pyannote_kwargs}
+        )
+        asr_result = result_cache.get("asr", asr_key)
+        diarization_result = result_cache.get("diarization", diarization_key)
+    cached_asr = asr_result is not None
+    cached_diarization = diarization_result is not None
 
-        # Environment variables already set at module level to disable progress bars
+    def cache_status(hit):
+        # Result cache hits are only reported when the cache is enabled
+        return None if result_cache is None else "hit" if hit else "miss"
 
-        logger.info(
-            "Loading speaker diarization model (this may take a moment on first run)..."
-        )
-        # Load the pipeline (pyannote 3.3.1 doesn't support token parameter)
-        pipeline = Pipeline.from_pretrained(
-            "pyannote/speaker-diarization-3.1"
-        ).to(torch_device)
+    report_stage("load_models")
 
-        # Apply diarization with proper file handling
-        diarization_result = pipeline({"audio": file}, **pyannote_kwargs)
-        logger.info("Speaker diarization model loaded successfully")
+    with timer("model_load") as stage:
+        # Automatic Speech Recognition (ASR): faster-whisper
+        if not cached_asr:
+            stage["whisper_cache"] = (
+                "hit"
+                if _whisper_model_key(
+                    whisper_model,
+                    device,
+                    device_index,
+                    compute_type,
+                    asr_threads,
+                    chunk_workers,
+                )
+                in registry
+                else "miss"
+            )
+            model = load_whisper_model(
+                whisper_model=whisper_model,
+                device=device,
+                device_index=device_index,
+                compute_type=compute_type,
+                cpu_threads=asr_threads,
+                num_workers=chunk_workers,
+            )
 
-    except Exception as e:
-        logger.error(f"Diarization Error: {e}")
-        if (
-            "401 Client Error" in str(e) or "403 Client Error" in str(e)
-        ) and "gated repo" in str(e):
-            log_hf_authentication_error(logger, str(e))
-        raise DiarizationError(f"Failed to perform speaker diarization: {e}") from e
+        if not cached_diarization:
+            stage["diarization_cache"] = (
+                "hit" if _diarization_pipeline_key(torch_device) in registry else "miss"
+            )
+            try:
+                # Use gated pyannote model from Hugging Face Hub
+                # Login with token if provided, or use existing authentication
+                if hf_token:
+                    login(token=hf_token, add_to_git_credential=False)
 
-    # Text alignment
-    text = diarize_text(to_whisper_format(generated_segments), diarization_result)
+                # Environment variables already set at module level to disable progress bars
 
-    # Extract audio_file name and create output paths
-    file_stem = Path(file).stem
+                pipeline = load_diarization_pipeline(torch_device)
+            except Exception as e:
+                _raise_diarization_error(e)
 
-    if save_output:
-        txt_path = OUTPUT_DIR / f"{file_stem}.txt"
-        srt_path = OUTPUT_DIR / f"{file_stem}.srt"
+    # Overlapping ASR and diarization count once towards the real-time factor
+    with timer.processing():
+        # Long audio is cut at silences into chunks transcribed in parallel
+        chunks = None
+        if chunk_length and not cached_asr:
+            with timer("chunking"):
+                chunks = find_chunks(audio, chunk_length, min_silence_duration_ms)
+            logger.info(f"Split audio into {len(chunks)} chunks")
 
-        txt = to_txt(text)
-        txt_path.write_text(txt)
-        logger.info(f"Output saved to {txt_path}")
+        def asr():
+            with timer("asr", cache=cache_status(cached_asr)):
+                if cached_asr:
+                    return asr_result
+                return run_asr(
+                    model,
+                    audio,
+                    whisper_transcribe_kwargs,
+                    report_stage,
+                    chunks=chunks,
+                    chunk_workers=chunk_workers,
+                    batch_size=batch_size,
+                )
+
+        def diarize():
+            with timer("diarization", cache=cache_status(cached_diarization)):
+                if cached_diarization:
+                    return diarization_result
+                report_stage("diarization")
+                return run_diarization(pipeline, audio, pyannote_kwargs)
+
+        report_stage("asr")
+
+        if stream:
+            # ASR drives the stream, so its stage includes alignment and writing
+            with timer("asr", cache=cache_status(cached_asr)):
+                if cached_asr:
+                    segments, transcription_info = asr_result
+                else:
+                    segments, transcription_info = start_asr(
+                        model,
+                        audio,
+                        whisper_transcribe_kwargs,
+                        report_stage,
+                        chunks=chunks,
+                        chunk_workers=chunk_workers,
+                        batch_size=batch_size,
+                    )
+                    if result_cache is not None:
+                        # Keep the streamed segments to store them in the cache afterwards
+                        streamed_segments = []
+                        segments = _collect(segments, streamed_segments)
+                        asr_result = (streamed_segments, transcription_info)
+
+                text, diarization_result = transcribe_stream(
+                    segments,
+                    diarize,
+                    alignment=alignment,
+                    offset=offset,
+                    output_stem=file_stem if save_output else None,
+                    formats=formats,
+                    sentence_rules=sentence_rules,
+                )
+        else:
+            if concurrent and not cached_asr and not cached_diarization:
+                # Both backends release the GIL while running, so threads suffice
+                with ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="ghe_transcribe"
+                ) as executor:
+                    asr_future = executor.submit(asr)
+                    diarization_future = executor.submit(diarize)
+                    asr_result = asr_future.result()
+                    diarization_result = diarization_future.result()
+            else:
+                asr_result = asr()
+                diarization_result = diarize()
+            generated_segments, transcription_info = asr_result
+
+            # Text alignment
+            report_stage("align")
+            with timer("align"):
+                text = diarize_text(
+                    to_whisper_format(generated_segments),
+                    diarization_result,
+                    alignment,
+                    **sentence_rules,
+                )
+                if offset:
+                    # Report timestamps relative to the start of the original file
+                    text = shift_segments(text, offset)
+
+    if result_cache is not None:
+        if not cached_asr:
+            result_cache.put("asr", asr_key, asr_result)
+        if not cached_diarization:
+            result_cache.put("diarization", diarization_key, diarization_result)
 
-        srt = to_srt(text)
-        srt_path.write_text(srt)
-        logger.info(f"Output saved to {srt_path}")
+    # Streaming mode has already written its TXT and SRT output incrementally
+    output_formats = formats
+    outputs = []
+    if stream:
+        output_formats = [name for name in formats if name not in INCREMENTAL_WRITERS]
+        if save_output:
+            outputs = [
+                OUTPUT_DIR / f"{file_stem}.{name}"
+                for name in formats
+                if name in INCREMENTAL_WRITERS
+            ]
+    if save_output and output_formats:
+        report_stage("write")
+        with timer("write"):
+            for path in write_outputs(text, OUTPUT_DIR / file_stem, output_formats):
+                logger.info(f"Output saved to {path}")
+                outputs.append(path)
 
     if info:
         logger.info(
-            f"Detected language {info.language} with probability {info.language_probability}"
+            f"Detected language {transcription_info.language} with probability {transcription_info.language_probability}"
         )
-        return text
 
+    report = {
+        "file": source_name(file),
+        **timer.report(),
+        "outputs": [str(path) for path in outputs],
+    }
+    logger.info(
+        f"Processed {report['duration']:.1f} s of audio in {report['wall_seconds']:.1f} s (RTF {report['rtf']})"
+    )
+    if metrics:
+        OUTPUT_DIR.mkdir(exist_ok=True)
+        metrics_path = save_metrics(report, OUTPUT_DIR / file_stem, metrics)
+        logger.info(f"Metrics saved to {metrics_path}")
+    if profiler is not None:
+        logger.info(f"Profiles saved to {profiler.output_dir}")
+
+    if return_metrics:
+        return text, report
     return text
 
 
-def transcribe_multiple(files: list[str], **kwargs):
+def _init_batch_worker(cpu_threads: int):
+    """Initialize a batch worker process with its share of the CPU threads."""
+    from torch import set_num_threads
+
+    set_num_threads(cpu_threads)
+
+
+def _transcribe_batch_file(file: str, kwargs: dict):
+    """Transcribe one file inside a batch worker, reusing its warm models."""
+    return transcribe_core(file=file, **kwargs)
+
+
+def transcribe_multiple(
+    files: list[str],
+    workers: int | None = None,
+    resume: bool | None = None,
+    retries: int | None = None,
+    prefetch: int | None = None,
+    prefetch_max_mb: float | None = None,
+    schedule: str | None = None,
+    **kwargs,
+):
     """Transcribe and diarize multiple audio files.
 
+    When outputs are saved or the batch is resumed, every finished or failed
+    file is recorded in the batch manifest of OUTPUT_DIR, with its timings
+    and output paths, so that an interrupted batch can be resumed.
+
     Args:
         files: List of paths to audio files to transcribe
+        workers: Number of worker processes, each keeping its own warm models
+        resume: Skip files the manifest lists as done with the same
+            parameters, if their outputs still exist
+        retries: Number of times a failing file is retried
+        prefetch: Number of files decoded in the background ahead of the one
+            being transcribed, 0 to decode each file when it starts
+        prefetch_max_mb: Memory budget in MB of the prefetched audio
+        schedule: Transcribe files in "input" order, or the "longest" first
+            according to their probed metadata
         **kwargs: All arguments passed to transcribe_core for each file
 
     Returns:
-        dict: Dictionary mapping file paths to their transcription results
+        dict: Dictionary mapping file paths to their transcription results,
+            or to their manifest entry if they were skipped
 
     Raises:
         Exception: If all files fail to process
     """
+    workers = workers if workers is not None else transcribe_config.get("workers")
+    resume = resume if resume is not None else transcribe_config.get("resume")
+    retries = retries if retries is not None else transcribe_config.get("retries")
+    prefetch = prefetch if prefetch is not None else transcribe_config.get("prefetch")
+    prefetch_max_mb = (
+        prefetch_max_mb
+        if prefetch_max_mb is not None
+        else transcribe_config.get("prefetch_max_mb")
+    )
+    schedule = schedule if schedule is not None else transcribe_config.get("schedule")
+    return_metrics = kwargs.pop("return_metrics", False)
+    offset = kwargs.get("offset")
+    offset = offset if offset is not None else transcribe_config.get("offset")
+    trim = kwargs.get("trim")
+    trim = trim if trim is not None else transcribe_config.get("trim")
+    save_output = kwargs.get("save_output")
+    save_output = (
+        save_output if save_output is not None else transcribe_config.get("save_output")
+    )
+
     results = {}
     successful_files = 0
 
-    logger.info(f"Processing {len(files)} files...")
+    # Batches asked not to write any output leave no manifest behind either
+    manifest = None
+    if save_output or resume:
+        manifest = BatchManifest(OUTPUT_DIR / MANIFEST_NAME)
+    # Options given as None fall back to transcribe_config, as in transcribe_core
+    options = {name: value for name, value in kwargs.items() if value is not None}
+    params = params_hash({**transcribe_config, **options})
+    pending = []
+    for file in files:
+        entry = manifest.completed(file, params) if resume else None
+        if entry is not None:
+            results[file] = entry
+            successful_files += 1
+        else:
+            pending.append(file)
+    if resume:
+        logger.info(f"Resuming batch, skipping {successful_files} completed files")
 
-    for i, file in enumerate(files, 1):
-        logger.info(f"Processing file {i}/{len(files)}: {file}")
+    # Durations from the container metadata, for scheduling and the ETA
+    durations = {}
+    if len(pending) > 1:
+        infos = ProbeIndex(CACHE_DIR / PROBE_INDEX_NAME).probe(pending)
+        durations = {
+            file: window_duration(info, offset, trim) for file, info in infos.items()
+        }
+        if schedule == "longest":
+            # Long files first, so that short ones fill the gaps at the end
+            pending.sort(key=lambda file: durations[file] or -1.0, reverse=True)
+    total_audio = sum(duration or 0.0 for duration in durations.values())
+    processed_audio = 0.0
+    finished_files = 0
+    batch_start = monotonic()
 
-        try:
-            result = transcribe_core(file=file, **kwargs)
-            results[file] = result
-            successful_files += 1
-            logger.info(f"Successfully processed {file}")
+    logger.info(f"Processing {len(pending)} files...")
+    if total_audio:
+        logger.info(f"Batch holds {total_audio / 60:.1f} min of audio")
+    workers = max(1, min(workers, len(pending)))
+    attempts = dict.fromkeys(pending, 0)
 
-        except Exception as e:
-            logger.error(f"Failed to process {file}: {e}")
-            results[file] = {"error": str(e)}
+    def report_progress(file):
+        """Log the progress of the batch with its estimated time remaining."""
+        nonlocal processed_audio, finished_files
+        finished_files += 1
+        processed_audio += durations.get(file) or 0.0
+        if not processed_audio or not total_audio:
+            return
+        elapsed = monotonic() - batch_start
+        eta = elapsed / processed_audio * (total_audio - processed_audio)
+        logger.info(
+            f"Batch progress: {finished_files}/{len(pending)} files, "
+            f"{processed_audio / 60:.1f}/{total_audio / 60:.1f} min of audio, "
+            f"ETA {eta / 60:.1f} min"
+        )
+
+    def finish(file, outcome):
+        """Record the outcome of an attempt, and return whether to retry."""
+        nonlocal successful_files
+        if isinstance(outcome, Exception):
+            logger.error(f"Failed to process {file}: {outcome}")
+            if manifest is not None:
+                manifest.record(
+                    file, params, "failed", attempt=attempts[file], error=str(outcome)
+                )
+            results[file] = {"error": str(outcome)}
+            if attempts[file] <= retries:
+                logger.info(f"Retrying {file} ({attempts[file]}/{retries} retries)")
+                return True
+            report_progress(file)
+            return False
+
+        text, report = outcome
+        if manifest is not None:
+            manifest.record(
+                file,
+                params,
+                "done",
+                attempt=attempts[file],
+                seconds=report["wall_seconds"],
+                duration=report["duration"],
+                rtf=report["rtf"],
+                outputs=report["outputs"],
+            )
+        logger.info(f"Successfully processed {file}")
+        results[file] = (text, report) if return_metrics else text
+        successful_files += 1
+        report_progress(file)
+        return False
+
+    if workers == 1:
+        decoded = iter(())
+        if prefetch > 0 and len(pending) > 1:
+            # Decode the next files while the current one is transcribed
+            end = offset + trim if trim is not None else None
+            decoded = iter(
+                AudioPrefetcher(
+                    pending,
+                    partial(decode_audio, start=offset, end=end),
+                    depth=prefetch,
+                    max_mb=prefetch_max_mb,
+                )
+            )
+        for i, file in enumerate(pending, 1):
+            logger.info(f"Processing file {i}/{len(pending)}: {file}")
+            _, audio = next(decoded, (file, None))
+            retry = True
+            while retry:
+                attempts[file] += 1
+                try:
+                    if isinstance(audio, Exception):
+                        raise audio
+                    outcome = transcribe_core(
+                        file=file, audio=audio, return_metrics=True, **kwargs
+                    )
+                except Exception as e:
+                    outcome = e
+                    # Decode again when retrying a file that failed to decode
+                    audio = None if e is audio else audio
+                retry = finish(file, outcome)
+
+    elif pending:
+        # Partition the CPU threads so that workers do not oversubscribe cores
+        total_threads = kwargs.get("cpu_threads")
+        total_threads = (
+            total_threads
+            if total_threads is not None
+            else transcribe_config.get("cpu_threads")
+        )
+        total_threads = total_threads or os.cpu_count() or 1
+        worker_kwargs = {
+            **kwargs,
+            "cpu_threads": max(1, total_threads // workers),
+            "return_metrics": True,
+        }
+        logger.info(
+            f"Starting {workers} workers with {worker_kwargs['cpu_threads']} CPU threads each"
+        )
+
+        # Spawn rather than fork, forking a process with torch threads can deadlock
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_batch_worker,
+            initargs=(worker_kwargs["cpu_threads"],),
+        ) as executor:
+            futures = {}
+
+            def submit(file):
+                attempts[file] += 1
+                future = executor.submit(_transcribe_batch_file, file, worker_kwargs)
+                futures[future] = file
+
+            for file in pending:
+                submit(file)
+            # Failed files are resubmitted, so wait on the changing set of futures
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file = futures.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = e
+                    if finish(file, outcome):
+                        submit(file)
+
+    # Report results in input order
+    results = {file: results[file] for file in files}
 
     logger.info(f"Completed processing {successful_files}/{len(files)} files successfully")
 
@@ -385,12 +1254,17 @@ def transcribe(files: str | list[str], **kwargs):
     """Transcribe and diarize audio file(s).
 
     Args:
-        files: Path to audio file (str) or list of paths (list[str])
-        **kwargs: All arguments passed to transcribe_core
+        files: Path to audio file (str) or list of paths (list[str]), where
+            directories and glob patterns are expanded into their audio files
+        **kwargs: All arguments passed to transcribe_core, plus recursive and
+            extensions to expand directories and patterns, and workers,
+            resume, retries, prefetch, prefetch_max_mb and schedule for
+            multiple files
 
     Returns:
-        For single file: List of tuples containing (segment, speaker, text)
-        For multiple files: Dictionary mapping file paths to their results
+        For single file: Transcript, iterating as (segment, speaker, text) tuples
+        For multiple files, directories or patterns: Dictionary mapping file
+        paths to their results
 
     Raises:
         ModelInitializationError: If model initialization fails
@@ -398,9 +1272,28 @@ def transcribe(files: str | list[str], **kwargs):
         AudioConversionError: If audio conversion fails
         TypeError: If files is not str or list[str]
     """
-    if isinstance(files, str):
+    recursive = kwargs.pop("recursive", None)
+    recursive = (
+        recursive if recursive is not None else transcribe_config.get("recursive")
+    )
+    extensions = kwargs.pop("extensions", None) or transcribe_config.get("extensions")
+    if isinstance(files, str) and not is_file_pattern(files):
+        for name in (
+            "workers",
+            "resume",
+            "retries",
+            "prefetch",
+            "prefetch_max_mb",
+            "schedule",
+        ):
+            kwargs.pop(name, None)
         return transcribe_core(file=files, **kwargs)
-    elif isinstance(files, list):
+    elif isinstance(files, (str, list)):
+        if isinstance(files, str):
+            files = [files]
+        files = expand_inputs(files, recursive=recursive, extensions=extensions)
+        if not files:
+            raise FileNotFoundError("No audio files found to transcribe")
         return transcribe_multiple(files=files, **kwargs)
     else:
         raise TypeError(f"files must be str or list[str], got {type(files)}")
@@ -409,10 +1302,16 @@ def transcribe(files: str | list[str], **kwargs):
 @app.command(name="transcribe")
 @timing
 def transcribe_cli(
-    files: list[str] = Argument(..., help="Path(s) to the audio file(s)."),
+    files: list[str] = Argument(
+        ..., help="Path(s) to the audio file(s), directories or glob patterns."
+    ),
     trim: float | None = Option(
         transcribe_config.get("trim"),
-        help="Trim the audio file from 0 to the specified number of seconds.",
+        help="Trim the audio file from offset to offset + the specified number of seconds.",
+    ),
+    offset: float | None = Option(
+        transcribe_config.get("offset"),
+        help="Start transcribing the audio file at the specified number of seconds.",
     ),
     device: DeviceChoice | None = Option(
         transcribe_config.get("device"), help="Device to use."
@@ -463,11 +1362,104 @@ def transcribe_cli(
         help="pyannote.audio, maximum number of speakers.",
     ),
     save_output: bool | None = Option(
-        transcribe_config.get("save_output"), help="Save output to .txt and .srt files."
+        transcribe_config.get("save_output"),
+        help="Save output in the formats given by --formats.",
     ),
     info: bool | None = Option(
         transcribe_config.get("info"), help="Print detected language information."
     ),
+    model_cache_mb: float | None = Option(
+        transcribe_config.get("model_cache_mb"),
+        help="Memory budget in MB for warm models reused across files.",
+    ),
+    concurrent: bool | None = Option(
+        transcribe_config.get("concurrent"),
+        help="Run transcription and speaker diarization concurrently.",
+    ),
+    workers: int | None = Option(
+        transcribe_config.get("workers"),
+        help="Number of worker processes for multiple files.",
+    ),
+    resume: bool | None = Option(
+        transcribe_config.get("resume"),
+        help="Skip files the batch manifest lists as done with the same options.",
+    ),
+    retries: int | None = Option(
+        transcribe_config.get("retries"),
+        help="Number of times a failing file of a batch is retried.",
+    ),
+    recursive: bool | None = Option(
+        transcribe_config.get("recursive"),
+        help="Search directories and ** glob patterns recursively.",
+    ),
+    extensions: str | None = Option(
+        transcribe_config.get("extensions"),
+        help="Comma-separated extensions of the files taken from directories and patterns.",
+    ),
+    prefetch: int | None = Option(
+        transcribe_config.get("prefetch"),
+        help="Number of files decoded in the background ahead of the current one.",
+    ),
+    prefetch_max_mb: float | None = Option(
+        transcribe_config.get("prefetch_max_mb"),
+        help="Memory budget in MB of the prefetched audio.",
+    ),
+    schedule: ScheduleChoice | None = Option(
+        transcribe_config.get("schedule"),
+        help="Order of batch files: as given, or longest first by probed duration.",
+    ),
+    alignment: AlignmentChoice | None = Option(
+        transcribe_config.get("alignment"),
+        help="Assign speakers per segment, or per word splitting segments at speaker changes.",
+    ),
+    stream: bool | None = Option(
+        transcribe_config.get("stream"),
+        help="Write .txt and .srt lines as they are transcribed.",
+    ),
+    cache: bool | None = Option(
+        transcribe_config.get("cache"),
+        help="Reuse cached transcription and diarization results for identical audio.",
+    ),
+    cache_max_mb: float | None = Option(
+        transcribe_config.get("cache_max_mb"),
+        help="Size budget in MB of the on-disk result cache.",
+    ),
+    chunk_length: float | None = Option(
+        transcribe_config.get("chunk_length"),
+        help="Split long audio at silences into chunks of about this many seconds.",
+    ),
+    chunk_workers: int | None = Option(
+        transcribe_config.get("chunk_workers"),
+        help="Number of chunks transcribed in parallel.",
+    ),
+    batch_size: int | None = Option(
+        transcribe_config.get("batch_size"),
+        help="Faster Whisper, transcribe VAD segments in batches of this size.",
+    ),
+    metrics: MetricsChoice | None = Option(
+        transcribe_config.get("metrics"),
+        help="Save per-stage timing and memory metrics next to the output.",
+    ),
+    profile: bool | None = Option(
+        transcribe_config.get("profile"),
+        help="Write cProfile and torch profiler dumps of every stage to the output.",
+    ),
+    formats: str | None = Option(
+        transcribe_config.get("formats"),
+        help="Comma-separated output formats: txt, srt, csv, md, json.",
+    ),
+    max_sentence_duration: float | None = Option(
+        transcribe_config.get("max_sentence_duration"),
+        help="Split merged sentences longer than this many seconds.",
+    ),
+    max_sentence_gap: float | None = Option(
+        transcribe_config.get("max_sentence_gap"),
+        help="Split merged sentences at silences longer than this many seconds.",
+    ),
+    sentence_end: str | None = Option(
+        transcribe_config.get("sentence_end"),
+        help="Characters ending a sentence (default: .?! and CJK, Arabic, Devanagari forms).",
+    ),
     hf_token: str | None = Option(
         None, help="Hugging Face token for accessing gated models."
     ),
@@ -479,6 +1471,7 @@ def transcribe_cli(
     return transcribe(
         files=files_input,
         trim=trim,
+        offset=offset,
         device=device,
         cpu_threads=cpu_threads,
         whisper_model=whisper_model,
@@ -494,9 +1487,143 @@ def transcribe_cli(
         max_speakers=max_speakers,
         save_output=save_output,
         info=info,
+        model_cache_mb=model_cache_mb,
+        concurrent=concurrent,
+        workers=workers,
+        resume=resume,
+        retries=retries,
+        recursive=recursive,
+        extensions=extensions,
+        prefetch=prefetch,
+        prefetch_max_mb=prefetch_max_mb,
+        schedule=schedule,
+        alignment=alignment,
+        stream=stream,
+        cache=cache,
+        cache_max_mb=cache_max_mb,
+        chunk_length=chunk_length,
+        chunk_workers=chunk_workers,
+        batch_size=batch_size,
+        metrics=metrics,
+        profile=profile,
+        formats=formats,
+        max_sentence_duration=max_sentence_duration,
+        max_sentence_gap=max_sentence_gap,
+        sentence_end=sentence_end,
         hf_token=hf_token,
     )
 
 
+@app.command(name="bench")
+def bench_cli(
+    files: list[str] | None = Argument(
+        None, help="Path(s) to the audio file(s), defaults to the test files."
+    ),
+    synthetic_minutes: list[float] = Option(
+        [5.0], help="Duration in minutes of a synthetic long input, repeatable."
+    ),
+    whisper_model: WhisperModelChoice = Option(
+        WhisperModelChoice.tiny_en, help="Faster Whisper, model to use."
+    ),
+    compute_type: ComputeTypeChoice = Option(
+        ComputeTypeChoice.int8, help="Faster Whisper, compute type."
+    ),
+    cpu_threads: int | None = Option(
+        transcribe_config.get("cpu_threads"), help="Number of CPU threads to use."
+    ),
+    stub_diarization: bool = Option(
+        True, help="Replace pyannote.audio with an offline stub."
+    ),
+    batch_size: list[int] = Option(
+        [8], help="Batch size of the batched ASR timed next to the sequential one."
+    ),
+    output: Path = Option(
+        OUTPUT_DIR / "bench.json", help="Path of the JSON benchmark report."
+    ),
+):
+    """Benchmark every pipeline stage on CPU and report the results as JSON."""
+    # Imported here, the benchmark module depends on this one
+    from ghe_transcribe.bench import run_benchmarks
+
+    report = run_benchmarks(
+        files=files,
+        synthetic_minutes=synthetic_minutes,
+        output=output,
+        whisper_model=whisper_model.value,
+        compute_type=compute_type.value,
+        cpu_threads=cpu_threads,
+        diarization="stub" if stub_diarization else "pyannote",
+        batch_sizes=batch_size,
+    )
+    print(json.dumps(report, indent=2))
+    return report
+
+
+@app.command(name="tune")
+def tune_cli(
+    file: str | None = Argument(
+        None, help="Path to the reference audio file, defaults to a test file."
+    ),
+    seconds: float = Option(30.0, help="Seconds of the file transcribed per run."),
+    whisper_model: WhisperModelChoice = Option(
+        transcribe_config.get("whisper_model"), help="Faster Whisper, model to use."
+    ),
+    device: DeviceChoice = Option(
+        transcribe_config.get("device"), help="Device to tune for."
+    ),
+    chunk_length: float | None = Option(
+        transcribe_config.get("chunk_length"),
+        help="Also tune the chunk workers, and save this chunk length with them.",
+    ),
+    save: bool = Option(
+        True, help="Save the fastest settings as the profile of this machine."
+    ),
+):
+    """Time compute types, threads and chunk workers, and keep the fastest ones."""
+    # Imported here, the tuning module depends on this one
+    from ghe_transcribe.tune import run_tuning
+
+    report = run_tuning(
+        file=file,
+        seconds=seconds,
+        whisper_model=whisper_model.value,
+        device=device.value,
+        chunk_length=chunk_length,
+        save=save,
+    )
+    print(json.dumps(report, indent=2))
+    return report
+
+
+@app.command(name="serve")
+def serve_cli(
+    host: str = Option("127.0.0.1", help="Host name or address to listen on."),
+    port: int = Option(8765, help="TCP port to listen on."),
+    socket: str | None = Option(
+        None, help="Listen on this Unix socket instead of a TCP port."
+    ),
+    concurrency: int = Option(1, help="Number of jobs processed at the same time."),
+    max_queued: int = Option(
+        16, help="Maximum number of waiting jobs, further jobs are rejected."
+    ),
+    model_cache_mb: float | None = Option(
+        transcribe_config.get("model_cache_mb"),
+        help="Memory budget in MB for warm models shared by all jobs.",
+    ),
+):
+    """Serve transcription jobs over HTTP, keeping models loaded between jobs."""
+    # Imported here, the server module depends on this one
+    from ghe_transcribe.server import serve
+
+    registry.set_budget(model_cache_mb)
+    serve(
+        host=host,
+        port=port,
+        socket_path=socket,
+        concurrency=concurrency,
+        max_queued=max_queued,
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -23,3 +23,15 @@ class DiarizationError(TranscriptionError):
     """Raised when speaker diarization fails."""
 
     pass
+
+
+class QueueFullError(TranscriptionError):
+    """Raised when a job is submitted to a full job queue."""
+
+    pass
+
+
+class JobCancelledError(TranscriptionError):
+    """Raised inside a transcription job that has been cancelled."""
+
+    pass
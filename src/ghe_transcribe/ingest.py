@@ -0,0 +1,161 @@
+"""Discovery of input files and background decoding of batches."""
+
+import glob
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Extensions of the audio and video files picked from directories and globs
+AUDIO_EXTENSIONS = frozenset(
+    {
+        ".aac",
+        ".aif",
+        ".aiff",
+        ".flac",
+        ".m4a",
+        ".mkv",
+        ".mov",
+        ".mp3",
+        ".mp4",
+        ".oga",
+        ".ogg",
+        ".opus",
+        ".wav",
+        ".webm",
+        ".wma",
+    }
+)
+
+
+def parse_extensions(extensions) -> frozenset[str]:
+    """Parse file extensions given as a comma-separated string or a list.
+
+    Args:
+        extensions: Extensions with or without dot, like "mp3,.wav", or None
+            for AUDIO_EXTENSIONS
+
+    Returns:
+        Lowercase extensions starting with a dot
+    """
+    if extensions is None:
+        return AUDIO_EXTENSIONS
+    if isinstance(extensions, str):
+        extensions = extensions.split(",")
+    return frozenset(
+        "." + extension.strip().lower().lstrip(".")
+        for extension in extensions
+        if extension.strip()
+    )
+
+
+def is_file_pattern(path: str) -> bool:
+    """Whether an input names a directory or a glob pattern, not a single file."""
+    if Path(path).is_file():
+        return False
+    return Path(path).is_dir() or glob.has_magic(path)
+
+
+def expand_inputs(
+    inputs: list[str], recursive: bool = False, extensions=None
+) -> list[str]:
+    """Expand directories and glob patterns into the audio files they contain.
+
+    Files given explicitly are kept as they are, even if missing, so that
+    they fail with a per-file error. Matches of a directory or pattern are
+    sorted, and files named several times are kept once.
+
+    Args:
+        inputs: File paths, directories and glob patterns
+        recursive: Descend into subdirectories, and let ** match any depth
+        extensions: Extensions of the files picked from directories and
+            patterns, see parse_extensions
+
+    Returns:
+        File paths
+    """
+    extensions = parse_extensions(extensions)
+    files = {}
+    for item in inputs:
+        if not is_file_pattern(item):
+            files.setdefault(str(item), None)
+            continue
+        if Path(item).is_dir():
+            candidates = Path(item).glob("**/*" if recursive else "*")
+        else:
+            candidates = map(Path, glob.glob(item, recursive=recursive))
+        matches = sorted(
+            str(path)
+            for path in candidates
+            if path.suffix.lower() in extensions and path.is_file()
+        )
+        if not matches:
+            logger.warning(f"No audio files found in {item}")
+        for match in matches:
+            files.setdefault(match, None)
+    return list(files)
+
+
+class AudioPrefetcher:
+    """Decode the next files of a batch in background threads.
+
+    Iterating yields (file, audio) tuples in input order, where audio is the
+    decoded waveform, or the exception decoding raised. While a file is
+    consumed, up to depth following files are decoded. No further decode
+    starts while the decoded audio waiting in the buffer exceeds max_mb, so
+    the buffer grows beyond it by at most the decodes already running.
+
+    Args:
+        files: Paths of the files to decode
+        decode: Callable decoding one file into a waveform
+        depth: Number of files decoded ahead, at least 1
+        max_mb: Memory budget in MB of the decoded audio waiting to be
+            consumed, None for no limit
+    """
+
+    def __init__(self, files, decode, depth: int = 2, max_mb: float | None = None):
+        self.files = list(files)
+        self.decode = decode
+        self.depth = max(1, depth)
+        self.max_bytes = None if max_mb is None else max_mb * 1024**2
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(
+            max_workers=self.depth, thread_name_prefix="ghe_transcribe_prefetch"
+        )
+        pending = deque()
+        remaining = deque(self.files)
+
+        def fill():
+            # Always keep one file in flight so that iteration never stalls
+            while remaining and (
+                not pending or (len(pending) < self.depth and not self._full(pending))
+            ):
+                file = remaining.popleft()
+                pending.append((file, executor.submit(self.decode, file)))
+
+        try:
+            fill()
+            while pending:
+                file, future = pending.popleft()
+                try:
+                    audio = future.result()
+                except Exception as e:
+                    audio = e
+                fill()
+                yield file, audio
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _full(self, pending) -> bool:
+        """Whether the decoded audio waiting in pending exceeds the budget."""
+        if self.max_bytes is None:
+            return False
+        buffered = sum(
+            future.result().nbytes
+            for _, future in pending
+            if future.done() and future.exception() is None
+        )
+        return buffered >= self.max_bytes
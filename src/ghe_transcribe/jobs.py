@@ -0,0 +1,257 @@
+"""Background transcription jobs with a bounded queue, progress and cancellation."""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from queue import Full, Queue
+from time import time
+from typing import BinaryIO
+
+from ghe_transcribe.core import transcribe_core
+from ghe_transcribe.exceptions import JobCancelledError, QueueFullError
+from ghe_transcribe.registry import registry
+from ghe_transcribe.utils import source_name
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A transcription request and its state.
+
+    Args:
+        file: Path or binary file-like object of the audio file
+        options: Keyword arguments for transcribe_core
+    """
+
+    def __init__(self, file: str | BinaryIO, options: dict):
+        self.id = uuid.uuid4().hex
+        self.file = file
+        self.options = options
+        self.status = "queued"
+        self.stage = None
+        # Seconds of audio transcribed, the audio duration and segments so far
+        self.position = None
+        self.duration = None
+        self.segments = 0
+        self.result = None
+        self.metrics = None
+        self.error = None
+        self.created = time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def progress(self) -> float | None:
+        """Transcribed fraction of the audio, None before transcription starts."""
+        if self.position is None or not self.duration:
+            return None
+        return min(self.position / self.duration, 1.0)
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        """JSON-serializable view of the job."""
+        job = {
+            "id": self.id,
+            "file": source_name(self.file),
+            "options": {k: v for k, v in self.options.items() if k != "hf_token"},
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "segments": self.segments,
+            "error": self.error,
+            "metrics": self.metrics,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if include_result and self.result is not None:
+            job["result"] = [
+                {"start": seg.start, "end": seg.end, "speaker": spk, "text": sentence}
+                for seg, spk, sentence in self.result
+            ]
+        return job
+
+
+class JobQueue:
+    """Bounded job queue processed by a pool of worker threads.
+
+    Submitting to a full queue raises QueueFullError instead of blocking, so
+    that clients can back off. Cancelled jobs are dropped from the queue, or
+    stopped at the next stage or transcribed segment if they are running.
+
+    Args:
+        concurrency: Number of jobs processed at the same time
+        max_queued: Maximum number of jobs waiting to be processed
+        max_history: Number of finished jobs kept for status polling
+        on_update: Called with a job whenever its status or progress changes,
+            from the thread processing the job
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        max_queued: int = 16,
+        max_history: int = 1000,
+        on_update: Callable[[Job], None] | None = None,
+    ):
+        self.concurrency = concurrency
+        self.max_history = max_history
+        self.on_update = on_update
+        self._queue = Queue(maxsize=max_queued)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def start(self):
+        """Start the worker threads."""
+        for i in range(self.concurrency):
+            worker = threading.Thread(
+                target=self._work, name=f"ghe_transcribe-job-{i}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        """Let the workers finish their current job and exit."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def submit(self, file: str | BinaryIO, **options) -> Job:
+        """Queue a transcription job.
+
+        Args:
+            file: Path or binary file-like object of the audio file
+            **options: Keyword arguments for transcribe_core
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If the queue holds max_queued jobs already
+        """
+        job = Job(file, options)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except Full:
+                raise QueueFullError(
+                    f"Job queue is full ({self._queue.maxsize} jobs)"
+                ) from None
+            self._jobs[job.id] = job
+            self._prune()
+        logger.info(f"Queued job {job.id} for {source_name(file)}")
+        self._notify(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a job.
+
+        Args:
+            job_id: Identifier of the job
+
+        Returns:
+            The job, None if it does not exist
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return job
+            job.cancel_event.set()
+            if job.status == "queued":
+                # Workers skip cancelled jobs when taking them off the queue
+                job.status = "cancelled"
+                job.finished = time()
+        logger.info(f"Cancelled job {job_id}")
+        self._notify(job)
+        return job
+
+    def status(self) -> dict:
+        """Number of jobs per status and the models kept warm."""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "concurrency": self.concurrency,
+            "max_queued": self._queue.maxsize,
+            "jobs": counts,
+            "models": [str(key) for key in registry.keys()],
+        }
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_history."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def _notify(self, job: Job):
+        if self.on_update is None:
+            return
+        try:
+            self.on_update(job)
+        except Exception as e:
+            # A failing observer must not abort the job
+            logger.warning(f"Job update callback failed: {e}")
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            self._run(job)
+            with self._lock:
+                self._prune()
+
+    def _run(self, job: Job):
+        def progress(stage, position=None, duration=None):
+            if job.cancel_event.is_set():
+                raise JobCancelledError(f"Job {job.id} was cancelled")
+            job.stage = stage
+            if position is not None:
+                job.position = position
+                job.duration = duration
+                job.segments += 1
+            self._notify(job)
+
+        with self._lock:
+            # Jobs cancelled while queued are skipped
+            if job.cancel_event.is_set():
+                return
+            job.status = "running"
+            job.started = time()
+        logger.info(f"Running job {job.id}")
+        self._notify(job)
+        try:
+            job.result, job.metrics = transcribe_core(
+                file=job.file,
+                progress_callback=progress,
+                return_metrics=True,
+                **job.options,
+            )
+            job.status = "done"
+        except JobCancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        job.finished = time()
+        logger.info(f"Job {job.id} {job.status}")
+        self._notify(job)
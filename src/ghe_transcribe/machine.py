@@ -0,0 +1,84 @@
+"""Machine-local settings found by ``transcribe tune``."""
+
+import json
+import logging
+import os
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Settings of transcribe_config a tuned profile replaces
+TUNED_SETTINGS = ("compute_type", "cpu_threads", "chunk_length", "chunk_workers")
+
+
+def profile_path() -> Path:
+    """Path of the tuned profiles, GHE_TRANSCRIBE_TUNED_PROFILE if it is set."""
+    path = os.environ.get("GHE_TRANSCRIBE_TUNED_PROFILE")
+    if path:
+        return Path(path)
+    config_home = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(config_home) / "ghe_transcribe" / "tuned.json"
+
+
+def machine_id() -> str:
+    """Name of this machine in the profiles.
+
+    Profiles are stored per host and CPU count, so that nodes sharing a home
+    directory each load their own settings.
+    """
+    return f"{platform.node()}-{os.cpu_count()}cpu"
+
+
+def load_machine_profile(path: str | Path | None = None) -> dict:
+    """Tuned settings of this machine.
+
+    Args:
+        path: File of the profiles, None for profile_path()
+
+    Returns:
+        Dictionary of the settings in TUNED_SETTINGS, empty if this machine
+        was never tuned
+    """
+    path = Path(path) if path is not None else profile_path()
+    try:
+        profiles = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable tuned profile {path}: {e}")
+        return {}
+    settings = profiles.get(machine_id(), {}).get("settings", {})
+    return {name: settings[name] for name in TUNED_SETTINGS if name in settings}
+
+
+def save_machine_profile(
+    settings: dict, measurements: list, path: str | Path | None = None
+) -> Path:
+    """Store the tuned settings of this machine next to those of others.
+
+    Args:
+        settings: Values of the settings in TUNED_SETTINGS
+        measurements: Calibration results the settings were chosen from
+        path: File of the profiles, None for profile_path()
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path) if path is not None else profile_path()
+    profiles = {}
+    if path.exists():
+        try:
+            profiles = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Replacing unreadable tuned profile {path}: {e}")
+    profiles[machine_id()] = {
+        # datetime.UTC is only available from Python 3.11
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),  # noqa: UP017
+        "settings": settings,
+        "measurements": measurements,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(profiles, indent=2))
+    return path
@@ -0,0 +1,122 @@
+"""Persistent manifest of batch transcriptions, to resume interrupted runs."""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# File name of the manifest in the output directory
+MANIFEST_NAME = "batch_manifest.jsonl"
+
+# Arguments of transcribe_core the transcription outputs depend on, options
+# only changing how fast or where a batch runs are left out
+OUTPUT_PARAMS = frozenset(
+    {
+        "trim",
+        "offset",
+        "device",
+        "whisper_model",
+        "compute_type",
+        "beam_size",
+        "temperature",
+        "word_timestamps",
+        "vad_filter",
+        "min_silence_duration_ms",
+        "num_speakers",
+        "min_speakers",
+        "max_speakers",
+        "save_output",
+        "formats",
+        "max_sentence_duration",
+        "max_sentence_gap",
+        "sentence_end",
+        "alignment",
+        "chunk_length",
+        "batch_size",
+    }
+)
+
+
+def params_hash(params: dict) -> str:
+    """Hash the parameters a batch transcription output depends on.
+
+    Args:
+        params: Arguments of transcribe_core, without the file. Parameters
+            set to None are left out, like parameters not given.
+
+    Returns:
+        Hexadecimal digest, identical for runs producing the same outputs
+    """
+    relevant = {
+        name: params[name] for name in OUTPUT_PARAMS if params.get(name) is not None
+    }
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+class BatchManifest:
+    """Append-only JSONL log of the files of batch transcriptions.
+
+    Every line records one attempt at one file: "done" with its timings and
+    output paths, or "failed" with its error. The latest line of a file and
+    parameters hash is its current status. Lines are flushed as they are
+    written, so a crashed run leaves the status of every finished file on
+    disk and can be resumed by skipping them.
+
+    Args:
+        path: Path of the JSONL manifest
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        with self.path.open() as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries[(entry["file"], entry["params"])] = entry
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # A crash during a write can leave a truncated last line
+                    logger.warning(f"Ignoring malformed manifest line: {line!r}")
+
+    def record(self, file: str, params: str, status: str, **fields) -> dict:
+        """Append the outcome of an attempt at a file.
+
+        Args:
+            file: Path of the audio file
+            params: Parameters hash from params_hash
+            status: "done" or "failed"
+            **fields: JSON-serializable details, like attempt, seconds,
+                outputs or error
+
+        Returns:
+            The recorded entry
+        """
+        entry = {
+            "file": str(file),
+            "params": params,
+            "status": status,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            **fields,
+        }
+        self.entries[(entry["file"], params)] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        return entry
+
+    def completed(self, file: str, params: str) -> dict | None:
+        """Latest entry of a file if it is done and its outputs still exist."""
+        entry = self.entries.get((str(file), params))
+        if entry is None or entry["status"] != "done":
+            return None
+        if not all(Path(path).exists() for path in entry.get("outputs", [])):
+            return None
+        return entry
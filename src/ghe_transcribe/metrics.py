@@ -0,0 +1,187 @@
+"""Per-stage timing and resource metrics of the transcription pipeline."""
+
+import json
+import sys
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from time import perf_counter, process_time
+
+import psutil
+
+METRICS_PREFIX = "ghe_transcribe"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in megabytes."""
+    try:
+        import resource
+    except ImportError:
+        # Windows has no resource module but reports the peak working set
+        return psutil.Process().memory_info().peak_wset / 1024**2
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    """Record wall time, CPU time and memory of named pipeline stages.
+
+    CPU time is measured for the whole process, so stages running at the same
+    time, like ASR and diarization in concurrent mode, each include the CPU
+    time of the other. For the same reason the real-time factor is computed
+    from the wall time of the processing spans, not from the sum of stages.
+
+    Args:
+        duration: Duration of the processed audio in seconds
+        profiler: Context manager factory called with the stage name, such
+            as a StageProfiler, wrapping every stage outside of its timing
+    """
+
+    def __init__(self, duration: float | None = None, profiler=None):
+        self.duration = duration
+        self.profiler = profiler
+        self.stages = {}
+        self.processing_seconds = 0.0
+        self._start = perf_counter()
+
+    @contextmanager
+    def __call__(self, name: str, **info):
+        """Time a stage, with extra fields such as cache="hit".
+
+        The yielded dict can be updated inside the stage to add fields known
+        only once it ran. Fields set to None are left out.
+        """
+        with ExitStack() as stack:
+            if self.profiler is not None:
+                stack.enter_context(self.profiler(name))
+            wall_start = perf_counter()
+            cpu_start = process_time()
+            yield info
+            seconds = perf_counter() - wall_start
+            self.stages[name] = {
+                "seconds": round(seconds, 4),
+                "cpu_seconds": round(process_time() - cpu_start, 4),
+                "rss_mb": round(psutil.Process().memory_info().rss / 1024**2, 1),
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+                **{key: value for key, value in info.items() if value is not None},
+            }
+
+    @contextmanager
+    def processing(self):
+        """Count the wall time of a span towards the real-time factor.
+
+        Spans wrap the stages transforming the audio, like decoding and the
+        pipeline from ASR to alignment, and leave out model loading and
+        writing. They must not overlap each other.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.processing_seconds += perf_counter() - start
+
+    def report(self) -> dict:
+        """Stage timings with real-time factors relative to the audio duration."""
+        stages = {}
+        for name, stage in self.stages.items():
+            stages[name] = dict(stage)
+            if self.duration:
+                stages[name]["rtf"] = round(stage["seconds"] / self.duration, 4)
+        processing = self.processing_seconds
+        return {
+            "duration": self.duration,
+            "wall_seconds": round(perf_counter() - self._start, 4),
+            "processing_seconds": round(processing, 4),
+            "rtf": round(processing / self.duration, 4) if self.duration else None,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "stages": stages,
+        }
+
+
+def _label_value(value) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items())
+
+
+def to_prometheus(reports: dict[str, dict], label: str = "file") -> str:
+    """Render metrics reports in the Prometheus text exposition format.
+
+    Args:
+        reports: Reports from StageTimer.report, keyed by file name
+        label: Name of the label holding the keys of reports
+
+    Returns:
+        Metrics text with one gauge per file and stage
+    """
+    gauges = {
+        "audio_duration_seconds": ("Duration of the transcribed audio.", []),
+        "wall_seconds": ("Wall time of the whole transcription.", []),
+        "real_time_factor": ("Processing time divided by the audio duration.", []),
+        "peak_rss_bytes": ("Peak resident set size of the process.", []),
+        "stage_seconds": ("Wall time of a pipeline stage.", []),
+        "stage_cpu_seconds": ("Process CPU time during a pipeline stage.", []),
+        "stage_cache_hit": ("Whether a stage reused a cached model or result.", []),
+    }
+
+    for key, report in reports.items():
+        file_labels = _labels(**{label: key})
+        for name, field in (
+            ("audio_duration_seconds", "duration"),
+            ("wall_seconds", "wall_seconds"),
+            ("real_time_factor", "rtf"),
+        ):
+            if report.get(field) is not None:
+                gauges[name][1].append(f"{{{file_labels}}} {report[field]}")
+        gauges["peak_rss_bytes"][1].append(
+            f"{{{file_labels}}} {int(report['peak_rss_mb'] * 1024**2)}"
+        )
+        for stage, metrics in report["stages"].items():
+            stage_labels = _labels(**{label: key}, stage=stage)
+            gauges["stage_seconds"][1].append(
+                f"{{{stage_labels}}} {metrics['seconds']}"
+            )
+            gauges["stage_cpu_seconds"][1].append(
+                f"{{{stage_labels}}} {metrics['cpu_seconds']}"
+            )
+            for name, status in metrics.items():
+                # Result cache status is stored as "cache", models as "<model>_cache"
+                if name == "cache" or name.endswith("_cache"):
+                    cache = "result" if name == "cache" else name.removesuffix("_cache")
+                    cache_labels = _labels(**{label: key}, stage=stage, cache=cache)
+                    gauges["stage_cache_hit"][1].append(
+                        f"{{{cache_labels}}} {int(status == 'hit')}"
+                    )
+
+    lines = []
+    for name, (help_text, samples) in gauges.items():
+        metric = f"{METRICS_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(f"{metric}{sample}" for sample in samples)
+    return "\n".join(lines) + "\n"
+
+
+def save_metrics(report: dict, path: str | Path, format: str = "json") -> Path:
+    """Write a metrics report next to the transcription output.
+
+    Args:
+        report: Report from StageTimer.report
+        path: Output path without extension
+        format: "json" or "prometheus"
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    if format == "prometheus":
+        text = to_prometheus({report.get("file", path.name): report})
+        path = path.with_name(f"{path.name}.metrics.prom")
+    else:
+        text = json.dumps(report, indent=2)
+        path = path.with_name(f"{path.name}.metrics.json")
+    path.write_text(text)
+    return path
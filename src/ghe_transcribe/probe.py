@@ -0,0 +1,140 @@
+"""Audio metadata probing from container headers, without decoding."""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ghe_transcribe.utils import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# File name of the probe index in the cache directory
+PROBE_INDEX_NAME = "probe_index.json"
+
+# Number of files probed at the same time, probing mostly waits on file I/O
+PROBE_WORKERS = 8
+
+
+def probe_audio(file: str | Path) -> dict:
+    """Read the duration and format of an audio file from its metadata.
+
+    Only the container headers are read, no audio is decoded.
+
+    Args:
+        file: Path of the audio or video file
+
+    Returns:
+        Dictionary with duration in seconds (None if the container does not
+        store it), sample_rate, channels and codec of the first audio stream
+    """
+    import av
+
+    with av.open(str(file)) as container:
+        stream = container.streams.audio[0]
+        duration = None
+        if stream.duration is not None and stream.time_base is not None:
+            duration = float(stream.duration * stream.time_base)
+        elif container.duration is not None:
+            duration = container.duration / av.time_base
+        return {
+            "duration": duration,
+            "sample_rate": stream.sample_rate,
+            "channels": stream.channels,
+            "codec": stream.codec_context.name,
+        }
+
+
+class ProbeIndex:
+    """Metadata of probed files, cached on disk by path, mtime and size.
+
+    Files are probed again only when they changed since they were indexed,
+    so repeated batch runs over the same directories only stat their files.
+
+    Args:
+        path: JSON file holding the index
+    """
+
+    def __init__(self, path: str | Path = CACHE_DIR / PROBE_INDEX_NAME):
+        self.path = Path(path)
+        self.entries = {}
+        self._changed = False
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable probe index {self.path}: {e}")
+
+    def get(self, file: str | Path) -> dict | None:
+        """Metadata of a file, probed unless the index holds it unchanged.
+
+        Returns:
+            Dictionary from probe_audio, None if the file cannot be probed
+        """
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return None
+        key = str(Path(file).resolve())
+        entry = self.entries.get(key)
+        if (
+            entry is not None
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            return entry["info"]
+        try:
+            info = probe_audio(file)
+        except Exception as e:
+            logger.warning(f"Could not probe {file}: {e}")
+            return None
+        self.entries[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "info": info,
+        }
+        self._changed = True
+        return info
+
+    def probe(self, files: list[str]) -> dict[str, dict | None]:
+        """Probe several files concurrently and save the updated index.
+
+        Args:
+            files: Paths of the files
+
+        Returns:
+            Dictionary mapping every file to its metadata, or None
+        """
+        with ThreadPoolExecutor(
+            max_workers=PROBE_WORKERS, thread_name_prefix="ghe_transcribe_probe"
+        ) as executor:
+            infos = dict(zip(files, executor.map(self.get, files)))
+        if self._changed:
+            self.save()
+        return infos
+
+    def save(self):
+        """Write the index, replacing the previous one atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.entries))
+        os.replace(tmp_path, self.path)
+        self._changed = False
+
+
+def window_duration(info: dict | None, offset: float = 0.0, trim: float | None = None):
+    """Duration in seconds of the window of a file that is transcribed.
+
+    Args:
+        info: Metadata from probe_audio, or None
+        offset: Start of the window in seconds
+        trim: Length of the window in seconds, None for the rest of the file
+
+    Returns:
+        Duration in seconds, None if unknown
+    """
+    if info is None or info["duration"] is None:
+        return None
+    duration = max(info["duration"] - (offset or 0.0), 0.0)
+    return min(duration, trim) if trim is not None else duration
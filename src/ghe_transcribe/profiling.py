@@ -0,0 +1,89 @@
+"""Per-stage profiling of the transcription pipeline."""
+
+import cProfile
+import io
+import logging
+import pstats
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Stages running PyTorch models, also recorded with the torch profiler
+TORCH_STAGES = ("diarization",)
+
+# Number of functions listed in the text summaries
+SUMMARY_ROWS = 40
+
+
+class StageProfiler:
+    """Profile pipeline stages with cProfile and dump one file per stage.
+
+    Every stage writes <stage>.pstats, for snakeviz or ``python -m pstats``,
+    and <stage>.txt with the functions of highest cumulative time. Stages in
+    torch_stages are also recorded with the torch profiler, written as a
+    Chrome trace (<stage>.torch.json) that speedscope and Perfetto open, and
+    a table of the most expensive operators (<stage>.torch.txt).
+
+    cProfile only sees the thread running the stage. Native code, like the
+    CTranslate2 decoder, shows up as the Python call that entered it.
+
+    Args:
+        output_dir: Directory receiving the profile dumps
+        torch_stages: Names of the stages recorded with the torch profiler
+    """
+
+    def __init__(self, output_dir: str | Path, torch_stages=TORCH_STAGES):
+        self.output_dir = Path(output_dir)
+        self.torch_stages = torch_stages
+        self.paths = []
+
+    @contextmanager
+    def __call__(self, name: str):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Python 3.12+ allows a single active profiler across threads
+            logger.warning(f"Not profiling stage {name}: {e}")
+            profile = None
+
+        try:
+            with ExitStack() as stack:
+                if name in self.torch_stages:
+                    stack.enter_context(self._torch_profile(name))
+                yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._dump_stats(name, profile)
+
+    def _dump_stats(self, name: str, profile: cProfile.Profile):
+        """Write the cProfile statistics of a stage with a text summary."""
+        path = self.output_dir / f"{name}.pstats"
+        profile.dump_stats(path)
+        summary = io.StringIO()
+        stats = pstats.Stats(profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_ROWS)
+        (self.output_dir / f"{name}.txt").write_text(summary.getvalue())
+        self.paths.append(path)
+
+    @contextmanager
+    def _torch_profile(self, name: str):
+        """Record a stage with the torch profiler, on CUDA too if available."""
+        from torch.cuda import is_available as cuda_is_available
+        from torch.profiler import ProfilerActivity, profile
+
+        activities = [ProfilerActivity.CPU]
+        if cuda_is_available():
+            activities.append(ProfilerActivity.CUDA)
+        with profile(activities=activities, record_shapes=True) as torch_profile:
+            yield
+        path = self.output_dir / f"{name}.torch.json"
+        torch_profile.export_chrome_trace(str(path))
+        table = torch_profile.key_averages().table(
+            sort_by="self_cpu_time_total", row_limit=SUMMARY_ROWS
+        )
+        (self.output_dir / f"{name}.torch.txt").write_text(table)
+        self.paths.append(path)
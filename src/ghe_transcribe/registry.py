@@ -0,0 +1,144 @@
+"""Process-wide registry of warm Whisper models and diarization pipelines."""
+
+import gc
+import logging
+import threading
+from collections import OrderedDict
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_mb() -> float:
+    """Resident set size of the current process in megabytes."""
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+class ModelRegistry:
+    """Least-recently-used cache of loaded models bounded by a memory budget.
+
+    The memory footprint of each entry is estimated from the growth of the
+    process resident set size while its loader runs. Accelerator memory is not
+    accounted for, so the budget is approximate on CUDA devices.
+
+    Args:
+        max_memory_mb: Memory budget in megabytes, None for no limit
+    """
+
+    def __init__(self, max_memory_mb: float | None = None):
+        self.max_memory_mb = max_memory_mb
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def keys(self) -> list:
+        """Cached keys, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def memory_mb(self) -> float:
+        """Estimated memory held by cached models in megabytes."""
+        with self._lock:
+            return sum(size_mb for _, size_mb in self._entries.values())
+
+    def get(self, key, loader):
+        """Return the cached model for key, loading it with loader on a miss.
+
+        Args:
+            key: Hashable identifier of the model configuration
+            loader: Callable without arguments returning the model
+
+        Returns:
+            The cached or freshly loaded model
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                logger.info(f"Model cache hit: {key}")
+                return self._entries[key][0]
+
+            logger.info(f"Model cache miss, loading: {key}")
+            rss_before = _rss_mb()
+            model = loader()
+            size_mb = max(_rss_mb() - rss_before, 0.0)
+            self._entries[key] = (model, size_mb)
+            self._evict()
+            return model
+
+    def set_budget(self, max_memory_mb: float | None):
+        """Change the memory budget, evicting models beyond it right away.
+
+        Args:
+            max_memory_mb: Memory budget in megabytes, None for no limit
+        """
+        with self._lock:
+            self.max_memory_mb = max_memory_mb
+            self._evict()
+
+    def unload(self, key) -> bool:
+        """Drop a single model from the registry.
+
+        Args:
+            key: Identifier of the model to drop
+
+        Returns:
+            True if the model was cached, False otherwise
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        del entry
+        gc.collect()
+        logger.info(f"Unloaded model: {key}")
+        return True
+
+    def clear(self):
+        """Drop every model from the registry."""
+        with self._lock:
+            self._entries.clear()
+        gc.collect()
+        logger.info("Cleared model registry")
+
+    def _evict(self):
+        """Evict least recently used models until the budget is respected.
+
+        The most recently used model is always kept, even if it alone exceeds
+        the budget.
+        """
+        if self.max_memory_mb is None:
+            return
+        evicted = False
+        while len(self._entries) > 1 and self.memory_mb > self.max_memory_mb:
+            key, _ = self._entries.popitem(last=False)
+            logger.info(f"Evicted model to respect memory budget: {key}")
+            evicted = True
+        if evicted:
+            gc.collect()
+
+
+registry = ModelRegistry()
+
+
+def set_budget(max_memory_mb: float | None):
+    """Change the memory budget of the process-wide registry."""
+    registry.set_budget(max_memory_mb)
+
+
+def unload(key) -> bool:
+    """Drop a single model from the process-wide registry."""
+    return registry.unload(key)
+
+
+def clear():
+    """Drop every model from the process-wide registry."""
+    registry.clear()
@@ -0,0 +1,235 @@
+"""Local transcription server keeping models warm between jobs.
+
+Jobs are submitted over HTTP, on a TCP port or a Unix socket, and processed
+by a fixed number of worker threads sharing the model registry, so that only
+the first job pays for loading the models.
+
+API:
+    POST /jobs          Submit {"file": path, **options}, returns the job
+    GET /jobs           List all jobs
+    GET /jobs/<id>      Job status, with the result once done
+    DELETE /jobs/<id>   Cancel a queued or running job
+    GET /health         Queue and model status
+    GET /metrics        Per-stage metrics of finished jobs, Prometheus text
+"""
+
+import inspect
+import json
+import logging
+import os
+import socketserver
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ghe_transcribe.core import transcribe_core
+from ghe_transcribe.exceptions import QueueFullError
+from ghe_transcribe.jobs import JobQueue
+from ghe_transcribe.metrics import to_prometheus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# transcribe_core options a job may set, the others are set by the job queue
+# or, like the model memory budget shared by all jobs, by the server
+JOB_OPTIONS = set(inspect.signature(transcribe_core).parameters) - {
+    "file",
+    "audio",
+    "progress_callback",
+    "return_metrics",
+    "model_cache_mb",
+}
+
+# Seconds clients are asked to wait before resubmitting to a full queue
+RETRY_AFTER = 5
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON API of the job queue attached to the server."""
+
+    server_version = "ghe_transcribe"
+
+    @property
+    def job_queue(self) -> JobQueue:
+        return self.server.job_queue
+
+    def do_GET(self):
+        parts = self._path_parts()
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {"status": "ok", **self.job_queue.status()})
+        elif parts == ["metrics"]:
+            reports = {
+                job.id: job.metrics
+                for job in self.job_queue.jobs()
+                if job.metrics is not None
+            }
+            self._send_text(HTTPStatus.OK, to_prometheus(reports, label="job"))
+        elif parts == ["jobs"]:
+            jobs = [job.to_dict(include_result=False) for job in self.job_queue.jobs()]
+            self._send_json(HTTPStatus.OK, {"jobs": jobs})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.job_queue.get(parts[1])
+            if job is None:
+                self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job {parts[1]}")
+            else:
+                self._send_json(HTTPStatus.OK, job.to_dict())
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+    def do_POST(self):
+        if self._path_parts() != ["jobs"]:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+            return
+        if not isinstance(request, dict):
+            self._send_error(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+            return
+
+        file = request.pop("file", None)
+        unknown = set(request) - JOB_OPTIONS
+        if not isinstance(file, str) or not os.path.isfile(file):
+            self._send_error(HTTPStatus.BAD_REQUEST, f"File not found: {file}")
+        elif unknown:
+            self._send_error(
+                HTTPStatus.BAD_REQUEST, f"Unknown options: {', '.join(sorted(unknown))}"
+            )
+        else:
+            try:
+                job = self.job_queue.submit(file, **request)
+            except QueueFullError as e:
+                self._send_error(
+                    HTTPStatus.SERVICE_UNAVAILABLE,
+                    str(e),
+                    headers={"Retry-After": str(RETRY_AFTER)},
+                )
+                return
+            self._send_json(
+                HTTPStatus.ACCEPTED,
+                job.to_dict(),
+                headers={"Location": f"/jobs/{job.id}"},
+            )
+
+    def do_DELETE(self):
+        parts = self._path_parts()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+            return
+        job = self.job_queue.cancel(parts[1])
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job {parts[1]}")
+        else:
+            self._send_json(HTTPStatus.OK, job.to_dict(include_result=False))
+
+    def address_string(self) -> str:
+        # Unix socket clients have no host address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "unix"
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def _path_parts(self) -> list[str]:
+        return [part for part in self.path.split("?")[0].split("/") if part]
+
+    def _send_json(
+        self, status: HTTPStatus, payload: dict, headers: dict | None = None
+    ):
+        self._send_body(status, json.dumps(payload), "application/json", headers)
+
+    def _send_text(self, status: HTTPStatus, text: str):
+        # Content type of the Prometheus text exposition format
+        self._send_body(status, text, "text/plain; version=0.0.4")
+
+    def _send_body(
+        self,
+        status: HTTPStatus,
+        text: str,
+        content_type: str,
+        headers: dict | None = None,
+    ):
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(
+        self, status: HTTPStatus, message: str, headers: dict | None = None
+    ):
+        self._send_json(status, {"error": message}, headers=headers)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+
+def make_server(
+    job_queue: JobQueue,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: str | None = None,
+):
+    """Create an HTTP server for a job queue.
+
+    Args:
+        job_queue: Queue receiving the submitted jobs
+        host: Host name or address to listen on
+        port: TCP port to listen on, 0 for any free port
+        socket_path: Listen on this Unix socket instead of a TCP port
+
+    Returns:
+        Server instance, not yet serving
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, JobRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.job_queue = job_queue
+    return server
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: str | None = None,
+    concurrency: int = 1,
+    max_queued: int = 16,
+):
+    """Run the transcription server until interrupted.
+
+    Args:
+        host: Host name or address to listen on
+        port: TCP port to listen on
+        socket_path: Listen on this Unix socket instead of a TCP port
+        concurrency: Number of jobs processed at the same time
+        max_queued: Maximum number of jobs waiting to be processed
+    """
+    job_queue = JobQueue(concurrency=concurrency, max_queued=max_queued)
+    server = make_server(job_queue, host=host, port=port, socket_path=socket_path)
+    job_queue.start()
+    address = socket_path if socket_path is not None else f"http://{host}:{port}"
+    logger.info(f"Serving transcription jobs on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        job_queue.stop()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
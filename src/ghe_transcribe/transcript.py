@@ -0,0 +1,446 @@
+"""Columnar transcription results."""
+
+import numpy as np
+
+# Sentence-ending punctuation closing a merged sentence: Latin, CJK full
+# width, Arabic question mark and Devanagari danda
+SENTENCE_END = frozenset(".?!。？！؟।")
+
+
+def short_speaker_label(spk):
+    """Shorten a SPEAKER_XX label to SXX, leaving other labels unchanged."""
+    if isinstance(spk, str) and spk.startswith("SPEAKER_"):
+        return "S" + spk.split("_")[1]
+    return spk
+
+
+class SentenceMerger:
+    """Merge (segment, speaker, text) rows into sentences in a single pass.
+
+    A sentence ends at a row ending with sentence punctuation, or before a
+    speaker change, a gap longer than max_gap or a row that would make it
+    longer than max_duration. The first row after a speaker change never
+    ends a sentence, and a row without speaker is not followed by a speaker
+    change. Rows are consumed one at a time, so sentences are complete as
+    soon as the row closing them arrives.
+
+    Args:
+        max_duration: Longest sentence in seconds, unless a single row is
+            longer, None for no limit
+        max_gap: Longest silence in seconds between rows of a sentence, None
+            for no limit
+        punctuation: Characters ending a sentence
+    """
+
+    def __init__(
+        self,
+        max_duration: float | None = None,
+        max_gap: float | None = None,
+        punctuation=SENTENCE_END,
+    ):
+        self.max_duration = max_duration
+        self.max_gap = max_gap
+        self.punctuation = frozenset(punctuation)
+        self._labels = {}
+        self._parts = []
+        self._label = None
+        self._speaker = None
+        self._start = None
+        self._end = None
+
+    def push(self, seg, spk, text) -> list:
+        """Add one row and return the sentences it completes."""
+        done = []
+        if self._parts:
+            if spk != self._speaker and self._speaker is not None:
+                # The first row after a speaker change never ends a sentence
+                done.append(self._pop())
+                self._append(seg, spk, text)
+                return done
+            if (self.max_gap is not None and seg.start - self._end > self.max_gap) or (
+                self.max_duration is not None
+                and seg.end - self._start > self.max_duration
+            ):
+                done.append(self._pop())
+        self._append(seg, spk, text)
+        if text and text[-1] in self.punctuation:
+            done.append(self._pop())
+        return done
+
+    def flush(self) -> list:
+        """Return the last, unfinished sentence if there is one."""
+        return [self._pop()] if self._parts else []
+
+    def _append(self, seg, spk, text):
+        if not self._parts:
+            self._start = seg.start
+            self._label = spk
+        self._parts.append(text)
+        self._speaker = spk
+        self._end = seg.end
+
+    def _pop(self):
+        from pyannote.core import Segment
+
+        label = self._label
+        if label not in self._labels:
+            self._labels[label] = short_speaker_label(label)
+        sentence = (
+            Segment(self._start, self._end),
+            self._labels[label],
+            "".join(self._parts),
+        )
+        self._parts.clear()
+        return sentence
+
+
+class StringTable:
+    """Strings stored back to back in one str with an offset array.
+
+    Consecutive strings are concatenated without copying by dropping the
+    offsets between them, see join.
+
+    Args:
+        data: Concatenated strings
+        offsets: Start of every string in data, followed by its end
+    """
+
+    def __init__(self, data: str = "", offsets=None):
+        self.data = data
+        if offsets is None:
+            offsets = [0]
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_strings(cls, strings) -> "StringTable":
+        strings = list(strings)
+        offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        np.cumsum([len(string) for string in strings], out=offsets[1:])
+        return cls("".join(strings), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StringTable index out of range")
+        return self.data[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self):
+        data = self.data
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end]
+
+    def join(self, bounds) -> "StringTable":
+        """Concatenate runs of consecutive strings.
+
+        Args:
+            bounds: Index of the first string of every run, followed by the
+                end of the last run
+
+        Returns:
+            StringTable with one string per run, sharing the same data
+        """
+        return StringTable(self.data, self.offsets[np.asarray(bounds, dtype=np.int64)])
+
+    def take(self, indices) -> "StringTable":
+        """Copy the strings at the given indices into a new table."""
+        return StringTable.from_strings(self[int(index)] for index in indices)
+
+    def __reduce__(self):
+        # Pickle only the part of the shared data the table refers to
+        start, end = int(self.offsets[0]), int(self.offsets[-1])
+        return StringTable, (self.data[start:end], self.offsets - start)
+
+
+class Words:
+    """Columns of word timestamps from faster-whisper.
+
+    Args:
+        starts: Start times in seconds
+        ends: End times in seconds
+        texts: Word texts, with their leading space
+        probabilities: Word probabilities, NaN where unknown
+    """
+
+    def __init__(self, starts, ends, texts: StringTable, probabilities):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.texts = texts
+        self.probabilities = np.asarray(probabilities, dtype=np.float32)
+
+    @classmethod
+    def from_words(cls, words) -> "Words":
+        """Build the columns from faster-whisper Word objects."""
+        words = list(words)
+        return cls(
+            [word.start for word in words],
+            [word.end for word in words],
+            StringTable.from_strings(word.word for word in words),
+            [getattr(word, "probability", np.nan) for word in words],
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def take(self, indices) -> "Words":
+        indices = np.asarray(indices, dtype=np.int64)
+        return Words(
+            self.starts[indices],
+            self.ends[indices],
+            self.texts.take(indices),
+            self.probabilities[indices],
+        )
+
+
+class Transcript:
+    """Transcription result stored as columns instead of tuples.
+
+    Timestamps and speaker ids are NumPy arrays and texts share a single
+    StringTable, so long transcripts do not hold several Python objects per
+    row. Iterating, indexing and len() behave like the list of
+    (segment, speaker, text) tuples returned before, so existing callers keep
+    working, while writers and analytics can use the arrays directly.
+
+    Args:
+        starts: Start times in seconds
+        ends: End times in seconds
+        speaker_ids: Index of every row's speaker in speakers, -1 for none
+        speakers: Speaker labels
+        texts: Text of every row
+        words: Words of all rows in order, None without word timestamps
+        word_offsets: Index of the first word of every row, followed by the
+            number of words
+    """
+
+    __hash__ = None
+
+    def __init__(
+        self,
+        starts,
+        ends,
+        speaker_ids,
+        speakers: list,
+        texts: StringTable,
+        words: Words | None = None,
+        word_offsets=None,
+    ):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.speaker_ids = np.asarray(speaker_ids, dtype=np.int32)
+        self.speakers = list(speakers)
+        self.texts = texts
+        self.words = words
+        self.word_offsets = (
+            None if word_offsets is None else np.asarray(word_offsets, dtype=np.int64)
+        )
+
+    @classmethod
+    def from_tuples(cls, rows) -> "Transcript":
+        """Build a transcript from (segment, speaker, text) tuples."""
+        starts = []
+        ends = []
+        speaker_ids = []
+        speakers = {}
+        texts = []
+        for seg, spk, text in rows:
+            starts.append(seg.start)
+            ends.append(seg.end)
+            speaker_ids.append(
+                -1 if spk is None else speakers.setdefault(spk, len(speakers))
+            )
+            texts.append(text)
+        return cls(
+            starts, ends, speaker_ids, list(speakers), StringTable.from_strings(texts)
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        from pyannote.core import Segment
+
+        labels = self.speakers + [None]
+        for start, end, speaker_id, text in zip(
+            self.starts.tolist(),
+            self.ends.tolist(),
+            self.speaker_ids.tolist(),
+            self.texts,
+        ):
+            yield Segment(start, end), labels[speaker_id], text
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        from pyannote.core import Segment
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Transcript index out of range")
+        return (
+            Segment(float(self.starts[index]), float(self.ends[index])),
+            (self.speakers + [None])[self.speaker_ids[index]],
+            self.texts[index],
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Transcript, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            (seg.start, seg.end, spk, text) == (o_seg.start, o_seg.end, o_spk, o_text)
+            for (seg, spk, text), (o_seg, o_spk, o_text) in zip(self, other)
+        )
+
+    def __repr__(self) -> str:
+        return f"Transcript({len(self)} rows, {len(self.speakers)} speakers)"
+
+    @property
+    def speaker_labels(self) -> list:
+        """Speaker label of every row, None where no speaker was found."""
+        labels = np.array(self.speakers + [None], dtype=object)
+        return labels[self.speaker_ids].tolist()
+
+    def words_of(self, index: int) -> list[tuple[float, float, str]]:
+        """(start, end, word) of the words of one row."""
+        if self.words is None:
+            return []
+        first, last = self.word_offsets[index], self.word_offsets[index + 1]
+        return [
+            (
+                float(self.words.starts[i]),
+                float(self.words.ends[i]),
+                self.words.texts[i],
+            )
+            for i in range(first, last)
+        ]
+
+    def take(self, indices) -> "Transcript":
+        """Copy the rows at the given indices into a new transcript."""
+        indices = np.asarray(indices, dtype=np.int64)
+        words = None
+        word_offsets = None
+        if self.words is not None:
+            firsts = self.word_offsets[indices]
+            counts = self.word_offsets[indices + 1] - firsts
+            word_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+            np.cumsum(counts, out=word_offsets[1:])
+            word_indices = np.repeat(firsts - word_offsets[:-1], counts) + np.arange(
+                word_offsets[-1]
+            )
+            words = self.words.take(word_indices)
+        return Transcript(
+            self.starts[indices],
+            self.ends[indices],
+            self.speaker_ids[indices],
+            self.speakers,
+            self.texts.take(indices),
+            words,
+            word_offsets,
+        )
+
+    def shift(self, offset: float) -> "Transcript":
+        """Copy of the transcript with every timestamp moved by offset seconds."""
+        words = self.words
+        if words is not None:
+            words = Words(
+                words.starts + offset,
+                words.ends + offset,
+                words.texts,
+                words.probabilities,
+            )
+        return Transcript(
+            self.starts + offset,
+            self.ends + offset,
+            self.speaker_ids,
+            self.speakers,
+            self.texts,
+            words,
+            self.word_offsets,
+        )
+
+    def merge_sentences(
+        self,
+        max_duration: float | None = None,
+        max_gap: float | None = None,
+        punctuation=SENTENCE_END,
+    ) -> "Transcript":
+        """Merge rows into sentences, like SentenceMerger on tuples.
+
+        Sentence boundaries from punctuation, speaker changes and gaps are
+        found with array operations. Only a max_duration needs a pass over
+        the rows, splitting sentences that grew too long. SPEAKER_XX labels
+        are shortened to SXX.
+
+        Args:
+            max_duration: Longest sentence in seconds, None for no limit
+            max_gap: Longest silence in seconds within a sentence, None for
+                no limit
+            punctuation: Characters ending a sentence
+
+        Returns:
+            Transcript with one row per sentence
+        """
+        count = len(self)
+        speakers = [short_speaker_label(spk) for spk in self.speakers]
+        if count == 0:
+            return Transcript([], [], [], speakers, StringTable())
+
+        punctuation = frozenset(punctuation)
+        ends_sentence = np.fromiter(
+            (text[-1:] in punctuation for text in self.texts), dtype=bool, count=count
+        )
+        # Rows without a speaker never start a new sentence for the next row
+        change = np.zeros(count, dtype=bool)
+        change[1:] = (self.speaker_ids[1:] != self.speaker_ids[:-1]) & (
+            self.speaker_ids[:-1] >= 0
+        )
+
+        # A row closes its sentence if it ends with punctuation, except the
+        # first row after a speaker change, which closes only if the previous
+        # row did. Rows of that kind copy the previous decision.
+        decided = ~(change & ends_sentence)
+        positions = np.maximum.accumulate(np.where(decided, np.arange(count), 0))
+        closes = (ends_sentence & ~change)[positions]
+
+        is_first = change.copy()
+        is_first[0] = True
+        is_first[1:] |= closes[:-1]
+        if max_gap is not None:
+            # Gaps start a sentence without changing where later ones close
+            is_first[1:] |= self.starts[1:] - self.ends[:-1] > max_gap
+        if max_duration is not None:
+            is_first = self._split_long_sentences(is_first, max_duration)
+        firsts = np.flatnonzero(is_first)
+        lasts = np.append(firsts[1:] - 1, count - 1)
+        bounds = np.append(firsts, count)
+
+        words = self.words
+        word_offsets = None
+        if words is not None:
+            word_offsets = self.word_offsets[bounds]
+        return Transcript(
+            self.starts[firsts],
+            self.ends[lasts],
+            self.speaker_ids[firsts],
+            speakers,
+            self.texts.join(bounds),
+            words,
+            word_offsets,
+        )
+
+    def _split_long_sentences(self, is_first, max_duration: float):
+        """Start a new sentence at rows ending past max_duration of its start."""
+        flags = is_first.tolist()
+        starts = self.starts.tolist()
+        sentence_start = starts[0]
+        for i, end in enumerate(self.ends.tolist()):
+            if flags[i]:
+                sentence_start = starts[i]
+            elif end - sentence_start > max_duration:
+                flags[i] = True
+                sentence_start = starts[i]
+        return np.array(flags, dtype=bool)
@@ -0,0 +1,220 @@
+"""Calibration of the Whisper settings for the machine it runs on.
+
+Short transcriptions of a reference clip are timed across compute types,
+thread counts and, for chunked transcription, chunk worker counts, and the
+fastest combination is saved as the machine-local profile that
+transcribe_config loads on start. The search tunes one setting at a time,
+keeping the best value of the previous ones, so that it needs a handful of
+runs instead of every combination.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+import psutil
+
+from ghe_transcribe.core import (
+    ComputeTypeChoice,
+    load_whisper_model,
+    run_asr,
+    transcribe_config,
+)
+from ghe_transcribe.machine import machine_id, save_machine_profile
+from ghe_transcribe.registry import registry
+from ghe_transcribe.utils import MEDIA_DIR, SAMPLE_RATE, decode_audio
+
+logger = logging.getLogger(__name__)
+
+TUNE_FILE = MEDIA_DIR / "test01.mp3"
+
+# Settings searched, in order, each timing run is keyed by their values
+SEARCHED_SETTINGS = ("compute_type", "cpu_threads", "chunk_workers")
+
+
+def resolve_device(device: str = "auto") -> str:
+    """Device Whisper runs on, CTranslate2 has no MPS backend."""
+    if device == "auto":
+        from torch.cuda import is_available as cuda_is_available
+
+        device = "cuda" if cuda_is_available() else "cpu"
+    return "cpu" if device == "mps" else device
+
+
+def candidate_settings(device: str) -> dict[str, list]:
+    """Values of every tuned setting worth trying on a device.
+
+    Returns:
+        Dictionary with lists of compute_type, cpu_threads and chunk_workers
+    """
+    import ctranslate2
+
+    supported = ctranslate2.get_supported_compute_types(device)
+    compute_types = [choice.value for choice in ComputeTypeChoice]
+    compute_types = [value for value in compute_types if value in supported]
+    if device != "cpu":
+        return {
+            "compute_type": compute_types,
+            "cpu_threads": [None],
+            "chunk_workers": [1],
+        }
+
+    logical = os.cpu_count() or 1
+    physical = psutil.cpu_count(logical=False) or logical
+    cpu_threads = sorted({max(1, logical // 2), physical, logical})
+    chunk_workers = [count for count in (1, 2, 4) if count == 1 or logical >= 4 * count]
+    return {
+        "compute_type": compute_types,
+        "cpu_threads": cpu_threads,
+        "chunk_workers": chunk_workers,
+    }
+
+
+def time_asr(
+    audio,
+    whisper_model: str,
+    device: str,
+    compute_type: str,
+    cpu_threads: int | None,
+    chunk_workers: int,
+) -> float:
+    """Time transcriptions of a clip by the workers of one Whisper model.
+
+    Like the chunk workers of transcribe_core, the workers share one model
+    loaded with num_workers=chunk_workers and each get their share of
+    cpu_threads. Every worker transcribes its own copy of the clip.
+
+    Returns:
+        Wall time in seconds per transcribed clip
+    """
+    worker_threads = None
+    if cpu_threads is not None:
+        worker_threads = max(1, cpu_threads // chunk_workers)
+    model = load_whisper_model(
+        whisper_model,
+        device,
+        0,
+        compute_type,
+        worker_threads,
+        num_workers=chunk_workers,
+    )
+    whisper_transcribe_kwargs = {
+        "beam_size": transcribe_config.get("beam_size"),
+        "temperature": transcribe_config.get("temperature"),
+    }
+    try:
+        # Warm up, the first call initializes the model
+        run_asr(model, audio[: 2 * SAMPLE_RATE], whisper_transcribe_kwargs)
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=chunk_workers) as executor:
+            for _ in executor.map(
+                lambda _: run_asr(model, audio, whisper_transcribe_kwargs),
+                range(chunk_workers),
+            ):
+                pass
+        return (perf_counter() - start) / chunk_workers
+    finally:
+        registry.clear()
+
+
+def run_tuning(
+    file: str | Path | None = None,
+    seconds: float = 30.0,
+    whisper_model: str | None = None,
+    device: str = "auto",
+    chunk_length: float | None = None,
+    save: bool = True,
+    **candidates,
+) -> dict:
+    """Find the fastest Whisper settings of this machine.
+
+    Args:
+        file: Reference clip, defaults to the test file in MEDIA_DIR
+        seconds: Length of the excerpt of the clip that is transcribed
+        whisper_model: Whisper model size, defaults to the configured one
+        device: Device to tune for (auto, cuda, mps, cpu)
+        chunk_length: Chunk length in seconds of chunked transcription, which
+            is saved with the fastest chunk workers. Defaults to the
+            configured one, without chunking chunk workers are not tuned
+            since transcribe_core only uses them for chunks.
+        save: Save the fastest settings as the profile of this machine
+        **candidates: Lists of compute_type, cpu_threads or chunk_workers values
+            replacing those of candidate_settings
+
+    Returns:
+        dict: Fastest settings, every measurement and the profile path
+    """
+    whisper_model = whisper_model or transcribe_config.get("whisper_model")
+    chunk_length = chunk_length or transcribe_config.get("chunk_length")
+    device = resolve_device(device)
+    settings = {**candidate_settings(device), **candidates}
+    if not chunk_length:
+        settings["chunk_workers"] = [1]
+    audio = decode_audio(file or TUNE_FILE, end=seconds)
+    duration = len(audio) / SAMPLE_RATE
+
+    measurements = {}
+
+    def measure(compute_type, cpu_threads, chunk_workers):
+        key = (compute_type, cpu_threads, chunk_workers)
+        if key not in measurements:
+            logger.info(
+                f"Timing compute_type={compute_type}, cpu_threads={cpu_threads}, chunk_workers={chunk_workers}"
+            )
+            try:
+                elapsed = time_asr(
+                    audio,
+                    whisper_model,
+                    device,
+                    compute_type,
+                    cpu_threads,
+                    chunk_workers,
+                )
+            except Exception as e:
+                logger.warning(f"Skipping {key}: {e}")
+                elapsed = None
+            measurements[key] = elapsed
+        return measurements[key]
+
+    def fastest(name, values, **fixed):
+        timed = [(measure(**{**fixed, name: value}), value) for value in values]
+        timed = [(elapsed, value) for elapsed, value in timed if elapsed is not None]
+        if not timed:
+            raise RuntimeError(f"Every tuning run failed for {fixed}")
+        return min(timed, key=lambda item: item[0])[1]
+
+    # One setting at a time, the others at their best value found so far
+    best = {
+        "compute_type": settings["compute_type"][0],
+        "cpu_threads": max(settings["cpu_threads"], key=lambda value: value or 0),
+        "chunk_workers": 1,
+    }
+    for name in SEARCHED_SETTINGS:
+        others = {key: value for key, value in best.items() if key != name}
+        best[name] = fastest(name, settings[name], **others)
+    if chunk_length:
+        best["chunk_length"] = chunk_length
+    else:
+        del best["chunk_workers"]
+
+    report = {
+        "machine": machine_id(),
+        "whisper_model": whisper_model,
+        "device": device,
+        "audio_seconds": duration,
+        "settings": best,
+        "measurements": [
+            {
+                **dict(zip(SEARCHED_SETTINGS, key)),
+                "seconds_per_clip": elapsed,
+                "rtf": None if elapsed is None else round(elapsed / duration, 3),
+            }
+            for key, elapsed in measurements.items()
+        ],
+    }
+    if save:
+        report["profile"] = str(save_machine_profile(best, report["measurements"]))
+        logger.info(f"Tuned settings saved to {report['profile']}")
+    return report
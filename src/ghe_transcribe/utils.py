@@ -1,27 +1,30 @@
+import io
+import json
 import logging
+import os
 from datetime import timedelta
 from functools import wraps
 from pathlib import Path
 from time import time
 
-import av
-from pyannote.core import Segment
-from torchaudio import load, save
-from torchaudio.transforms import Resample
+import numpy as np
 
+from ghe_transcribe.alignment import align_transcript, assign_speakers
 from ghe_transcribe.exceptions import AudioConversionError
+from ghe_transcribe.transcript import SentenceMerger, Transcript, short_speaker_label
 
 logger = logging.getLogger(__name__)
 
+# Sample rate expected by both faster-whisper and pyannote.audio
+SAMPLE_RATE = 16000
+# Seconds decoded before a seek target to let the decoder settle
+SEEK_PREROLL = 0.5
 
 # Simple working directory-based path management
 WORKING_DIR = Path.cwd()
 MEDIA_DIR = WORKING_DIR / "media"
 OUTPUT_DIR = WORKING_DIR / "output"
-
-# Create directories at module level
-MEDIA_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
+CACHE_DIR = WORKING_DIR / "cache"
 
 
 def log_hf_authentication_error(logger_instance, error_message: str = None):
@@ -62,16 +65,72 @@ def save_uploaded_file(filename: str, content_bytes: bytes) -> Path:
 
     Args:
         filename: Name of the file
-        content_bytes: File content as bytes
+        content_bytes: File content as bytes or any bytes-like object, such
+            as the memoryview of an upload widget, which is written without
+            copying
 
     Returns:
         Path to saved file
     """
     file_path = get_media_path(filename)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
     file_path.write_bytes(content_bytes)
     return file_path
 
 
+class BufferReader(io.RawIOBase):
+    """Seekable read-only file over a bytes-like object, without copying it.
+
+    Lets PyAV decode uploads held in memory, e.g. the memoryview of an
+    ipywidgets FileUpload, instead of copying them to bytes or to disk first.
+
+    Args:
+        buffer: Bytes-like object holding the file content
+        name: File name reported as the name attribute
+    """
+
+    def __init__(self, buffer, name: str | None = None):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        size = max(min(len(b), len(self._view) - self._position), 0)
+        b[:size] = self._view[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def source_name(file) -> str:
+    """Name of an audio source given as a path or a binary file-like object."""
+    if isinstance(file, (str, os.PathLike)):
+        return str(file)
+    return getattr(file, "name", None) or "audio"
+
+
 def timing(func):
     """Decorator to measure and log function execution time."""
 
@@ -90,6 +149,8 @@ def timing(func):
 
 
 def get_text_with_timestamp(transcribe_res):
+    from pyannote.core import Segment
+
     timestamp_texts = []
     for item in transcribe_res["segments"]:
         start = item["start"]
@@ -100,64 +161,161 @@ def get_text_with_timestamp(transcribe_res):
 
 
 def add_speaker_info_to_text(timestamp_texts, ann):
-    spk_text = []
-    for seg, text in timestamp_texts:
-        spk = ann.crop(seg).argmax()
-        spk_text.append((seg, spk, text))
-    return spk_text
+    # Equivalent to ann.crop(seg).argmax() per segment, in a single pass
+    speakers = assign_speakers(
+        [seg.start for seg, _ in timestamp_texts],
+        [seg.end for seg, _ in timestamp_texts],
+        ann,
+    )
+    return [(seg, spk, text) for (seg, text), spk in zip(timestamp_texts, speakers)]
 
 
 def merge_cache(text_cache):
+    from pyannote.core import Segment
+
     sentence = "".join([item[-1] for item in text_cache])
-    spk = text_cache[0][1]
     # Transform SPEAKER_XX to SXX
-    if isinstance(spk, str) and spk.startswith("SPEAKER_"):
-        spk = "S" + spk.split("_")[1]
+    spk = short_speaker_label(text_cache[0][1])
     start = text_cache[0][0].start
     end = text_cache[-1][0].end
     return Segment(start, end), spk, sentence
 
 
-__PUNC_SENT_END__ = [".", "?", "!"]
+def iter_merge_sentence(spk_text, **sentence_rules):
+    """Merge (segment, speaker, text) tuples into sentences as they arrive.
 
+    Yields each merged sentence as soon as it is complete, so it can run on a
+    stream of aligned segments.
 
-def merge_sentence(spk_text):
-    merged_spk_text = []
-    pre_spk = None
-    text_cache = []
+    Args:
+        spk_text: Iterable of (segment, speaker, text) tuples
+        **sentence_rules: max_duration, max_gap and punctuation of
+            SentenceMerger
+    """
+    merger = SentenceMerger(**sentence_rules)
     for seg, spk, text in spk_text:
-        if spk != pre_spk and pre_spk is not None and len(text_cache) > 0:
-            merged_spk_text.append(merge_cache(text_cache))
-            text_cache = [(seg, spk, text)]
-            pre_spk = spk
-
-        elif text and len(text) > 0 and text[-1] in __PUNC_SENT_END__:
-            text_cache.append((seg, spk, text))
-            merged_spk_text.append(merge_cache(text_cache))
-            text_cache = []
-            pre_spk = spk
-        else:
-            text_cache.append((seg, spk, text))
-            pre_spk = spk
-    if len(text_cache) > 0:
-        merged_spk_text.append(merge_cache(text_cache))
-    return merged_spk_text
+        yield from merger.push(seg, spk, text)
+    yield from merger.flush()
+
+
+def merge_sentence(spk_text, **sentence_rules):
+    return list(iter_merge_sentence(spk_text, **sentence_rules))
+
+
+def align_text(transcribe_res, diarization_result, alignment="segment"):
+    """Assign speakers to transcribed segments without merging sentences.
 
+    Args:
+        transcribe_res: Transcription results in Whisper format
+        diarization_result: Pyannote diarization results, or its SpeakerIndex
+        alignment: Assign speakers per "segment", or per "word" and split
+            segments at speaker changes (requires word timestamps)
 
-def diarize_text(transcribe_res, diarization_result):
+    Returns:
+        Transcript with one row per aligned segment, iterating as
+        (segment, speaker, text) tuples
+    """
+    return align_transcript(transcribe_res, diarization_result, alignment)
+
+
+def diarize_text(
+    transcribe_res, diarization_result, alignment="segment", **sentence_rules
+):
     """Combine transcription results with speaker diarization.
 
     Args:
         transcribe_res: Transcription results in Whisper format
         diarization_result: Pyannote diarization results
+        alignment: Assign speakers per "segment", or per "word" and split
+            segments at speaker changes (requires word timestamps)
+        **sentence_rules: max_duration, max_gap and punctuation of
+            Transcript.merge_sentences
 
     Returns:
-        List of tuples containing (segment, speaker, text)
+        Transcript with one row per sentence, iterating as
+        (segment, speaker, text) tuples
     """
-    timestamp_texts = get_text_with_timestamp(transcribe_res)
-    spk_text = add_speaker_info_to_text(timestamp_texts, diarization_result)
-    result = merge_sentence(spk_text)
-    return result
+    spk_text = align_text(transcribe_res, diarization_result, alignment)
+    return spk_text.merge_sentences(**sentence_rules)
+
+
+def shift_segments(result, offset):
+    """Shift the timestamps of transcription results.
+
+    Args:
+        result: Transcript or list of (segment, speaker, text) tuples
+        offset: Seconds to add to every timestamp
+
+    Returns:
+        Transcript or list of (segment, speaker, text) tuples, like result
+    """
+    from pyannote.core import Segment
+
+    if isinstance(result, Transcript):
+        return result.shift(offset)
+
+    return [
+        (Segment(seg.start + offset, seg.end + offset), spk, sentence)
+        for seg, spk, sentence in result
+    ]
+
+
+class FormattedResult:
+    """Columns of a transcription result with its timestamps formatted.
+
+    Every timestamp is formatted once, in a vectorized pass over the start
+    and end arrays, and shared by all output formats written from the same
+    result.
+
+    Args:
+        result: Transcript, or list of (segment, speaker, text) tuples
+    """
+
+    def __init__(self, result):
+        if isinstance(result, Transcript):
+            self.starts, self.ends = result.starts, result.ends
+            self.speakers = result.speaker_labels
+            self.texts = list(result.texts)
+            self.transcript = result
+        else:
+            rows = list(result)
+            self.starts = np.array([seg.start for seg, _, _ in rows], dtype=np.float64)
+            self.ends = np.array([seg.end for seg, _, _ in rows], dtype=np.float64)
+            self.speakers = [spk for _, spk, _ in rows]
+            self.texts = [sentence for _, _, sentence in rows]
+            self.transcript = None
+        self._formatted = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _times(self, name: str, column: str, formatter) -> list[str]:
+        if name not in self._formatted:
+            self._formatted[name] = formatter(getattr(self, column))
+        return self._formatted[name]
+
+    @property
+    def srt_starts(self) -> list[str]:
+        return self._times("srt_starts", "starts", format_times_srt)
+
+    @property
+    def srt_ends(self) -> list[str]:
+        return self._times("srt_ends", "ends", format_times_srt)
+
+    @property
+    def clock_starts(self) -> list[str]:
+        return self._times("clock_starts", "starts", format_times_clock)
+
+    @property
+    def iso8601_starts(self) -> list[str]:
+        return self._times("iso8601_starts", "starts", format_times_iso8601)
+
+
+def formatted(result) -> FormattedResult:
+    """Wrap a result in a FormattedResult, unless it already is one."""
+    if isinstance(result, FormattedResult):
+        return result
+    return FormattedResult(result)
 
 
 def to_txt(result):
@@ -169,13 +327,16 @@ def to_txt(result):
     Returns:
         TXT formatted string with format: SXX: [HH:MM:SS] text
     """
-    txt = []
-    for seg, spk, sentence in result:
-        # Format time as [HH:MM:SS]
-        time = format_time_to_srt(seg.start).split(",")[0]  # Remove milliseconds
-        line = f"{spk}: [{time}] {sentence}"
-        txt.append(line.strip())
-    return "\n".join(txt)
+    return "\n".join(txt_lines(result))
+
+
+def txt_lines(result):
+    """Yield the TXT lines of a transcription result."""
+    columns = formatted(result)
+    for start, spk, sentence in zip(
+        columns.clock_starts, columns.speakers, columns.texts
+    ):
+        yield f"{spk}: [{start}] {sentence}".strip()
 
 
 def to_csv(result, semicolon=False):
@@ -188,32 +349,40 @@ def to_csv(result, semicolon=False):
     Returns:
         CSV formatted string
     """
-    csv = []
-    if semicolon:
-        sep = ";"
-    else:
-        sep = ","
-    start_line = "start" + sep + "end" + sep + "speaker" + sep + "sentence"
-    csv.append(start_line)
-    for seg, spk, sentence in result:
+    return "\n".join(csv_lines(result, semicolon))
+
+
+def csv_lines(result, semicolon=False):
+    """Yield the CSV header and lines of a transcription result."""
+    columns = formatted(result)
+    sep = ";" if semicolon else ","
+    yield "start" + sep + "end" + sep + "speaker" + sep + "sentence"
+    for start, end, spk, sentence in zip(
+        columns.srt_starts, columns.srt_ends, columns.speakers, columns.texts
+    ):
         if not semicolon:
             sentence = sentence.replace(",", ";")
-        line = f"{format_time_to_srt(seg.start)}{sep}{format_time_to_srt(seg.end)}{sep}{spk}{sep}{sentence}"
-        csv.append(line.strip())
-    return "\n".join(csv)
+        yield f"{start}{sep}{end}{sep}{spk}{sep}{sentence}".strip()
 
 
 def to_md(result):
-    md = []
+    return "\n".join(md_lines(result))
+
+
+def md_lines(result):
+    """Yield the Markdown lines of a transcription result.
+
+    A line with the speaker label precedes every change of speaker.
+    """
+    columns = formatted(result)
     previous_spk = None
-    for seg, spk, sentence in result:
+    for start, spk, sentence in zip(
+        columns.iso8601_starts, columns.speakers, columns.texts
+    ):
         if spk != previous_spk:
-            md.append(f"\n{spk}")
-            md.append(f"({format_time_to_iso8601(seg.start)}){sentence}".strip())
+            yield f"\n{spk}"
             previous_spk = spk
-        else:
-            md.append(f"({format_time_to_iso8601(seg.start)}){sentence}".strip())
-    return "\n".join(md)
+        yield f"({start}){sentence}".strip()
 
 
 def to_srt(result):
@@ -225,17 +394,65 @@ def to_srt(result):
     Returns:
         SRT formatted string
     """
-    srt = []
-    counter = 1
-    for seg, spk, sentence in result:
-        start_time = format_time_to_srt(seg.start)
-        end_time = format_time_to_srt(seg.end)
-        srt.append(str(counter))
-        srt.append(f"{start_time} --> {end_time}")
-        srt.append(f"{spk}:{sentence}")
-        srt.append("")  # Add an empty line to separate subtitles
-        counter += 1
-    return "\n".join(srt)
+    # Subtitles are separated by an empty line
+    return "\n".join(srt_blocks(result))
+
+
+def srt_blocks(result, first: int = 1):
+    """Yield the SRT subtitle blocks of a transcription result.
+
+    Args:
+        result: Transcript, or list of (segment, speaker, text) tuples
+        first: Number of the first subtitle block
+    """
+    columns = formatted(result)
+    for counter, (start_time, end_time, spk, sentence) in enumerate(
+        zip(columns.srt_starts, columns.srt_ends, columns.speakers, columns.texts),
+        first,
+    ):
+        yield f"{counter}\n{start_time} --> {end_time}\n{spk}:{sentence}\n"
+
+
+def to_json(result):
+    """Convert transcription results to JSON, one sentence per line.
+
+    Args:
+        result: Transcript, or list of (segment, speaker, text) tuples
+
+    Returns:
+        JSON array of objects with start, end, speaker and text, and the
+        words of the sentence if the transcript has word timestamps
+    """
+    return "\n".join(json_lines(result))
+
+
+def json_lines(result):
+    """Yield the lines of the JSON array of a transcription result."""
+    columns = formatted(result)
+    transcript = columns.transcript
+    with_words = transcript is not None and transcript.words is not None
+    yield "["
+    previous = None
+    for i, (start, end, spk, sentence) in enumerate(
+        zip(
+            columns.starts.tolist(),
+            columns.ends.tolist(),
+            columns.speakers,
+            columns.texts,
+        )
+    ):
+        if previous is not None:
+            yield previous + ","
+        record = {"start": start, "end": end, "speaker": spk, "text": sentence}
+        if with_words:
+            record["words"] = [
+                {"start": word_start, "end": word_end, "word": word}
+                for word_start, word_end, word in transcript.words_of(i)
+            ]
+        previous = json.dumps(record)
+    if previous is not None:
+        yield previous
+    yield "]"
 
 
 def format_time_to_iso8601(seconds_float: float) -> str:
@@ -257,6 +474,62 @@ def format_time_to_srt(seconds):
     return f"{hours:02d}:{mins:02d}:{secs:02d},{milliseconds:03d}"
 
 
+def _time_parts(seconds, fraction: int):
+    """Hours, minutes, seconds and rounded fractions of timestamps.
+
+    Whole seconds are truncated and the remainder rounded to units of
+    1/fraction seconds, in one pass over the array.
+    """
+    seconds = np.asarray(seconds, dtype=np.float64)
+    whole = np.trunc(seconds)
+    fractions = np.round((seconds - whole) * fraction).astype(np.int64)
+    minutes, secs = np.divmod(whole.astype(np.int64), 60)
+    hours, mins = np.divmod(minutes, 60)
+    return hours, mins, secs, fractions
+
+
+def format_times_srt(seconds) -> list[str]:
+    """Vectorized format_time_to_srt over an array of seconds."""
+    hours, mins, secs, milliseconds = _time_parts(seconds, 1000)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+        for h, m, s, ms in zip(
+            hours.tolist(), mins.tolist(), secs.tolist(), milliseconds.tolist()
+        )
+    ]
+
+
+def format_times_clock(seconds) -> list[str]:
+    """format_times_srt without the milliseconds, as in TXT lines."""
+    hours, mins, secs, _ = _time_parts(seconds, 1000)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d}"
+        for h, m, s in zip(hours.tolist(), mins.tolist(), secs.tolist())
+    ]
+
+
+def format_times_iso8601(seconds) -> list[str]:
+    """Vectorized format_time_to_iso8601 over an array of seconds."""
+    seconds = np.asarray(seconds, dtype=np.float64)
+    hours, mins, secs, microseconds = _time_parts(seconds, 1_000_000)
+    # timedelta rounds to microseconds, which may carry into the seconds
+    carry = microseconds >= 1_000_000
+    if carry.any():
+        hours, mins, secs, _ = _time_parts(np.trunc(seconds) + carry, 1)
+    times = []
+    for value, h, m, s in zip(
+        seconds.tolist(), hours.tolist(), mins.tolist(), secs.tolist()
+    ):
+        if h == 0:
+            times.append(f"{m:02d}:{s:02d}")
+        elif 0 < h < 24:
+            times.append(f"{h}:{m:02d}:{s:02d}")
+        else:
+            # Days or negative durations, as printed by timedelta
+            times.append(format_time_to_iso8601(value))
+    return times
+
+
 # Convert generated segments from faster_whisper to Whisper format
 
 
@@ -281,11 +554,83 @@ def to_whisper_format(generated_segments):
     return {"segments": whisper_formatted_generated_segment}
 
 
+def decode_audio(
+    file,
+    sample_rate: int = SAMPLE_RATE,
+    start: float | None = None,
+    end: float | None = None,
+) -> np.ndarray:
+    """Decode an audio file into a mono float32 waveform held in memory.
+
+    When start is given, the container is seeked to the closest preceding
+    keyframe so that only the requested window is demuxed and decoded.
+
+    Args:
+        file: Path or binary file-like object of the audio file
+        sample_rate: Target sample rate in Hz
+        start: Start of the window in seconds, None for the beginning
+        end: End of the window in seconds, None for the end of the file
+
+    Returns:
+        1-D float32 array of samples
+
+    Raises:
+        AudioConversionError: If decoding fails
+    """
+    import av
+
+    start = start or 0.0
+    if hasattr(file, "seek"):
+        # File-like objects may have been read before, e.g. when a job is retried
+        file.seek(0)
+    try:
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=sample_rate)
+        chunks = []
+        # Time in seconds of the first decoded sample, relative to the stream start
+        first_time = None
+        with av.open(file) as container:
+            stream = container.streams.audio[0]
+            stream_start = float((stream.start_time or 0) * stream.time_base)
+            if start > 0:
+                # Seek slightly early so the decoder settles before the window
+                seek_time = stream_start + max(start - SEEK_PREROLL, 0.0)
+                container.seek(int(seek_time / stream.time_base), stream=stream)
+            for frame in container.decode(stream):
+                frame_time = (
+                    frame.time - stream_start if frame.time is not None else 0.0
+                )
+                if first_time is None:
+                    first_time = frame_time
+                if end is not None and frame_time >= end:
+                    break
+                for resampled in resampler.resample(frame):
+                    chunks.append(resampled.to_ndarray().reshape(-1))
+            # Flush the samples still buffered in the resampler
+            for resampled in resampler.resample(None):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+    except Exception as e:
+        logger.error(f"Error PyAV: {e}")
+        raise AudioConversionError(f"Failed to decode audio file: {e}") from e
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    audio = np.concatenate(chunks).astype(np.float32, copy=False)
+
+    # Cut the partial frames at the edges of the window
+    first_sample = max(int(round((start - first_time) * sample_rate)), 0)
+    last_sample = None if end is None else int(round((end - first_time) * sample_rate))
+    if first_sample > 0 or last_sample is not None:
+        audio = audio[first_sample:last_sample]
+    return audio
+
+
 # CREDIT: https://stackoverflow.com/a/72386137
 
 
 def to_wav_pyav(in_path: str, out_path: str = None, sample_rate: int = 16000) -> str:
     """Arbitrary media files to wav"""
+    import av
+
     if out_path is None:
         in_path_obj = Path(in_path)
         out_path = str(in_path_obj.with_suffix(".wav"))
@@ -332,6 +677,9 @@ def to_wav(file_name):
 
 
 def resampling(file_name, sample_rate=16000):
+    from torchaudio import load, save
+    from torchaudio.transforms import Resample
+
     # Resample audio to 16kHz if needed
     waveform, sr = load(file_name)
     if sr != sample_rate:
@@ -344,9 +692,12 @@ def resampling(file_name, sample_rate=16000):
 def snip_audio(input_file, output_file, start_time, duration):
     """Snip a portion of an audio file using pyAV.
 
+    Only the requested window is decoded, so excerpts late in long
+    recordings cost the same as excerpts at the start.
+
     Args:
         input_file: Path to input audio file
-        output_file: Path to output audio file
+        output_file: Path to output WAV file (16 kHz mono)
         start_time: Start time in seconds
         duration: Duration to extract in seconds
 
@@ -356,46 +707,40 @@ def snip_audio(input_file, output_file, start_time, duration):
     Raises:
         AudioConversionError: If snipping fails
     """
+    audio = decode_audio(input_file, start=start_time, end=start_time + duration)
     try:
-        input_container = av.open(input_file)
-        audio_stream = None
-        for stream in input_container.streams:
-            if stream.type == "audio":
-                audio_stream = stream
-                break
-
-        if not audio_stream:
-            logger.error(f"No audio stream found in {input_file}")
-            raise AudioConversionError(f"No audio stream found in {input_file}")
-
-        output_container = av.open(output_file, "w", format=input_container.format.name)
-        output_stream = output_container.add_stream("pcm_s16le", rate=stream.rate)
-
-        start_pts_seconds = start_time
-        end_pts_seconds = start_time + duration
-
-        for packet in input_container.demux(audio_stream):
-            for frame in packet.decode():
-                frame_time_seconds = frame.pts * audio_stream.time_base
-
-                if start_pts_seconds <= frame_time_seconds < end_pts_seconds:
-                    for packet_out in output_stream.encode(frame):
-                        output_container.mux(packet_out)
-                elif frame_time_seconds >= end_pts_seconds:
-                    break
+        write_wav(output_file, audio)
+    except Exception as e:
+        logger.error(f"Error processing file: {e}")
+        raise AudioConversionError(f"Failed to snip audio: {e}") from e
+    return output_file
 
-            if frame_time_seconds >= end_pts_seconds:
-                break
 
+def write_wav(output_file, audio: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    """Write a mono float32 waveform to a pcm_s16le WAV file.
+
+    Args:
+        output_file: Path to output WAV file
+        audio: 1-D float32 array of samples
+        sample_rate: Sample rate of the waveform in Hz
+
+    Returns:
+        Path to output file
+    """
+    import av
+
+    with av.open(str(output_file), "w", "wav") as output_container:
+        output_stream = output_container.add_stream(
+            "pcm_s16le", rate=sample_rate, layout="mono"
+        )
+        frame = av.AudioFrame.from_ndarray(
+            np.ascontiguousarray(audio, dtype=np.float32)[None, :],
+            format="flt",
+            layout="mono",
+        )
+        frame.sample_rate = sample_rate
+        for packet_out in output_stream.encode(frame):
+            output_container.mux(packet_out)
         for packet_out in output_stream.encode():
             output_container.mux(packet_out)
-
-    except Exception as e:
-        logger.error(f"Error processing file: {e}")
-        raise AudioConversionError(f"Failed to snip audio: {e}") from e
-    finally:
-        if input_container:
-            input_container.close()
-        if output_container:
-            output_container.close()
     return output_file
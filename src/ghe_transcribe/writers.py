@@ -0,0 +1,144 @@
+"""Writers saving transcription results to disk in the output formats."""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from ghe_transcribe.utils import (
+    FormattedResult,
+    csv_lines,
+    json_lines,
+    md_lines,
+    srt_blocks,
+    txt_lines,
+)
+
+# Line generators of every output format, joined with newlines
+OUTPUT_FORMATS = {
+    "txt": txt_lines,
+    "srt": srt_blocks,
+    "csv": csv_lines,
+    "md": md_lines,
+    "json": json_lines,
+}
+
+
+def parse_formats(formats) -> list[str]:
+    """Parse output formats given as a comma-separated string or a list.
+
+    Args:
+        formats: Format names, like "txt,srt" or ["txt", "json"]
+
+    Returns:
+        Lowercase format names without duplicates, in the given order
+
+    Raises:
+        ValueError: If a format is unknown
+    """
+    if isinstance(formats, str):
+        formats = formats.split(",")
+    names = []
+    for name in formats:
+        name = name.strip().lower().lstrip(".")
+        if not name or name in names:
+            continue
+        if name not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format {name!r}, "
+                f"expected one of {', '.join(OUTPUT_FORMATS)}"
+            )
+        names.append(name)
+    return names
+
+
+def write_outputs(result, stem: str | Path, formats=("txt", "srt")) -> list[Path]:
+    """Write a transcription result in several formats.
+
+    Timestamps are formatted once for all formats, and lines are streamed to
+    the open files instead of building every file as one string.
+
+    Args:
+        result: Transcript, or list of (segment, speaker, text) tuples
+        stem: Output path without extension, like output/test01
+        formats: Format names, see parse_formats
+
+    Returns:
+        Paths of the written files
+    """
+    columns = FormattedResult(result)
+    paths = []
+    for name in parse_formats(formats):
+        path = Path(f"{stem}.{name}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as f:
+            for i, line in enumerate(OUTPUT_FORMATS[name](columns)):
+                if i > 0:
+                    f.write("\n")
+                f.write(line)
+        paths.append(path)
+    return paths
+
+
+class TranscriptWriter(ABC):
+    """Base class writing (segment, speaker, text) tuples one at a time.
+
+    Entries are flushed immediately so that partial transcripts of long
+    files can be followed with ``tail -f``. Each entry is formatted by the
+    line generator of its format, so that the finished file is identical to
+    the one written from the full result.
+
+    Args:
+        path: Path of the output file
+    """
+
+    separator = "\n"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, seg, spk, sentence):
+        """Append one entry to the output file and flush it."""
+        if self.count > 0:
+            self._file.write(self.separator)
+        self.count += 1
+        self._file.write(self.format(seg, spk, sentence))
+        self._file.flush()
+
+    @abstractmethod
+    def format(self, seg, spk, sentence) -> str:
+        """Format one entry, the count-th of the file."""
+
+
+class TxtWriter(TranscriptWriter):
+    """Incremental writer for the TXT format of to_txt."""
+
+    def format(self, seg, spk, sentence) -> str:
+        return next(txt_lines([(seg, spk, sentence)]))
+
+
+class SrtWriter(TranscriptWriter):
+    """Incremental writer for the SRT format of to_srt."""
+
+    def format(self, seg, spk, sentence) -> str:
+        return next(srt_blocks([(seg, spk, sentence)], first=self.count))
+
+
+# Formats that can be written incrementally while transcribing
+INCREMENTAL_WRITERS = {"txt": TxtWriter, "srt": SrtWriter}
@@ -0,0 +1,7 @@
+import os
+
+# Tuned profiles are loaded when ghe_transcribe.core is imported, before any
+# fixture runs, so the defaults of this machine are kept out of the tests here
+os.environ["GHE_TRANSCRIBE_TUNED_PROFILE"] = os.path.join(
+    os.path.dirname(__file__), "missing_tuned_profile.json"
+)
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+import numpy as np
+from pyannote.core import Annotation, Segment
+
+from ghe_transcribe.alignment import assign_speakers, assign_word_speakers
+
+Word = namedtuple("Word", ["start", "end", "word"])
+
+
+def random_annotation(rng, num_turns=200, duration=600.0):
+    """Build an annotation with overlapping turns from three speakers."""
+    annotation = Annotation()
+    for track in range(num_turns):
+        start = rng.uniform(0, duration)
+        end = start + rng.uniform(0.1, 15.0)
+        annotation[Segment(start, end), track] = f"SPEAKER_{rng.integers(3):02d}"
+    return annotation
+
+
+def test_assign_speakers_matches_crop_argmax():
+    """Test that vectorized alignment matches per-segment Annotation.crop."""
+    rng = np.random.default_rng(0)
+    annotation = random_annotation(rng)
+    starts = rng.uniform(-10, 620, size=500)
+    ends = starts + rng.uniform(0.0, 20.0, size=500)
+
+    expected = [
+        annotation.crop(Segment(start, end)).argmax()
+        for start, end in zip(starts, ends)
+    ]
+
+    assert assign_speakers(starts, ends, annotation) == expected
+
+
+def test_assign_speakers_empty_annotation():
+    """Test that segments without any speaker turn get no speaker."""
+    assert assign_speakers([0.0, 1.0], [1.0, 2.0], Annotation()) == [None, None]
+
+
+def test_assign_word_speakers_splits_at_speaker_change():
+    """Test that a segment straddling two speakers is split between words."""
+    annotation = Annotation()
+    annotation[Segment(0.0, 2.0)] = "SPEAKER_00"
+    annotation[Segment(2.5, 5.0)] = "SPEAKER_01"
+
+    words = [
+        Word(0.0, 0.5, " Hello"),
+        Word(0.6, 1.0, " there."),
+        Word(2.1, 2.4, " Hi"),  # in the gap, takes the previous word's speaker
+        Word(2.6, 3.0, " back."),
+    ]
+    transcribe_res = {
+        "segments": [
+            {
+                "start": 0.0,
+                "end": 3.0,
+                "text": " Hello there. Hi back.",
+                "words": words,
+            },
+            {"start": 3.0, "end": 4.0, "text": " No words.", "words": None},
+        ]
+    }
+
+    result = assign_word_speakers(transcribe_res, annotation)
+
+    assert [(spk, text) for _, spk, text in result] == [
+        ("SPEAKER_00", " Hello there. Hi"),
+        ("SPEAKER_01", " back."),
+        ("SPEAKER_01", " No words."),
+    ]
+    assert (result[1][0].start, result[1][0].end) == (2.6, 3.0)
@@ -0,0 +1,192 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ghe_transcribe import core
+from ghe_transcribe.core import transcribe
+from ghe_transcribe.exceptions import AudioConversionError
+from ghe_transcribe.manifest import params_hash
+from ghe_transcribe.utils import SAMPLE_RATE
+
+
+def test_transcribe_multiple_resume(monkeypatch, tmp_path):
+    """Test that batches record a manifest, retry failures and resume."""
+    calls = []
+
+    def fake_transcribe_core(file, return_metrics=False, **kwargs):
+        calls.append(file)
+        if file == "bad.mp3":
+            raise AudioConversionError("unreadable")
+        output = tmp_path / f"{file}.txt"
+        output.write_text("text")
+        report = {"wall_seconds": 1.0, "duration": 2.0, "rtf": 0.5}
+        return "text", {**report, "outputs": [str(output)]}
+
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(core, "transcribe_core", fake_transcribe_core)
+
+    results = transcribe(
+        ["good.mp3", "bad.mp3"], retries=1, save_output=True, prefetch=0
+    )
+    assert results["good.mp3"] == "text"
+    assert results["bad.mp3"] == {"error": "unreadable"}
+    assert calls == ["good.mp3", "bad.mp3", "bad.mp3"]
+
+    entries = [
+        json.loads(line)
+        for line in (tmp_path / "batch_manifest.jsonl").read_text().splitlines()
+    ]
+    assert [(e["file"], e["status"], e["attempt"]) for e in entries] == [
+        ("good.mp3", "done", 1),
+        ("bad.mp3", "failed", 1),
+        ("bad.mp3", "failed", 2),
+    ]
+
+    calls.clear()
+    results = transcribe(["good.mp3", "bad.mp3"], retries=0, resume=True, prefetch=0)
+    assert calls == ["bad.mp3"]
+    assert results["good.mp3"]["status"] == "done"
+
+    # Other options produce other outputs, which are not skipped
+    calls.clear()
+    transcribe(["good.mp3"], resume=True, formats="txt,json")
+    assert calls == ["good.mp3"]
+
+
+def test_transcribe_multiple_prefetch(monkeypatch, tmp_path):
+    """Test that batch files are decoded ahead and handed to transcribe_core."""
+    decoded = []
+
+    def fake_decode_audio(file, start=None, end=None):
+        decoded.append(file)
+        return np.full(SAMPLE_RATE, len(decoded), dtype=np.float32)
+
+    def fake_transcribe_core(file, audio=None, return_metrics=False, **kwargs):
+        report = {"wall_seconds": 1.0, "duration": 1.0, "rtf": 1.0, "outputs": []}
+        return float(audio[0]), report
+
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(core, "decode_audio", fake_decode_audio)
+    monkeypatch.setattr(core, "transcribe_core", fake_transcribe_core)
+
+    results = transcribe(["a.mp3", "b.mp3", "c.mp3"], prefetch=2)
+    assert sorted(decoded) == ["a.mp3", "b.mp3", "c.mp3"]
+    assert sorted(results.values()) == [1.0, 2.0, 3.0]
+
+
+def test_transcribe_multiple_longest_first(monkeypatch, tmp_path):
+    """Test that batch files are transcribed longest first."""
+    calls = []
+
+    class FakeProbeIndex:
+        def __init__(self, path):
+            pass
+
+        def probe(self, files):
+            durations = {"short.mp3": 60.0, "long.mp3": 3600.0}
+            return {file: {"duration": durations.get(file)} for file in files}
+
+    def fake_transcribe_core(file, return_metrics=False, **kwargs):
+        calls.append(file)
+        report = {"wall_seconds": 1.0, "duration": 1.0, "rtf": 1.0, "outputs": []}
+        return file, report
+
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(core, "ProbeIndex", FakeProbeIndex)
+    monkeypatch.setattr(core, "transcribe_core", fake_transcribe_core)
+
+    files = ["unknown.mp3", "short.mp3", "long.mp3"]
+    results = transcribe(files, prefetch=0)
+    assert calls == ["long.mp3", "short.mp3", "unknown.mp3"]
+    assert list(results) == files
+
+    calls.clear()
+    transcribe(files, prefetch=0, schedule="input")
+    assert calls == files
+
+
+def test_params_hash_ignores_batch_options():
+    """Test that only options changing the outputs change the hash."""
+    params = {"whisper_model": "tiny", "beam_size": 5, "prefetch": 2}
+
+    assert params_hash(params) == params_hash(
+        {**params, "prefetch": 0, "schedule": "input", "workers": 4, "resume": True}
+    )
+    assert params_hash(params) == params_hash({**params, "num_speakers": None})
+    assert params_hash(params) != params_hash({**params, "beam_size": 1})
+
+
+def test_transcribe_multiple_resume_other_batch_options(monkeypatch, tmp_path):
+    """Test that resuming with other batch options skips finished files."""
+    calls = []
+
+    def fake_transcribe_core(file, audio=None, return_metrics=False, **kwargs):
+        calls.append(file)
+        output = tmp_path / f"{file}.txt"
+        output.write_text("text")
+        report = {"wall_seconds": 1.0, "duration": 1.0, "rtf": 1.0}
+        return "text", {**report, "outputs": [str(output)]}
+
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(
+        core, "decode_audio", lambda file, start=None, end=None: np.zeros(1)
+    )
+    monkeypatch.setattr(core, "transcribe_core", fake_transcribe_core)
+
+    files = ["a.mp3", "b.mp3"]
+    transcribe(files, prefetch=0)
+    assert calls == files
+
+    calls.clear()
+    transcribe(files, resume=True, prefetch=1, schedule="input", compute_type=None)
+    assert calls == []
+
+
+def test_transcribe_multiple_without_output(monkeypatch, tmp_path):
+    """Test that batches not saving outputs write no manifest."""
+
+    def fake_transcribe_core(file, audio=None, return_metrics=False, **kwargs):
+        report = {"wall_seconds": 1.0, "duration": 1.0, "rtf": 1.0, "outputs": []}
+        return "text", report
+
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(core, "transcribe_core", fake_transcribe_core)
+
+    transcribe(["a.mp3", "b.mp3"], save_output=False, prefetch=0)
+    assert not (tmp_path / "batch_manifest.jsonl").exists()
+
+    transcribe(["a.mp3", "b.mp3"], save_output=False, resume=True, prefetch=0)
+    assert (tmp_path / "batch_manifest.jsonl").exists()
+
+
+def test_transcribe_multiple_workers_share_configured_threads(monkeypatch, tmp_path):
+    """Test that workers split the configured CPU threads between them."""
+    worker_threads = []
+
+    def fake_transcribe_batch_file(file, kwargs):
+        worker_threads.append(kwargs["cpu_threads"])
+        report = {"wall_seconds": 1.0, "duration": 1.0, "rtf": 1.0, "outputs": []}
+        return "text", report
+
+    def fake_executor(max_workers, mp_context, initializer, initargs):
+        # Run the workers as threads in this process
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(core, "ProcessPoolExecutor", fake_executor)
+    monkeypatch.setattr(core, "_transcribe_batch_file", fake_transcribe_batch_file)
+    monkeypatch.setitem(core.transcribe_config, "cpu_threads", 6)
+
+    transcribe(["a.mp3", "b.mp3"], workers=2, save_output=False)
+    assert worker_threads == [3, 3]
+
+    worker_threads.clear()
+    transcribe(["a.mp3", "b.mp3"], workers=2, cpu_threads=2, save_output=False)
+    assert worker_threads == [1, 1]
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+from faster_whisper.utils import download_model
+from torch import from_numpy
+
+from ghe_transcribe.bench import StageTimer, StubDiarizationPipeline, run_benchmarks
+from ghe_transcribe.utils import SAMPLE_RATE
+
+TEST01 = "media/test01.mp3"
+
+
+def test_stub_diarization_covers_audio():
+    """Test that the stub pipeline alternates speakers over the whole input."""
+    audio = np.zeros(20 * SAMPLE_RATE, dtype=np.float32)
+    annotation = StubDiarizationPipeline(turn_duration=7.0)(
+        {"waveform": from_numpy(audio)[None], "sample_rate": SAMPLE_RATE}
+    )
+
+    assert annotation.labels() == ["SPEAKER_00", "SPEAKER_01"]
+    assert annotation.get_timeline().extent().duration == pytest.approx(20.0)
+
+
+def test_stage_timer_reports_real_time_factor():
+    """Test that stage latencies are related to the audio duration."""
+    timer = StageTimer(duration=10.0)
+    with timer.processing(), timer("asr"):
+        pass
+    with timer("to_txt"):
+        pass
+    report = timer.report()
+
+    assert set(report["stages"]) == {"asr", "to_txt"}
+    assert report["rtf"] == pytest.approx(
+        report["stages"]["asr"]["seconds"] / 10.0, abs=1e-3
+    )
+    assert report["peak_rss_mb"] > 0
+
+
+def test_run_benchmarks(tmp_path):
+    """Test a full offline benchmark with tiny.en and the stub diarization."""
+    if not os.path.exists(TEST01):
+        pytest.skip(f"Test audio file {TEST01} not found")
+    try:
+        download_model("tiny.en", local_files_only=True)
+    except OSError:
+        pytest.skip("Whisper model tiny.en is not in the local cache")
+
+    output = tmp_path / "bench.json"
+    report = run_benchmarks(
+        files=[TEST01], synthetic_minutes=[1.0], output=output, cpu_threads=1
+    )
+
+    assert output.exists(), "Benchmark report should be saved."
+    assert set(report["results"]) == {"test01.mp3", "synthetic_1min"}
+    stages = report["results"]["synthetic_1min"]["stages"]
+    for stage in ("to_wav", "snip_audio", "model_load", "asr", "diarization"):
+        assert stage in stages, f"Stage {stage} should be timed."
+    assert report["results"]["synthetic_1min"]["duration"] == pytest.approx(60.0)
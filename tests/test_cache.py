@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+
+from ghe_transcribe.cache import ResultCache, audio_hash, cache_key
+
+
+def test_cache_key_depends_on_audio_and_params():
+    """Test that keys change with the audio content and the layer parameters."""
+    audio = np.zeros(16000, dtype=np.float32)
+    content_hash = audio_hash(audio, 16000)
+
+    assert content_hash == audio_hash(audio.copy(), 16000)
+    assert content_hash != audio_hash(audio + 0.1, 16000)
+    assert cache_key(content_hash, {"beam_size": 5}) == cache_key(
+        content_hash, {"beam_size": 5}
+    )
+    assert cache_key(content_hash, {"beam_size": 5}) != cache_key(
+        content_hash, {"beam_size": 1}
+    )
+
+
+def test_result_cache_roundtrip(tmp_path):
+    """Test storing and loading results per layer."""
+    result_cache = ResultCache(tmp_path)
+
+    assert result_cache.get("asr", "ab12") is None
+    result_cache.put("asr", "ab12", ["segment"])
+
+    assert result_cache.get("asr", "ab12") == ["segment"]
+    assert result_cache.get("diarization", "ab12") is None
+    assert (
+        result_cache.get_or_compute("diarization", "ab12", lambda: "turns") == "turns"
+    )
+    assert result_cache.get("diarization", "ab12") == "turns"
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    """Test size-based eviction of the oldest entries."""
+    result_cache = ResultCache(tmp_path)
+    payload = b"x" * 600_000
+    result_cache.put("asr", "aa01", payload)
+    result_cache.put("asr", "aa02", payload)
+    # Make the first entry the least recently used
+    os.utime(result_cache._path("asr", "aa01"), (0, 0))
+
+    result_cache.max_size_mb = 1
+    result_cache.evict()
+
+    assert result_cache.get("asr", "aa01") is None
+    assert result_cache.get("asr", "aa02") == payload
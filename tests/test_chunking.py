@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+from faster_whisper.transcribe import Segment, Word
+
+from ghe_transcribe.chunking import _shift_segment, find_chunks, transcribe_chunks
+from ghe_transcribe.utils import SAMPLE_RATE, decode_audio
+
+TEST01 = "media/test01.mp3"
+
+
+def test_find_chunks_cuts_in_silences():
+    """Test that chunks cover the audio and are only cut in silences."""
+    if not os.path.exists(TEST01):
+        pytest.skip(f"Test audio file {TEST01} not found")
+
+    speech = decode_audio(TEST01, end=10.0)
+    silence = np.zeros(3 * SAMPLE_RATE, dtype=np.float32)
+    audio = np.concatenate([speech, silence, speech, silence, speech])
+
+    chunks = find_chunks(audio, chunk_length=15.0, min_silence_duration_ms=1000)
+
+    assert len(chunks) == 3
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start, "Chunks should be contiguous."
+    for _, end in chunks[:-1]:
+        assert np.all(audio[end - 100 : end + 100] == 0), "Cuts should be silent."
+
+
+def test_shift_segment():
+    """Test moving chunk segments and words to global timestamps."""
+    word = Word(start=1.0, end=1.5, word=" hi", probability=1.0)
+    segment = Segment(
+        id=1,
+        seek=0,
+        start=1.0,
+        end=2.0,
+        text=" hi",
+        tokens=[],
+        avg_logprob=0.0,
+        compression_ratio=1.0,
+        no_speech_prob=0.0,
+        words=[word],
+        temperature=0.0,
+    )
+
+    shifted = _shift_segment(segment, 7, 60.0)
+
+    assert (shifted.id, shifted.start, shifted.end) == (7, 61.0, 62.0)
+    assert (shifted.words[0].start, shifted.words[0].end) == (61.0, 61.5)
+    assert shifted.seek == 6000
+
+
+@dataclass
+class FakeTranscriptionInfo:
+    language_probability: float = 1.0
+    duration: float = 0.0
+
+
+class FakeChunkModel:
+    """Whisper stand-in yielding one segment per second of a chunk, slowly."""
+
+    class model:
+        is_multilingual = False
+
+    def __init__(self):
+        self.started = 0
+        self.produced = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.started += 1
+
+        def segments():
+            for second in range(len(audio) // SAMPLE_RATE):
+                time.sleep(0.05)
+                self.produced += 1
+                yield Segment(
+                    id=second + 1,
+                    seek=0,
+                    start=float(second),
+                    end=second + 1.0,
+                    text=" hi",
+                    tokens=[],
+                    avg_logprob=0.0,
+                    compression_ratio=1.0,
+                    no_speech_prob=0.0,
+                    words=None,
+                    temperature=0.0,
+                )
+
+        return segments(), FakeTranscriptionInfo()
+
+
+def chunk_threads():
+    return [
+        t for t in threading.enumerate() if t.name.startswith("ghe_transcribe-chunk")
+    ]
+
+
+@pytest.mark.parametrize("consumed", [0, 1])
+def test_transcribe_chunks_stops_when_abandoned(consumed):
+    """Test that chunk workers stop when the segments are not all consumed."""
+    model = FakeChunkModel()
+    # A short first chunk, then long ones of 10 s
+    bounds = [0, 2, 12, 22, 32]
+    chunks = [
+        (start * SAMPLE_RATE, end * SAMPLE_RATE)
+        for start, end in zip(bounds, bounds[1:])
+    ]
+    audio = np.zeros(bounds[-1] * SAMPLE_RATE, dtype=np.float32)
+
+    segments, _ = transcribe_chunks(model, audio, chunks, {}, workers=2)
+    for _ in range(consumed):
+        next(segments)
+    del segments
+
+    assert chunk_threads() == [], "Chunk workers should be shut down."
+    assert model.started < len(chunks), "Queued chunks should be cancelled."
+    assert model.produced < bounds[-1], "Running chunks should stop early."
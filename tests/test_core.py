@@ -1,10 +1,16 @@
 import glob
 import os
 
+import faster_whisper
+import numpy as np
 import pytest
+from faster_whisper.transcribe import Segment
+from typer.testing import CliRunner
 
-from ghe_transcribe.core import transcribe
+from ghe_transcribe import core
+from ghe_transcribe.core import split_cpu_threads, start_asr, transcribe
 from ghe_transcribe.exceptions import AudioConversionError, ModelInitializationError
+from ghe_transcribe.utils import SAMPLE_RATE, to_whisper_format
 
 TEST01 = "media/test01.mp3"
 TEST02 = "media/test02.m4a"
@@ -38,7 +44,7 @@ def test_transcribe_invalid_device():
         )
 
 
-def test_transcribe_two_files():
+def test_transcribe_two_files(monkeypatch, tmp_path):
     """Test the transcribe function with two files."""
     test_files = [TEST01, TEST02]
 
@@ -47,6 +53,8 @@ def test_transcribe_two_files():
         if not os.path.exists(file_path):
             pytest.skip(f"Test audio file {file_path} not found")
 
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path / "cache")
     results = transcribe(
         files=test_files,
         trim=5,
@@ -60,11 +68,102 @@ def test_transcribe_two_files():
     )
 
     assert isinstance(results, dict), "Multiple files should return a dict."
+    assert not (tmp_path / "output").exists(), "Nothing should be written."
     assert len(results) == 2, "Should have results for both files."
     for file_path in test_files:
         assert file_path in results, f"Should have result for {file_path}"
 
 
+def test_transcribe_two_files_workers(monkeypatch, tmp_path):
+    """Test the transcribe function with two files on two worker processes."""
+    test_files = [TEST01, "non_existent_file.mp3"]
+
+    if not os.path.exists(TEST01):
+        pytest.skip(f"Test audio file {TEST01} not found")
+
+    monkeypatch.setattr(core, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(core, "CACHE_DIR", tmp_path / "cache")
+    results = transcribe(
+        files=test_files,
+        trim=5,
+        device="cpu",
+        cpu_threads=2,
+        whisper_model="tiny.en",
+        compute_type="int8",
+        num_speakers=1,
+        save_output=False,
+        info=False,
+        workers=2,
+        hf_token=huggingface_token,
+    )
+
+    assert list(results) == test_files, "Results should keep the input order."
+    assert "error" in results["non_existent_file.mp3"], "Failures are captured per file."
+
+
+def test_split_cpu_threads():
+    """Test the CPU thread split between concurrent ASR and diarization."""
+    assert split_cpu_threads(8) == (4, 4)
+    assert split_cpu_threads(5) == (2, 3)
+    assert split_cpu_threads(1) == (1, 1)
+
+
+def test_start_asr_batched(monkeypatch):
+    """Test that a batch size switches ASR to the batched pipeline."""
+    calls = []
+
+    class FakeBatchedPipeline:
+        def __init__(self, model):
+            self.model = model
+
+        def transcribe(self, audio, **kwargs):
+            calls.append(kwargs)
+            segment = Segment(
+                id=1,
+                seek=0,
+                start=0.0,
+                end=2.0,
+                text=" hi",
+                tokens=[],
+                avg_logprob=0.0,
+                compression_ratio=1.0,
+                no_speech_prob=0.0,
+                words=None,
+                temperature=0.0,
+            )
+            return iter([segment]), None
+
+    monkeypatch.setattr(faster_whisper, "BatchedInferencePipeline", FakeBatchedPipeline)
+    progress = []
+    segments, _ = start_asr(
+        object(),
+        np.zeros(4 * SAMPLE_RATE, dtype=np.float32),
+        {"beam_size": 5},
+        lambda *args: progress.append(args),
+        batch_size=4,
+    )
+
+    result = to_whisper_format(list(segments))
+    assert calls == [{"batch_size": 4, "beam_size": 5}]
+    assert result["segments"][0]["text"] == " hi"
+    assert progress == [("asr", 2.0, 4.0)]
+
+
+@pytest.mark.parametrize("option", ["--help", "-h"])
+def test_cli_help_lists_subcommands(option):
+    """Test that the group help lists the subcommands next to transcribe."""
+    result = CliRunner().invoke(core.app, [option])
+
+    assert result.exit_code == 0
+    for command in ("transcribe", "bench", "serve", "tune"):
+        assert command in result.output
+    assert "--trim" not in result.output
+
+    result = CliRunner().invoke(core.app, ["media/test01.mp3", option])
+    assert result.exit_code == 0
+    assert "--trim" in result.output
+
+
 def teardown_module():
     """Cleans up any .wav files created in the current directory."""
     for filename in glob.glob("media/*.wav"):
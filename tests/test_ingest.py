@@ -0,0 +1,69 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ghe_transcribe.ingest import AudioPrefetcher, expand_inputs, parse_extensions
+
+
+def test_expand_inputs(tmp_path):
+    """Test expanding directories and patterns into audio files."""
+    for name in ("b.mp3", "a.WAV", "notes.txt", "sub/c.m4a"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_bytes(b"")
+
+    assert expand_inputs([str(tmp_path)]) == [
+        str(tmp_path / "a.WAV"),
+        str(tmp_path / "b.mp3"),
+    ]
+    assert expand_inputs([str(tmp_path)], recursive=True)[-1] == str(
+        tmp_path / "sub" / "c.m4a"
+    )
+    assert expand_inputs(
+        [str(tmp_path / "**" / "*")], recursive=True, extensions="m4a"
+    ) == [str(tmp_path / "sub" / "c.m4a")]
+    # Explicit files are kept, even if missing, and listed once
+    assert expand_inputs(["missing.mp3", str(tmp_path / "*.mp3"), "missing.mp3"]) == [
+        "missing.mp3",
+        str(tmp_path / "b.mp3"),
+    ]
+    assert parse_extensions("mp3, .WAV") == {".mp3", ".wav"}
+
+
+def test_audio_prefetcher_keeps_order_and_errors():
+    """Test that prefetched files come back in order with their errors."""
+
+    def decode(file):
+        if file == "bad":
+            raise ValueError("bad file")
+        return np.zeros(int(file), dtype=np.float32)
+
+    items = list(AudioPrefetcher(["3", "bad", "1"], decode, depth=2))
+
+    assert [file for file, _ in items] == ["3", "bad", "1"]
+    assert len(items[0][1]) == 3
+    assert isinstance(items[1][1], ValueError)
+
+
+@pytest.mark.parametrize("max_mb, expected", [(None, 3), (0, 1)])
+def test_audio_prefetcher_memory_cap(max_mb, expected):
+    """Test that no decode starts ahead once the buffer exceeds its budget."""
+    started = []
+    release = threading.Event()
+
+    def decode(file):
+        started.append(file)
+        if file != "a":
+            release.wait(5)
+        return np.zeros(10, dtype=np.float32)
+
+    prefetcher = iter(
+        AudioPrefetcher(["a", "b", "c", "d"], decode, depth=3, max_mb=max_mb)
+    )
+    next(prefetcher)
+    # Give the decodes submitted while "a" is consumed time to start
+    time.sleep(0.2)
+    assert started[1:] == ["b", "c", "d"][:expected]
+    release.set()
+    assert [file for file, _ in prefetcher] == ["b", "c", "d"]
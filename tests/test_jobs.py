@@ -0,0 +1,39 @@
+import pytest
+
+from ghe_transcribe.exceptions import QueueFullError
+from ghe_transcribe.jobs import JobQueue
+
+TEST01 = "media/test01.mp3"
+
+
+def test_job_queue_backpressure():
+    """Test that a full queue rejects jobs instead of blocking."""
+    job_queue = JobQueue(max_queued=2)
+    job_queue.submit(TEST01)
+    job_queue.submit(TEST01)
+
+    with pytest.raises(QueueFullError):
+        job_queue.submit(TEST01)
+
+
+def test_job_queue_cancel_queued_job():
+    """Test that a cancelled job is skipped by the workers."""
+    job_queue = JobQueue(max_queued=2)
+    job = job_queue.submit(TEST01)
+
+    assert job_queue.cancel(job.id).status == "cancelled"
+    job_queue.start()
+    job_queue.stop()
+    assert job.started is None, "Cancelled job should not run."
+    assert job_queue.cancel("unknown") is None
+
+
+def test_job_queue_reports_updates():
+    """Test that observers are notified of status changes."""
+    updates = []
+    job_queue = JobQueue(on_update=lambda job: updates.append(job.status))
+    job = job_queue.submit(TEST01)
+    job_queue.cancel(job.id)
+
+    assert updates == ["queued", "cancelled"]
+    assert job.progress is None, "Progress is unknown before transcription."
@@ -0,0 +1,72 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+from ghe_transcribe.metrics import StageTimer, save_metrics, to_prometheus
+
+
+def test_stage_timer_records_extra_fields():
+    """Test that stage fields are kept and unset ones left out."""
+    timer = StageTimer(duration=10.0)
+    with timer("asr", cache="hit"):
+        pass
+    with timer("model_load", cache=None) as stage:
+        stage["whisper_cache"] = "miss"
+    report = timer.report()
+
+    assert report["stages"]["asr"]["cache"] == "hit"
+    assert report["stages"]["model_load"]["whisper_cache"] == "miss"
+    assert "cache" not in report["stages"]["model_load"]
+    assert report["wall_seconds"] >= report["processing_seconds"]
+
+
+def test_stage_timer_counts_overlapping_stages_once():
+    """Test that the real-time factor uses the wall time of processing spans."""
+    timer = StageTimer(duration=1.0)
+
+    def stage(name):
+        with timer(name):
+            sleep(0.1)
+
+    with timer.processing():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(stage, ["asr", "diarization"]))
+    with timer("write"):
+        sleep(0.1)
+    report = timer.report()
+
+    assert report["stages"]["asr"]["seconds"] >= 0.1
+    assert report["stages"]["diarization"]["seconds"] >= 0.1
+    assert 0.1 <= report["processing_seconds"] < 0.19
+    assert report["rtf"] == report["processing_seconds"]
+
+
+def test_to_prometheus():
+    """Test the Prometheus text rendering of a report."""
+    timer = StageTimer(duration=10.0)
+    with timer("asr", cache="miss"):
+        pass
+    text = to_prometheus({'a "b".mp3': timer.report()})
+
+    assert "# TYPE ghe_transcribe_stage_seconds gauge" in text
+    assert 'ghe_transcribe_stage_seconds{file="a \\"b\\".mp3",stage="asr"} ' in text
+    assert (
+        'ghe_transcribe_stage_cache_hit{file="a \\"b\\".mp3",stage="asr",cache="result"} 0'
+        in text
+    )
+
+
+def test_save_metrics(tmp_path):
+    """Test writing JSON and Prometheus sidecars."""
+    timer = StageTimer(duration=1.0)
+    with timer("decode"):
+        pass
+    report = {"file": "test01.mp3", **timer.report()}
+
+    json_path = save_metrics(report, tmp_path / "test01", "json")
+    prometheus_path = save_metrics(report, tmp_path / "test01", "prometheus")
+
+    assert json_path.name == "test01.metrics.json"
+    assert json.loads(json_path.read_text())["stages"]["decode"]["seconds"] >= 0
+    assert prometheus_path.name == "test01.metrics.prom"
+    assert 'file="test01.mp3"' in prometheus_path.read_text()
@@ -0,0 +1,65 @@
+import os
+import shutil
+
+import pytest
+
+from ghe_transcribe import probe
+from ghe_transcribe.probe import ProbeIndex, probe_audio, window_duration
+
+TEST02 = "media/test02.m4a"
+
+
+def test_probe_audio():
+    """Test reading the duration and format from the container."""
+    if not os.path.exists(TEST02):
+        pytest.skip(f"Test audio file {TEST02} not found")
+
+    info = probe_audio(TEST02)
+
+    assert info["duration"] == pytest.approx(62.656, abs=0.1)
+    assert info["sample_rate"] == 48000
+    assert info["channels"] == 1
+    assert info["codec"] == "aac"
+
+
+def test_probe_index_reprobes_changed_files(monkeypatch, tmp_path):
+    """Test that the index is reused until a file changes."""
+    calls = []
+
+    def fake_probe_audio(file):
+        calls.append(file)
+        return {"duration": 10.0, "sample_rate": 16000, "channels": 1, "codec": "pcm"}
+
+    monkeypatch.setattr(probe, "probe_audio", fake_probe_audio)
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"1")
+
+    index = ProbeIndex(tmp_path / "index.json")
+    assert index.probe([str(audio), "missing.wav"]) == {
+        str(audio): fake_probe_audio(audio),
+        "missing.wav": None,
+    }
+    calls.clear()
+
+    assert ProbeIndex(tmp_path / "index.json").get(audio)["duration"] == 10.0
+    assert calls == []
+
+    audio.write_bytes(b"12")
+    ProbeIndex(tmp_path / "index.json").get(audio)
+    assert calls == [audio]
+
+    # Copies with the same mtime and size at another path are probed too
+    shutil.copy2(audio, tmp_path / "b.wav")
+    ProbeIndex(tmp_path / "index.json").get(tmp_path / "b.wav")
+    assert calls == [audio, tmp_path / "b.wav"]
+
+
+def test_window_duration():
+    """Test the duration of the transcribed window of a file."""
+    info = {"duration": 100.0}
+
+    assert window_duration(info) == 100.0
+    assert window_duration(info, offset=30.0, trim=20.0) == 20.0
+    assert window_duration(info, offset=90.0, trim=20.0) == 10.0
+    assert window_duration({"duration": None}) is None
+    assert window_duration(None) is None
@@ -0,0 +1,25 @@
+import pstats
+
+from ghe_transcribe.metrics import StageTimer
+from ghe_transcribe.profiling import StageProfiler
+
+
+def test_stage_profiler_dumps_every_stage(tmp_path):
+    """Test that timed stages are profiled into one dump per stage."""
+    profiler = StageProfiler(tmp_path / "test01.profile")
+    timer = StageTimer(profiler=profiler)
+    with timer("align"):
+        sorted(range(1000), key=str)
+    with timer("diarization"):
+        from torch import ones
+
+        ones(8, 8) @ ones(8, 8)
+
+    assert set(timer.stages) == {"align", "diarization"}
+    stats = pstats.Stats(str(tmp_path / "test01.profile" / "align.pstats"))
+    assert stats.total_calls > 0
+    assert (tmp_path / "test01.profile" / "align.txt").exists()
+    assert (tmp_path / "test01.profile" / "diarization.torch.json").exists()
+    assert (
+        "aten::" in (tmp_path / "test01.profile" / "diarization.torch.txt").read_text()
+    )
@@ -0,0 +1,59 @@
+from ghe_transcribe.registry import ModelRegistry
+
+
+def test_registry_reuses_loaded_model():
+    """Test that a cached model is returned without calling the loader again."""
+    registry = ModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return object()
+
+    first = registry.get(("whisper", "tiny.en"), loader)
+    second = registry.get(("whisper", "tiny.en"), loader)
+
+    assert first is second, "Cached model should be reused."
+    assert len(calls) == 1, "Loader should only run on a cache miss."
+
+
+def test_registry_evicts_least_recently_used():
+    """Test LRU eviction once the memory budget is exceeded."""
+    registry = ModelRegistry(max_memory_mb=10)
+    registry.get("a", object)
+    registry.get("b", object)
+    # Fake the measured footprints to exceed the budget
+    registry._entries["a"] = (registry._entries["a"][0], 8)
+    registry._entries["b"] = (registry._entries["b"][0], 8)
+    registry.get("a", object)
+    registry._evict()
+
+    assert registry.keys() == ["a"], "Least recently used model should be evicted."
+
+
+def test_registry_set_budget_evicts_immediately():
+    """Test that lowering the budget evicts without waiting for a load."""
+    registry = ModelRegistry()
+    registry.get("a", object)
+    registry.get("b", object)
+    registry._entries["a"] = (registry._entries["a"][0], 8)
+    registry._entries["b"] = (registry._entries["b"][0], 8)
+
+    registry.set_budget(10)
+
+    assert registry.max_memory_mb == 10
+    assert registry.keys() == ["b"], "Least recently used model should be evicted."
+
+
+def test_registry_unload_and_clear():
+    """Test explicit unloading of models."""
+    registry = ModelRegistry()
+    registry.get("a", object)
+    registry.get("b", object)
+
+    assert registry.unload("a")
+    assert not registry.unload("a")
+    assert "a" not in registry
+
+    registry.clear()
+    assert len(registry) == 0
@@ -0,0 +1,48 @@
+import json
+import threading
+from http.client import HTTPConnection
+
+from ghe_transcribe.jobs import JobQueue
+from ghe_transcribe.server import make_server
+
+TEST01 = "media/test01.mp3"
+
+
+def test_server_api():
+    """Test job submission, polling and cancellation over HTTP."""
+    job_queue = JobQueue(max_queued=1)
+    server = make_server(job_queue, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def request(method, path, body=None):
+        connection = HTTPConnection(*server.server_address)
+        connection.request(method, path, body=json.dumps(body) if body else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    try:
+        assert request("GET", "/health")[0] == 200
+        assert request("POST", "/jobs", {"file": "missing.mp3"})[0] == 400
+        assert request("POST", "/jobs", {"file": TEST01, "bad": 1})[0] == 400
+        # Batch options of transcribe_multiple do not apply to single jobs
+        assert request("POST", "/jobs", {"file": TEST01, "resume": True})[0] == 400
+        assert request("POST", "/jobs", {"file": TEST01, "schedule": "fifo"})[0] == 400
+        # The model memory budget is shared by all jobs and set by the server
+        assert request("POST", "/jobs", {"file": TEST01, "model_cache_mb": 1})[0] == 400
+
+        status, job = request("POST", "/jobs", {"file": TEST01, "trim": 5})
+        assert status == 202
+        assert request("POST", "/jobs", {"file": TEST01})[0] == 503
+        assert request("GET", f"/jobs/{job['id']}")[1]["status"] == "queued"
+        assert request("DELETE", f"/jobs/{job['id']}")[1]["status"] == "cancelled"
+        assert request("GET", "/jobs/unknown")[0] == 404
+
+        connection = HTTPConnection(*server.server_address)
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        assert response.status == 200
+        assert b"# TYPE ghe_transcribe_stage_seconds gauge" in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Backends that must only be imported once a stage needs them
+HEAVY_MODULES = [
+    "av",
+    "faster_whisper",
+    "pyannote.audio",
+    "pyannote.core",
+    "torch",
+    "torchaudio",
+]
+# Generous wall time budget for `transcribe --help`, including interpreter startup
+HELP_BUDGET_SECONDS = 3.0
+# Let subprocesses started elsewhere find the package the tests run against
+ENV = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+
+def test_import_does_not_load_backends(tmp_path):
+    """Test that importing the CLI module leaves the heavy backends unloaded."""
+    code = (
+        "import json, sys\n"
+        "import ghe_transcribe.core\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env=ENV,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(result.stdout) == [], "Backends should be imported lazily."
+    assert list(tmp_path.iterdir()) == [], "Import should not create directories."
+
+
+def test_cli_help_is_fast(tmp_path):
+    """Test that the CLI answers --help within the startup budget."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "ghe_transcribe.core", "--help"],
+        cwd=tmp_path,
+        env=ENV,
+        capture_output=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < HELP_BUDGET_SECONDS, f"--help took {elapsed:.2f} s"
@@ -0,0 +1,111 @@
+import pickle
+from collections import namedtuple
+
+import numpy as np
+from pyannote.core import Annotation, Segment
+
+from ghe_transcribe.transcript import SentenceMerger, Transcript
+from ghe_transcribe.utils import align_text, merge_sentence
+
+Word = namedtuple("Word", ["start", "end", "word", "probability"])
+
+
+def random_rows(rng, count=300):
+    """Build aligned rows with speaker changes, punctuation and gaps."""
+    speakers = ["SPEAKER_00", "SPEAKER_01", None]
+    endings = [".", "?", "!", ",", "", " and", "。"]
+    rows = []
+    start = 0.0
+    for i in range(count):
+        text = f" w{i}{endings[rng.integers(len(endings))]}"
+        start += float(rng.choice([0.0, 0.1, 2.0]))
+        rows.append((Segment(start, start + 0.5), speakers[rng.integers(3)], text))
+        start += 0.5
+    return rows
+
+
+def test_merge_sentences_matches_merge_sentence():
+    """Test that columnar sentence merging matches merging tuples."""
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        rows = random_rows(rng, count=int(rng.integers(0, 60)))
+
+        assert Transcript.from_tuples(rows).merge_sentences() == merge_sentence(rows)
+
+
+def test_merge_sentences_rules_match_merge_sentence():
+    """Test that sentence limits split columns and tuples the same way."""
+    rng = np.random.default_rng(1)
+    for max_duration in (None, 1.0, 3.0):
+        for max_gap in (None, 0.05, 1.0):
+            rows = random_rows(rng, count=60)
+            rules = {"max_duration": max_duration, "max_gap": max_gap}
+
+            merged = Transcript.from_tuples(rows).merge_sentences(**rules)
+            assert merged == merge_sentence(rows, **rules)
+            if max_duration is not None:
+                assert all(seg.duration <= max_duration for seg, _, _ in merged)
+
+
+def test_sentence_merger_is_incremental():
+    """Test that sentences are returned as soon as they are complete."""
+    merger = SentenceMerger(max_gap=1.0, punctuation="。.")
+
+    assert merger.push(Segment(0.0, 1.0), "SPEAKER_00", "你好") == []
+    assert merger.push(Segment(1.0, 2.0), "SPEAKER_00", "世界。") == [
+        (Segment(0.0, 2.0), "S00", "你好世界。")
+    ]
+    assert merger.push(Segment(2.0, 3.0), "SPEAKER_00", " Hi") == []
+    assert merger.push(Segment(5.0, 6.0), "SPEAKER_00", " there") == [
+        (Segment(2.0, 3.0), "S00", " Hi")
+    ]
+    assert merger.flush() == [(Segment(5.0, 6.0), "S00", " there")]
+    assert merger.flush() == []
+
+
+def test_transcript_tuple_view():
+    """Test that a transcript behaves like a list of tuples."""
+    rows = [
+        (Segment(0.0, 1.0), "S00", " Hello."),
+        (Segment(1.0, 2.0), None, " Hm"),
+        (Segment(2.0, 3.0), "S01", " Bye."),
+    ]
+    transcript = Transcript.from_tuples(rows)
+
+    assert len(transcript) == 3
+    assert list(transcript) == rows
+    assert transcript[-1] == rows[-1]
+    assert transcript[1:] == rows[1:]
+    assert transcript.speaker_labels == ["S00", None, "S01"]
+    assert transcript.shift(10.0)[0][0] == Segment(10.0, 11.0)
+    assert pickle.loads(pickle.dumps(transcript[1:])) == rows[1:]
+
+
+def test_transcript_keeps_words():
+    """Test that aligned and merged rows keep their words."""
+    annotation = Annotation()
+    annotation[Segment(0.0, 5.0)] = "SPEAKER_00"
+    transcribe_res = {
+        "segments": [
+            {
+                "start": 0.0,
+                "end": 1.0,
+                "text": " Hello",
+                "words": [Word(0.0, 1.0, " Hello", 0.9)],
+            },
+            {
+                "start": 1.0,
+                "end": 2.0,
+                "text": " there.",
+                "words": [Word(1.0, 2.0, " there.", 0.8)],
+            },
+        ]
+    }
+
+    for alignment in ("segment", "word"):
+        transcript = align_text(transcribe_res, annotation, alignment)
+        merged = transcript.merge_sentences()
+
+        assert list(merged) == [(Segment(0.0, 2.0), "S00", " Hello there.")]
+        assert merged.words_of(0) == [(0.0, 1.0, " Hello"), (1.0, 2.0, " there.")]
+        assert merged.take([0]).words_of(0) == merged.words_of(0)
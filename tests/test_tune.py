@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from ghe_transcribe import tune
+from ghe_transcribe.machine import load_machine_profile, machine_id
+from ghe_transcribe.utils import SAMPLE_RATE
+
+
+@pytest.fixture
+def fake_tuning(monkeypatch, tmp_path):
+    """Replace decoding and ASR timing, returning the timed settings."""
+    monkeypatch.setenv("GHE_TRANSCRIBE_TUNED_PROFILE", str(tmp_path / "tuned.json"))
+    monkeypatch.setattr(
+        tune, "decode_audio", lambda file, end: np.zeros(int(end * SAMPLE_RATE))
+    )
+    calls = []
+
+    def fake_time_asr(audio, model, device, compute_type, cpu_threads, chunk_workers):
+        calls.append((compute_type, cpu_threads, chunk_workers))
+        if compute_type == "float16":
+            raise ValueError("unsupported")
+        seconds = {"float32": 4.0, "int8": 2.0}[compute_type]
+        return seconds / cpu_threads**0.5 - 0.1 * chunk_workers
+
+    monkeypatch.setattr(tune, "time_asr", fake_time_asr)
+    return calls
+
+
+def test_run_tuning_saves_fastest_settings(fake_tuning, tmp_path):
+    """Test that each setting is tuned in turn and the winner is loaded back."""
+    calls = fake_tuning
+    profile = tmp_path / "tuned.json"
+
+    report = tune.run_tuning(
+        seconds=10,
+        whisper_model="tiny.en",
+        device="cpu",
+        chunk_length=300.0,
+        compute_type=["float32", "float16", "int8"],
+        cpu_threads=[1, 2, 4],
+        chunk_workers=[1, 2],
+    )
+
+    expected = {
+        "compute_type": "int8",
+        "cpu_threads": 4,
+        "chunk_workers": 2,
+        "chunk_length": 300.0,
+    }
+    assert report["settings"] == expected
+    assert report["audio_seconds"] == 10
+    # Runs shared by consecutive steps are timed once
+    assert len(calls) == len(set(calls)) == 6
+    failed = [m for m in report["measurements"] if m["seconds_per_clip"] is None]
+    assert [m["compute_type"] for m in failed] == ["float16"]
+    assert load_machine_profile(profile) == expected
+
+
+def test_run_tuning_without_chunking(fake_tuning):
+    """Test that chunk workers are only tuned for chunked transcription."""
+    report = tune.run_tuning(
+        seconds=10,
+        whisper_model="tiny.en",
+        device="cpu",
+        save=False,
+        compute_type=["int8"],
+        cpu_threads=[1, 2],
+        chunk_workers=[1, 2],
+    )
+
+    assert report["settings"] == {"compute_type": "int8", "cpu_threads": 2}
+    assert {chunk_workers for _, _, chunk_workers in fake_tuning} == {1}
+    assert "profile" not in report
+
+
+def test_load_machine_profile_ignores_other_machines(tmp_path):
+    """Test that only the profile of this machine is loaded."""
+    path = tmp_path / "tuned.json"
+    assert load_machine_profile(path) == {}
+
+    path.write_text('{"other-1cpu": {"settings": {"workers": 8}}}')
+    assert load_machine_profile(path) == {}
+
+    path.write_text(
+        f'{{"{machine_id()}": {{"settings": {{"chunk_workers": 2, "workers": 4}}}}}}'
+    )
+    assert load_machine_profile(path) == {"chunk_workers": 2}
+
+    path.write_text("{")
+    assert load_machine_profile(path) == {}
@@ -0,0 +1,119 @@
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from ghe_transcribe.core import run_diarization
+from ghe_transcribe.utils import (
+    SAMPLE_RATE,
+    BufferReader,
+    decode_audio,
+    snip_audio,
+    source_name,
+)
+
+TEST01 = "media/test01.mp3"
+TEST02 = "media/test02.m4a"
+
+
+def test_decode_audio_window_matches_full_decode():
+    """Test that a seeked window decodes the same samples as a full decode."""
+    if not os.path.exists(TEST01):
+        pytest.skip(f"Test audio file {TEST01} not found")
+
+    full = decode_audio(TEST01)
+    window = decode_audio(TEST01, start=10.0, end=15.0)
+
+    assert window.dtype == np.float32
+    assert len(window) == 5 * SAMPLE_RATE
+    np.testing.assert_allclose(
+        window, full[10 * SAMPLE_RATE : 15 * SAMPLE_RATE], atol=1e-3
+    )
+
+
+def write_stereo_wav(path, seconds=2.0, rate=44100):
+    """Write a 440 Hz tone at half amplitude on both channels of a WAV file."""
+    t = np.arange(int(seconds * rate)) / rate
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(np.repeat(tone, 2).tobytes())
+    return str(path)
+
+
+def test_decode_audio_resamples_to_mono(tmp_path):
+    """Test that any input decodes to a mono float32 waveform at 16 kHz."""
+    file = write_stereo_wav(tmp_path / "stereo.wav")
+
+    audio = decode_audio(file)
+
+    assert audio.dtype == np.float32
+    assert audio.ndim == 1
+    assert abs(len(audio) - 2 * SAMPLE_RATE) <= 16
+    # Both channels are mixed down at -3 dB each, the libswresample default
+    assert np.abs(audio).max() == pytest.approx(0.5 * np.sqrt(2), abs=0.02)
+
+
+def test_decode_audio_trims_by_slicing(tmp_path):
+    """Test that a window is cut from the decoded samples to the exact length."""
+    file = write_stereo_wav(tmp_path / "stereo.wav")
+    full = decode_audio(file)
+
+    trimmed = decode_audio(file, end=1.5)
+    window = decode_audio(file, start=0.5, end=1.5)
+
+    assert len(trimmed) == int(1.5 * SAMPLE_RATE)
+    assert len(window) == SAMPLE_RATE
+    np.testing.assert_allclose(trimmed, full[: len(trimmed)], atol=1e-3)
+    np.testing.assert_allclose(
+        window, full[SAMPLE_RATE // 2 : SAMPLE_RATE // 2 + SAMPLE_RATE], atol=1e-3
+    )
+
+
+def test_run_diarization_passes_waveform():
+    """Test that pyannote gets the decoded waveform instead of a file path."""
+    calls = []
+
+    def pipeline(file, **kwargs):
+        calls.append((file, kwargs))
+        return "annotation"
+
+    audio = np.linspace(-1, 1, SAMPLE_RATE, dtype=np.float32)
+
+    assert run_diarization(pipeline, audio, {"num_speakers": 2}) == "annotation"
+    ((file, kwargs),) = calls
+    assert set(file) == {"waveform", "sample_rate"}
+    assert file["sample_rate"] == SAMPLE_RATE
+    assert tuple(file["waveform"].shape) == (1, SAMPLE_RATE)
+    # The tensor shares memory with the waveform instead of copying it
+    assert np.shares_memory(file["waveform"].numpy(), audio)
+    assert kwargs == {"num_speakers": 2}
+
+
+def test_snip_audio(tmp_path):
+    """Test snipping an arbitrary window into a WAV file."""
+    if not os.path.exists(TEST01):
+        pytest.skip(f"Test audio file {TEST01} not found")
+
+    output_file = snip_audio(TEST01, str(tmp_path / "snip.wav"), 20.0, 3.0)
+
+    assert len(decode_audio(output_file)) == 3 * SAMPLE_RATE
+
+
+@pytest.mark.parametrize("file", [TEST01, TEST02])
+def test_decode_audio_from_memory(file):
+    """Test decoding an upload held in memory without writing it to disk."""
+    if not os.path.exists(file):
+        pytest.skip(f"Test audio file {file} not found")
+
+    with open(file, "rb") as f:
+        content = memoryview(f.read())
+    reader = BufferReader(content, name=os.path.basename(file))
+
+    np.testing.assert_array_equal(decode_audio(reader), decode_audio(file))
+    # Decoding again starts over from the beginning of the buffer
+    assert len(decode_audio(reader, end=1.0)) == SAMPLE_RATE
+    assert source_name(reader) == os.path.basename(file)
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pytest
+from pyannote.core import Segment
+
+from ghe_transcribe.transcript import Transcript
+from ghe_transcribe.utils import (
+    format_time_to_iso8601,
+    format_time_to_srt,
+    format_times_iso8601,
+    format_times_srt,
+    to_csv,
+    to_md,
+    to_srt,
+    to_txt,
+)
+from ghe_transcribe.writers import SrtWriter, TxtWriter, parse_formats, write_outputs
+
+RESULT = [
+    (Segment(0.5, 2.25), "S00", " Hello there."),
+    (Segment(2.5, 3661.1), "S01", " Hi, how are you?"),
+]
+
+
+def test_incremental_writers_match_full_output(tmp_path):
+    """Test that streamed TXT and SRT files equal the full-result output."""
+    with (
+        TxtWriter(tmp_path / "out.txt") as txt_writer,
+        SrtWriter(tmp_path / "out.srt") as srt_writer,
+    ):
+        for seg, spk, sentence in RESULT:
+            txt_writer.write(seg, spk, sentence)
+            srt_writer.write(seg, spk, sentence)
+
+    assert (tmp_path / "out.txt").read_text() == to_txt(RESULT)
+    assert (tmp_path / "out.srt").read_text() == to_srt(RESULT)
+
+
+def test_vectorized_times_match_scalar_formatting():
+    """Test that formatting arrays of timestamps matches formatting each one."""
+    rng = np.random.default_rng(0)
+    seconds = np.concatenate(
+        [
+            rng.uniform(0, 100000, 2000),
+            rng.integers(0, 10000, 200) + 0.9995,
+            [0.0, 59.9996, 3599.9999999, 90000.25],
+        ]
+    )
+
+    assert format_times_srt(seconds) == [format_time_to_srt(s) for s in seconds]
+    assert format_times_iso8601(seconds) == [format_time_to_iso8601(s) for s in seconds]
+
+
+def test_write_outputs_all_formats(tmp_path):
+    """Test that every format is written like the single-format functions."""
+    transcript = Transcript.from_tuples(RESULT)
+    paths = write_outputs(transcript, tmp_path / "out", "txt,srt,csv,md,json")
+
+    assert [path.suffix for path in paths] == [".txt", ".srt", ".csv", ".md", ".json"]
+    assert (tmp_path / "out.txt").read_text() == to_txt(RESULT)
+    assert (tmp_path / "out.srt").read_text() == to_srt(RESULT)
+    assert (tmp_path / "out.csv").read_text() == to_csv(RESULT)
+    assert (tmp_path / "out.md").read_text() == to_md(RESULT)
+    records = json.loads((tmp_path / "out.json").read_text())
+    assert records[1] == {
+        "start": 2.5,
+        "end": 3661.1,
+        "speaker": "S01",
+        "text": " Hi, how are you?",
+    }
+
+
+def test_parse_formats():
+    """Test parsing comma-separated output formats."""
+    assert parse_formats(" TXT, srt,txt ,") == ["txt", "srt"]
+    assert parse_formats(["json"]) == ["json"]
+    with pytest.raises(ValueError):
+        parse_formats("docx")